@@ -1,7 +1,8 @@
 import streamlit as st
-import pandas as pd
 import joblib
 
+from codificador import CodificadorCliente
+
 # ===============================
 # CONFIGURACIÓN DE LA APP
 # ===============================
@@ -22,15 +23,16 @@ st.markdown(
 st.divider()
 
 # ===============================
-# CARGAR MODELO Y FEATURES
+# CARGAR MODELO Y CODIFICADOR
 # ===============================
 @st.cache_resource
 def cargar_modelo():
     model = joblib.load("model.pkl")
-    features = joblib.load("features.pkl")
-    return model, features
+    # El Random Forest se entrenó sin escalar: el codificador no usa scaler.pkl
+    codificador = CodificadorCliente.desde_archivos("features.pkl")
+    return model, codificador
 
-model, features = cargar_modelo()
+model, codificador = cargar_modelo()
 
 # ===============================
 # FORMULARIO DE ENTRADA
@@ -68,25 +70,19 @@ with st.form("form_cliente"):
 # PREDICCIÓN
 # ===============================
 if evaluar:
-    # Construir input base
-    input_data = {
+    # Vector alineado a features.pkl (mismas dummies que el notebook), como
+    # DataFrame sin copia para que el modelo reciba los nombres de columnas
+    x = codificador.codificar_df({
         "tenure": tenure,
         "MonthlyCharges": monthly_charges,
         "TotalCharges": total_charges,
-    }
-
-    # Dummies manuales (alineadas al dataset original)
-    input_data[f"Contract_{contract}"] = 1
-    input_data[f"InternetService_{internet_service}"] = 1
-    input_data[f"PaymentMethod_{payment_method}"] = 1
-
-    input_df = pd.DataFrame([input_data])
-
-    # Alinear columnas con el modelo
-    input_df = input_df.reindex(columns=features, fill_value=0)
+        "Contract": contract,
+        "InternetService": internet_service,
+        "PaymentMethod": payment_method,
+    })
 
     # Predicción
-    prob = model.predict_proba(input_df)[0][1]
+    prob = model.predict_proba(x)[0][1]
     impacto_anual = monthly_charges * 12
 
     if prob >= 0.6:
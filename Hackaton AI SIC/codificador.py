@@ -0,0 +1,92 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+# ===============================
+# CODIFICADOR DE CLIENTES
+# ===============================
+# Se construye UNA vez desde features.pkl: cada entrada "Columna_Valor" del
+# get_dummies(drop_first=True) del notebook queda como un índice fijo del
+# vector, así que codificar un cliente es escribir unos pocos float32 en un
+# buffer reutilizable (sin dict -> DataFrame -> reindex en cada consulta).
+#
+# Escalado: el Random Forest de model.pkl se entrenó SIN escalar; scaler.pkl
+# es el StandardScaler de la regresión logística. Sólo se aplica si se pasa.
+
+# Mediana de TotalCharges del dataset de entrenamiento (relleno del notebook)
+MEDIANA_TOTAL_CHARGES = 1397.475
+
+class CodificadorCliente:
+    def __init__(self, features, scaler=None):
+        self.features = list(features)
+        self.n = len(self.features)
+        self.numericas = {}   # columna -> índice
+        self.dummies = {}     # columna -> [(valor, índice), ...]
+        self._indice = {}     # (columna, valor) -> índice
+        for j, f in enumerate(self.features):
+            if "_" in f:
+                columna, valor = f.split("_", 1)
+                self.dummies.setdefault(columna, []).append((valor, j))
+                self._indice[(columna, valor)] = j
+            else:
+                self.numericas[f] = j
+        self.buffer = np.zeros((1, self.n), dtype=np.float32)
+
+        # (x - media) / escala  ==  x * inv_escala - media * inv_escala
+        self._media = self._inv_escala = None
+        if scaler is not None:
+            nombres = list(getattr(scaler, "feature_names_in_", self.features))
+            if nombres != self.features:
+                raise ValueError("El scaler no corresponde a las columnas de features.pkl")
+            self._media = np.asarray(scaler.mean_, dtype=np.float32)
+            self._inv_escala = (1.0 / np.asarray(scaler.scale_, dtype=np.float64)).astype(np.float32)
+
+    @classmethod
+    def desde_archivos(cls, ruta_features="features.pkl", ruta_scaler=None):
+        scaler = joblib.load(ruta_scaler) if ruta_scaler else None
+        return cls(joblib.load(ruta_features), scaler)
+
+    def _escalar(self, X):
+        if self._media is not None:
+            np.subtract(X, self._media, out=X)
+            np.multiply(X, self._inv_escala, out=X)
+        return X
+
+    def codificar(self, datos):
+        """Vector (1 × n_features) de un cliente; `datos` usa los nombres de columna del CSV.
+
+        Devuelve el buffer interno: se sobrescribe en la siguiente llamada.
+        """
+        x = self.buffer[0]
+        x.fill(0.0)
+        for columna, valor in datos.items():
+            j = self.numericas.get(columna)
+            if j is not None:
+                x[j] = MEDIANA_TOTAL_CHARGES if valor is None and columna == "TotalCharges" else valor
+                continue
+            j = self._indice.get((columna, str(valor)))
+            if j is not None:  # la categoría base (drop_first) queda en ceros
+                x[j] = 1.0
+        return self._escalar(self.buffer)
+
+    def codificar_df(self, datos):
+        """Como codificar(), envuelto sin copia en un DataFrame con los nombres de
+        features.pkl (el modelo se entrenó con nombres de columnas)."""
+        return pd.DataFrame(self.codificar(datos), columns=self.features, copy=False)
+
+    def codificar_lote(self, df, salida=None):
+        """Matriz (n_filas × n_features) de un DataFrame con formato Telco, en `salida` si alcanza."""
+        if salida is None or salida.shape[0] < len(df):
+            salida = np.empty((len(df), self.n), dtype=np.float32)
+        X = salida[:len(df)]
+        X.fill(0.0)
+        for columna, j in self.numericas.items():
+            valores = pd.to_numeric(df[columna], errors="coerce").to_numpy(dtype=np.float64)
+            if columna == "TotalCharges":
+                valores = np.where(np.isnan(valores), MEDIANA_TOTAL_CHARGES, valores)
+            X[:, j] = valores
+        for columna, opciones in self.dummies.items():
+            valores = df[columna].astype(str).str.strip().to_numpy()
+            for valor, j in opciones:
+                X[:, j] = valores == valor
+        return self._escalar(X)
@@ -0,0 +1,123 @@
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from codificador import CodificadorCliente
+
+# ===============================
+# EVALUACIÓN POR LOTES (CLI)
+# ===============================
+# Evalúa toda la cartera de clientes de un CSV con formato Telco:
+#   python evaluar_lote.py clientes.csv resultados.csv [--bloque 100000] [--procesos 4]
+# El CSV se lee por bloques (memoria acotada aunque tenga millones de filas),
+# cada bloque se codifica con CodificadorCliente en una matriz float32
+# preasignada alineada a features.pkl y se evalúa con un solo predict_proba.
+
+# Umbrales y niveles iguales a los de app.py
+UMBRAL_ALTO = 0.6
+UMBRAL_MEDIO = 0.4
+NIVELES = np.array(["Bajo", "Medio", "Alto"], dtype=object)
+
+FILAS_POR_BLOQUE = 100_000
+
+# ===============================
+# NIVEL DE RIESGO
+# ===============================
+def nivel_riesgo(prob):
+    """Nivel de riesgo vectorizado (Bajo / Medio / Alto)."""
+    return NIVELES[(prob >= UMBRAL_MEDIO).astype(np.int8) + (prob >= UMBRAL_ALTO)]
+
+# ===============================
+# EVALUACIÓN DE UN BLOQUE
+# ===============================
+_modelo = None
+_codificador = None
+_buffer = None
+
+def _iniciar(ruta_modelo, ruta_features):
+    # Carga única del modelo por proceso (también en los procesos del pool)
+    global _modelo, _codificador
+    _modelo = joblib.load(ruta_modelo)
+    _codificador = CodificadorCliente.desde_archivos(ruta_features)
+
+def evaluar_bloque(df):
+    """Probabilidad de fuga, nivel de riesgo y pérdida anual de un bloque de clientes."""
+    global _buffer
+    if _buffer is None or _buffer.shape[0] < len(df):
+        _buffer = np.empty((len(df), _codificador.n), dtype=np.float32)
+    X = _codificador.codificar_lote(df, salida=_buffer)
+    # DataFrame sin copia: el modelo se entrenó con nombres de columnas
+    prob = _modelo.predict_proba(pd.DataFrame(X, columns=_codificador.features, copy=False))[:, 1]
+    resultado = pd.DataFrame(index=df.index)
+    if "customerID" in df.columns:
+        resultado["customerID"] = df["customerID"].to_numpy()
+    resultado["Probabilidad_Fuga"] = prob
+    resultado["Nivel_Riesgo"] = nivel_riesgo(prob)
+    resultado["Perdida_Anual"] = pd.to_numeric(df["MonthlyCharges"], errors="coerce").to_numpy() * 12
+    return resultado
+
+# ===============================
+# LECTURA POR BLOQUES Y ESCRITURA
+# ===============================
+def _bloques(ruta_entrada, codificador, filas_por_bloque):
+    numericas, dummies = codificador.numericas, codificador.dummies
+    requeridas = set(numericas) | set(dummies) | {"MonthlyCharges"}
+    cabecera = pd.read_csv(ruta_entrada, nrows=0).columns
+    faltan = sorted(requeridas - set(cabecera))
+    if faltan:
+        raise ValueError(f"Faltan columnas en {ruta_entrada}: {', '.join(faltan)}")
+    usar = [c for c in cabecera if c in requeridas or c == "customerID"]
+    tipos = {c: str for c in usar if c in dummies or c == "customerID"}
+    return pd.read_csv(ruta_entrada, usecols=usar, dtype=tipos, chunksize=filas_por_bloque)
+
+def evaluar_archivo(ruta_entrada, ruta_salida, modelo="model.pkl", features="features.pkl",
+                    filas_por_bloque=FILAS_POR_BLOQUE, procesos=1):
+    """Evalúa el CSV completo y escribe los resultados por bloques; devuelve el nº de filas."""
+    _iniciar(modelo, features)
+    bloques = _bloques(ruta_entrada, _codificador, filas_por_bloque)
+    total = 0
+    primero = True
+
+    def escribir(res):
+        nonlocal total, primero
+        res.to_csv(ruta_salida, mode="w" if primero else "a", header=primero, index=False)
+        primero = False
+        total += len(res)
+
+    if procesos <= 1:
+        for df in bloques:
+            escribir(evaluar_bloque(df))
+    else:
+        # Como mucho 2 bloques en vuelo por proceso: la memoria no crece con el archivo
+        with ProcessPoolExecutor(procesos, initializer=_iniciar, initargs=(modelo, features)) as pool:
+            pendientes = []
+            for df in bloques:
+                pendientes.append(pool.submit(evaluar_bloque, df))
+                if len(pendientes) >= 2 * procesos:
+                    escribir(pendientes.pop(0).result())
+            for fut in pendientes:
+                escribir(fut.result())
+    if primero:  # archivo sin filas: sólo la cabecera
+        pd.DataFrame(columns=["customerID", "Probabilidad_Fuga", "Nivel_Riesgo", "Perdida_Anual"]).to_csv(
+            ruta_salida, index=False)
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluación de riesgo de fuga por lotes")
+    parser.add_argument("entrada", help="CSV de clientes con formato Telco")
+    parser.add_argument("salida", help="CSV de resultados")
+    parser.add_argument("--modelo", default="model.pkl")
+    parser.add_argument("--features", default="features.pkl")
+    parser.add_argument("--bloque", type=int, default=FILAS_POR_BLOQUE, help="filas por bloque")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos para predict_proba")
+    args = parser.parse_args()
+    try:
+        n = evaluar_archivo(args.entrada, args.salida, args.modelo, args.features, args.bloque, args.procesos)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"{n:,} clientes evaluados -> {args.salida}")
@@ -1,110 +1,573 @@
 # ==============================
 # INTERFAZ GRÁFICA CON TKINTER
 # ==============================
+# Arranque en dos fases: la ventana aparece de inmediato (sólo se importa
+# tkinter) y pandas/matplotlib/motor y los datos se cargan en un hilo aparte.
+# Cada pestaña declara los recursos que necesita y se construye la primera
+# vez que se abre, cuando esos recursos ya están cargados.
+import os
+import time
+
+def _inicio_proceso():
+    """(instante en la escala de perf_counter, origen) del arranque del proceso:
+    /proc/self/stat en Linux, psutil si está instalado; si no, esta importación."""
+    ahora = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            inicio = int(f.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as f:
+            return ahora - (float(f.read().split()[0]) - inicio), "proceso"
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return ahora - (time.time() - psutil.Process().create_time()), "proceso"
+    except Exception:  # sin psutil, o psutil.Error (proceso no accesible)
+        pass
+    return ahora, "importación de interfaz"
+
+T_INICIO, ORIGEN_INICIO = _inicio_proceso()
+
+import itertools
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
-from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime
-
-try:
-    # Rutas de los archivos CSV 
-    urlRaces = "./Data/races.csv"
-    urlResults = "./Data/results.csv"
-    urlDrivers = "./Data/drivers.csv"
-    urlCircuits = "./Data/circuits.csv" 
-
-    # Lectura de todos los archivos necesarios
-    dfRaces = pd.read_csv(urlRaces)
-    dfResults = pd.read_csv(urlResults)
-    dfDrivers = pd.read_csv(urlDrivers)
-    dfCircuits = pd.read_csv(urlCircuits)
-    
-    print("Todos los archivos de datos fueron cargados exitosamente.")
-
-except FileNotFoundError as e:
-    print(f"Error: No se encontró el archivo {e.filename}. Asegúrate de que las rutas son correctas.")
-    exit()
+from tkinter import ttk, messagebox, filedialog
+
+OBJETIVO_VENTANA_MS = 500  # tiempo máximo hasta ver la ventana
+
+# Módulos pesados: se importan en el hilo de carga (_importar_pesados)
+np = pd = Figure = FigureCanvasTkAgg = NavigationToolbar2Tk = SerieLOD = None
+
+def _importar_pesados():
+    global np, pd, Figure, FigureCanvasTkAgg, NavigationToolbar2Tk, SerieLOD
+    import numpy
+    import pandas
+    from matplotlib.figure import Figure as _Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as _Canvas, NavigationToolbar2Tk as _Barra
+    from motor.lod import SerieLOD as _SerieLOD
+    np, pd, Figure, FigureCanvasTkAgg = numpy, pandas, _Figure, _Canvas
+    NavigationToolbar2Tk, SerieLOD = _Barra, _SerieLOD
+
+# ---- Recursos cargados bajo demanda (todos salen de la SesionAnalisis) ----
+def _crear_sesion(r, data_dir):
+    from motor.analisis import SesionAnalisis
+    return SesionAnalisis(data_dir)
+
+def _de_sesion(atributo):
+    return lambda r, data_dir: getattr(r["sesion"], atributo)
+
+def _campeonato(tipo):
+    return lambda r, data_dir: r["sesion"].campeonato(tipo)
+
+def _elo(modo):
+    return lambda r, data_dir: r["sesion"].elo(modo)
+
+# nombre -> (dependencias, función de carga)
+RECURSOS = {
+    "modulos":   ((), lambda r, data_dir: _importar_pesados()),
+    "sesion":    (("modulos",), _crear_sesion),
+    "drivers":   (("sesion",), _de_sesion("drivers")),
+    "circuits":  (("sesion",), _de_sesion("circuits")),
+    "races":     (("sesion",), _de_sesion("races")),
+    "results":   (("sesion",), _de_sesion("results")),
+    "hechos":    (("results", "races", "drivers"), _de_sesion("hechos")),
+    "agregados": (("hechos", "races"), _de_sesion("agregados")),
+    "pilotos":   (("drivers", "agregados"), _de_sesion("indice")),
+    "clasificacion": (("races", "results"), _de_sesion("clasificacion")),
+    "constructors": (("sesion",), _de_sesion("constructors")),
+    "paradas":   (("races", "results"), _de_sesion("paradas")),
+    "undercuts": (("paradas",), _de_sesion("undercuts")),
+    "campeonato_pilotos":       (("races",), _campeonato("pilotos")),
+    "campeonato_constructores": (("races",), _campeonato("constructores")),
+    "senales":   (("hechos", "clasificacion"), _de_sesion("senales")),
+    "elo_todos":      (("hechos",), _elo("todos")),
+    "elo_companeros": (("hechos",), _elo("companeros")),
+}
+
+def _orden_de_carga(nombres, cargados):
+    # dependencias primero, sin repetir las ya cargadas
+    orden = []
+    def visitar(n):
+        if n in cargados or n in orden:
+            return
+        for dep in RECURSOS[n][0]:
+            visitar(dep)
+        orden.append(n)
+    for n in nombres:
+        visitar(n)
+    return orden
+
+class CargadorDatos(threading.Thread):
+    """Hilo que carga recursos en orden y publica progreso/resultados en una cola."""
+
+    def __init__(self, data_dir=None):
+        super().__init__(daemon=True)
+        self.data_dir = data_dir
+        self.pedidos = queue.Queue()
+        self.mensajes = queue.Queue()
+        self._cargados = {}
+
+    def pedir(self, nombres):
+        self.pedidos.put(tuple(nombres))
+
+    def run(self):
+        while True:
+            orden = _orden_de_carga(self.pedidos.get(), self._cargados)
+            for k, nombre in enumerate(orden):
+                self.mensajes.put(("progreso", nombre, k, len(orden)))
+                try:
+                    self._cargados[nombre] = RECURSOS[nombre][1](self._cargados, self.data_dir)
+                except Exception as e:
+                    self.mensajes.put(("error", nombre, e))
+                    break
+                self.mensajes.put(("listo", nombre, self._cargados[nombre]))
+            else:
+                self.mensajes.put(("fin", None, None))
+
+class EjecutorTareas:
+    """Pool de hilos para los análisis; los resultados vuelven al hilo de Tk por una cola.
+
+    Cada tarea va por un canal (p. ej. "remontadores"): un pedido nuevo en el
+    mismo canal cancela el anterior o, si ya estaba corriendo, descarta su
+    resultado.
+    """
+
+    def __init__(self, al_error, hilos=2):
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="analisis")
+        self._terminadas = queue.Queue()
+        self._ids = itertools.count(1)
+        self._vigentes = {}   # canal -> (id, futuro) del último pedido
+        self.al_error = al_error
+
+    def enviar(self, canal, calcular, mostrar, *args):
+        """Corre calcular(*args) en el pool y luego mostrar(resultado) en el hilo de Tk."""
+        previo = self._vigentes.get(canal)
+        if previo is not None:
+            previo[1].cancel()
+        tid = next(self._ids)
+        futuro = self._pool.submit(calcular, *args)
+        self._vigentes[canal] = (tid, futuro)
+        futuro.add_done_callback(lambda f: self._terminadas.put((canal, tid, f, mostrar)))
+
+    def cancelar(self, canal):
+        previo = self._vigentes.pop(canal, None)
+        if previo is not None:
+            previo[1].cancel()
+
+    def ocupado(self):
+        return bool(self._vigentes)
+
+    def procesar(self):
+        # se llama desde el hilo de Tk (after)
+        while True:
+            try:
+                canal, tid, futuro, mostrar = self._terminadas.get_nowait()
+            except queue.Empty:
+                return
+            vigente = self._vigentes.get(canal)
+            if vigente is None or vigente[0] != tid:
+                continue  # superada por un pedido más nuevo
+            del self._vigentes[canal]
+            try:
+                mostrar(futuro.result())
+            except Exception as e:
+                self.al_error(e)
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
 # --- utilidades de tabla y gráficos ---
-def df_to_treeview(tree: ttk.Treeview, df: pd.DataFrame, max_rows: int = 200):
-    # limpiar
-    for c in tree.get_children():
-        tree.delete(c)
-    tree["columns"] = list(df.columns)
-    tree["show"] = "headings"
-    # configurar columnas
-    for col in df.columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=120, anchor="center")
-    # insertar filas (limitado)
-    for _, row in df.head(max_rows).iterrows():
-        tree.insert("", "end", values=list(row.values))
-
-def draw_figure(container: tk.Widget, fig: Figure, attr_name: str):
-    # elimina canvas anterior si existe
-    old = getattr(container, attr_name, None)
-    if old:
-        old.get_tk_widget().destroy()
-    canvas = FigureCanvasTkAgg(fig, master=container)
-    canvas.draw()
-    widget = canvas.get_tk_widget()
-    widget.pack(fill="both", expand=True)
-    setattr(container, attr_name, canvas)
-
-# ---- helpers H2H (reuso de tu lógica) ----
-def _resolver_piloto_gui(dfDrivers, query):
-    t = dfDrivers.copy()
-    t["driverRefLower"] = t["driverRef"].astype(str).str.lower()
-    t["codeLower"]      = t["code"].astype(str).str.lower()
-    t["nameLower"]      = (t["forename"].astype(str) + " " + t["surname"].astype(str)).str.lower()
-    t["surnameLower"]   = t["surname"].astype(str).str.lower()
-    q = str(query).strip().lower()
-    cand = t[
-        (t["driverRefLower"] == q) | (t["codeLower"] == q) |
-        (t["nameLower"] == q) | (t["surnameLower"] == q)
-    ]
-    if cand.empty:
-        cand = t[t["nameLower"].str.contains(q, na=False) | t["surnameLower"].str.contains(q, na=False)]
-    if cand.empty:
-        raise ValueError(f"No se encontró el piloto '{query}'. Usa driverRef, código o nombre.")
-    row = cand.iloc[0]
-    return int(row["driverId"]), f"{row['forename']} {row['surname']}", row["driverRef"]
-
-def _catalogo_pilotos_gui(dfDrivers, dfResults):
-    starts = dfResults.groupby("driverId")["raceId"].nunique().reset_index(name="starts")
-    cat = pd.merge(dfDrivers.copy(), starts, on="driverId", how="left")
-    cat["starts"] = cat["starts"].fillna(0).astype(int)
-    def fmt(r):
-        code = f" ({r['code']})" if pd.notna(r["code"]) and str(r["code"]).strip() != "" else ""
-        return f"{r['driverRef']} — {r['forename']} {r['surname']}{code}"
-    cat["display"] = cat.apply(fmt, axis=1)
-    return cat.sort_values("starts", ascending=False)[["driverId","driverRef","forename","surname","code","starts","display"]]
+class TablaVirtual:
+    """Treeview con desplazamiento virtual: la tabla completa vive en columnas
+    NumPy y sólo existen los ítems de las filas que caben en pantalla; al
+    desplazarse o reordenar se reescriben sus valores."""
+
+    def __init__(self, tree, barra):
+        self.tree, self.barra = tree, barra
+        self.columnas, self.datos = [], []
+        self.orden = np.arange(0)          # fila del modelo que va en cada posición
+        self.inicio = 0                    # primera posición visible
+        self.visibles = int(tree["height"])
+        self.col_orden, self.ascendente = None, True
+        barra.configure(command=self._desplazar)
+        tree.bind("<MouseWheel>", lambda e: self._mover(-3 if e.delta > 0 else 3))
+        tree.bind("<Button-4>", lambda e: self._mover(-3))
+        tree.bind("<Button-5>", lambda e: self._mover(3))
+        tree.bind("<Prior>", lambda e: self._mover(-self.visibles))
+        tree.bind("<Next>", lambda e: self._mover(self.visibles))
+        tree.bind("<Up>", lambda e: self._en_borde(e, 0, -1))
+        tree.bind("<Down>", lambda e: self._en_borde(e, -1, 1))
+        tree.bind("<Configure>", self._al_redimensionar)
+
+    def cargar(self, df):
+        self.columnas = [str(c) for c in df.columns]
+        self.datos = [df[c].to_numpy() for c in df.columns]
+        self.orden = np.arange(len(df))
+        self.inicio, self.col_orden = 0, None
+        self.tree["columns"] = self.columnas
+        self.tree["show"] = "headings"
+        for k, col in enumerate(self.columnas):
+            self.tree.heading(col, text=col, command=lambda k=k: self.ordenar(k))
+            self.tree.column(col, width=120, anchor="center")
+        self._pintar()
+
+    def ordenar(self, k):
+        """Ordena por la columna k (un segundo clic invierte el orden) sin volver a calcular la tabla."""
+        self.ascendente = not self.ascendente if self.col_orden == k else True
+        self.col_orden = k
+        serie = pd.Series(self.datos[k])
+        self.orden = serie.sort_values(ascending=self.ascendente, kind="mergesort",
+                                       na_position="last").index.to_numpy()
+        for j, col in enumerate(self.columnas):
+            flecha = (" ▲" if self.ascendente else " ▼") if j == k else ""
+            self.tree.heading(col, text=col + flecha)
+        self.inicio = 0
+        self._pintar()
+
+    def _pintar(self):
+        n = len(self.orden)
+        self.inicio = max(0, min(self.inicio, n - self.visibles))
+        filas = self.orden[self.inicio:self.inicio + self.visibles]
+        items = self.tree.get_children()
+        if len(items) > len(filas):
+            self.tree.delete(*items[len(filas):])
+        for k, fila in enumerate(filas):
+            valores = [col[fila] for col in self.datos]
+            if k < len(items):
+                self.tree.item(items[k], values=valores)
+            else:
+                self.tree.insert("", "end", values=valores)
+        self.barra.set(*((self.inicio / n, (self.inicio + len(filas)) / n) if n else (0.0, 1.0)))
+
+    def _mover(self, filas):
+        self.inicio += filas
+        self._pintar()
+        return "break"
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        # protocolo de ttk.Scrollbar: ("moveto", fracción) o ("scroll", n, "units"/"pages")
+        if accion == "moveto":
+            self.inicio = int(round(float(cantidad) * len(self.orden)))
+            self._pintar()
+        else:
+            self._mover(int(cantidad) * (self.visibles if unidad == "pages" else 1))
+
+    def _en_borde(self, evento, posicion, filas):
+        # flechas: dentro de la ventana mueve la selección; en el borde desplaza
+        items = self.tree.get_children()
+        if items and self.tree.focus() == items[posicion]:
+            self._mover(filas)
+            self.tree.focus(items[posicion])
+            self.tree.selection_set(items[posicion])
+            return "break"
+
+    def _al_redimensionar(self, evento):
+        # filas que caben: alto del widget menos la cabecera, entre el alto de una fila
+        items = self.tree.get_children()
+        caja = self.tree.bbox(items[0]) if items else None
+        if not caja:
+            return
+        visibles = max(1, (evento.height - caja[1]) // max(caja[3], 1))
+        if visibles != self.visibles:
+            self.visibles = visibles
+            self._pintar()
+
+def crear_tabla(padre, height=8):
+    """Treeview + barra vertical conectadas a una TablaVirtual (se llena con df_to_treeview)."""
+    tree = ttk.Treeview(padre, height=height)
+    tree.pack(side="left", fill="both", expand=True)
+    barra = ttk.Scrollbar(padre, orient="vertical")
+    barra.pack(side="left", fill="y")
+    tree._modelo = TablaVirtual(tree, barra)
+    return tree
+
+def df_to_treeview(tree: ttk.Treeview, df: "pd.DataFrame"):
+    # la tabla entera queda en el modelo; sólo se materializan las filas visibles
+    tree._modelo.cargar(df)
+
+# Los _calc_* (en el pool) describen cada gráfico con datos: grafico() +
+# series linea/barras/barras_h/puntos. El hilo de Tk los vuelca en el Lienzo
+# fijo de cada panel, que reutiliza sus artistas.
+def linea(x, y, etiqueta=None, lod=False, **estilo):
+    # lod=True: series largas reducidas a min/max por píxel del tramo visible (motor/lod.py)
+    return dict(tipo="linea", x=x, y=y, etiqueta=etiqueta, lod=lod, estilo=estilo)
+
+def barras(x, y, base=None, etiqueta=None, ancho=0.8, alinear="center"):
+    return dict(tipo="barras", x=np.asarray(x), y=np.asarray(y, dtype=np.float64), base=base,
+                etiqueta=etiqueta, ancho=ancho, alinear=alinear)
+
+def barras_h(valores, base=None, etiqueta=None):
+    # una barra por fila (de abajo arriba); los nombres van en yticks
+    valores = np.asarray(valores, dtype=np.float64)
+    return dict(tipo="barh", x=np.arange(len(valores)), y=valores, base=base, etiqueta=etiqueta)
+
+def puntos(x, y, **estilo):
+    return dict(tipo="puntos", x=np.asarray(x, dtype=np.float64), y=np.asarray(y, dtype=np.float64),
+                etiqueta=None, estilo=estilo)
+
+def grafico(titulo, xlabel="", ylabel="", series=(), **opciones):
+    """Opciones: xticks/yticks (nombres en 0..n-1), refs [(eje "h"/"v", valor[, etiqueta])],
+    notas [(texto, x, y)], leyenda (kwargs de ax.legend), rejilla ("x", "y" o "both"),
+    invertir_x/invertir_y, xlim_izq, ytick_size, tamano (pulgadas de la figura),
+    navegable (barra de zoom/desplazamiento de matplotlib)."""
+    return dict(opciones, titulo=titulo, xlabel=xlabel, ylabel=ylabel, series=list(series))
+
+class Lienzo:
+    """Figura y canvas fijos de un panel: cada dibujo actualiza las líneas,
+    barras y puntos existentes (o los rehace si cambia su número) y repinta
+    con draw_idle; tight_layout sólo corre cuando cambian los textos."""
+
+    def __init__(self, container, tamano=(5.5, 3.8), navegable=False):
+        self.fig = Figure(figsize=tamano, dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=container)
+        if navegable:
+            NavigationToolbar2Tk(self.canvas, container, pack_toolbar=False).pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.series = []    # (clave, artista) de cada serie
+        self.refs = []      # (eje, Line2D) de las líneas de referencia
+        self.notas = []
+        self.textos = None  # títulos, ticks y leyenda del último dibujo
+
+    def _crear(self, s, color):
+        ax = self.ax
+        if s["tipo"] == "linea" and s["lod"]:
+            artista = ax.plot([], [], color=color, label=s["etiqueta"], **s["estilo"])[0]
+            artista._lod = SerieLOD(ax, artista, s["x"], s["y"], s["estilo"].get("marker", "None"))
+            return artista
+        if s["tipo"] == "linea":
+            return ax.plot(s["x"], s["y"], color=color, label=s["etiqueta"], **s["estilo"])[0]
+        if s["tipo"] == "barras":
+            return ax.bar(s["x"], s["y"], width=s["ancho"], bottom=s["base"], align=s["alinear"],
+                          color=color, label=s["etiqueta"])
+        if s["tipo"] == "barh":
+            return ax.barh(s["x"], s["y"], left=s["base"], color=color, label=s["etiqueta"])
+        return ax.scatter(s["x"], s["y"], color=color, **s["estilo"])
+
+    @staticmethod
+    def _quitar(artista):
+        if hasattr(artista, "_lod"):
+            artista._lod.desconectar()
+        artista.remove()
+
+    @staticmethod
+    def _actualizar(artista, s):
+        if s["tipo"] == "linea" and s["lod"]:
+            artista._lod.cargar(s["x"], s["y"])
+        elif s["tipo"] == "linea":
+            artista.set_data(s["x"], s["y"])
+        elif s["tipo"] == "puntos":
+            artista.set_offsets(np.column_stack([s["x"], s["y"]]))
+        else:
+            n = len(s["y"])
+            base = np.zeros(n) if s["base"] is None else np.asarray(s["base"], dtype=np.float64)
+            if s["tipo"] == "barh":
+                for r, v, b in zip(artista.patches, s["y"], base):
+                    r.set_width(v)
+                    r.set_x(b)
+            else:
+                ancho = np.broadcast_to(np.asarray(s["ancho"], dtype=np.float64), (n,))
+                x = s["x"] - ancho / 2 if s["alinear"] == "center" else s["x"]
+                for r, xi, v, b, w in zip(artista.patches, x, s["y"], base, ancho):
+                    r.set_bounds(xi, b, w, v)
+        if s["tipo"] != "puntos":
+            artista.set_label(s["etiqueta"] if s["etiqueta"] is not None else "_nolegend_")
+
+    def dibujar(self, g):
+        ax = self.ax
+        rehecho = False
+        # series: se reutiliza el artista si es del mismo tipo (y, en barras, del mismo tamaño)
+        series = []
+        for i, s in enumerate(g["series"]):
+            clave = (s["tipo"], len(s["y"]) if s["tipo"] in ("barras", "barh") else s.get("lod"))
+            previo = self.series[i] if i < len(self.series) else None
+            if previo is not None and previo[0] == clave:
+                self._actualizar(previo[1], s)
+                series.append(previo)
+                continue
+            if previo is not None:
+                self._quitar(previo[1])
+            series.append((clave, self._crear(s, f"C{i}")))
+            rehecho = True
+        for _, artista in self.series[len(series):]:
+            self._quitar(artista)
+            rehecho = True
+        self.series = series
+
+        refs = []
+        for i, (eje, valor, *etiqueta) in enumerate(g.get("refs", ())):
+            etiqueta = etiqueta[0] if etiqueta else "_nolegend_"
+            previo = self.refs[i] if i < len(self.refs) else None
+            if previo is not None and previo[0] == eje:
+                (previo[1].set_xdata if eje == "v" else previo[1].set_ydata)([valor, valor])
+                previo[1].set_label(etiqueta)
+                refs.append(previo)
+                continue
+            if previo is not None:
+                previo[1].remove()
+            trazar = ax.axvline if eje == "v" else ax.axhline
+            refs.append((eje, trazar(valor, linestyle="--", color="gray", label=etiqueta)))
+            rehecho = True
+        for _, r in self.refs[len(refs):]:
+            r.remove()
+            rehecho = True
+        self.refs = refs
+
+        for nota in self.notas:
+            nota.remove()
+        self.notas = [ax.annotate(t, (x, y), fontsize=7) for t, x, y in g.get("notas", ())]
+
+        ax.set_title(g["titulo"])
+        ax.set_xlabel(g["xlabel"])
+        ax.set_ylabel(g["ylabel"])
+        for eje, nombres in (("x", g.get("xticks")), ("y", g.get("yticks"))):
+            if nombres is not None:
+                getattr(ax, f"set_{eje}ticks")(np.arange(len(nombres)), labels=list(nombres))
+        if g.get("ytick_size"):
+            ax.tick_params(axis="y", labelsize=g["ytick_size"])
+        ax.grid(False)
+        if g.get("rejilla"):
+            ax.grid(True, axis=g["rejilla"], linestyle="--", alpha=0.6)
+
+        # límites: autoescala sobre los datos nuevos (los puntos no entran en relim)
+        ax.set_autoscale_on(True)
+        ax.relim()
+        for _, artista in self.series:
+            if hasattr(artista, "get_offsets"):
+                ax.update_datalim(artista.get_offsets())
+        ax.autoscale_view()
+        if ax.xaxis_inverted() != bool(g.get("invertir_x")):
+            ax.invert_xaxis()
+        if ax.yaxis_inverted() != bool(g.get("invertir_y")):
+            ax.invert_yaxis()
+        if g.get("xlim_izq") is not None:
+            ax.set_xlim(left=g["xlim_izq"])
+
+        etiquetas = tuple(ax.get_legend_handles_labels()[1])
+        if g.get("leyenda") is None:
+            if ax.get_legend() is not None:
+                ax.get_legend().remove()
+        elif rehecho or ax.get_legend() is None or etiquetas != self.textos[-1]:
+            ax.legend(**g["leyenda"])
+
+        textos = (g["titulo"], g["xlabel"], g["ylabel"], tuple(g.get("xticks") or ()),
+                  tuple(g.get("yticks") or ()), g.get("ytick_size"), etiquetas)
+        if textos != self.textos:
+            self.fig.tight_layout()
+            self.textos = textos
+        self.canvas.draw_idle()
+
+def draw_figure(container: tk.Widget, g: dict, attr_name: str = "_lienzo"):
+    # un Lienzo por panel, creado en el primer dibujo y reutilizado después
+    lienzo = getattr(container, attr_name, None)
+    if lienzo is None:
+        lienzo = Lienzo(container, g.get("tamano", (5.5, 3.8)), g.get("navegable", False))
+        setattr(container, attr_name, lienzo)
+    lienzo.dibujar(g)
 
 class F1AnalyzerApp(tk.Tk):
-    def __init__(self, dfRaces, dfResults, dfDrivers, dfCircuits):
+    def __init__(self, data_dir=None, al_mostrar=None):
         super().__init__()
         self.title("F1nal Gambling")
         self.geometry("1100x780")
 
-        # datos
-        self.dfRaces = dfRaces
-        self.dfResults = dfResults
-        self.dfDrivers = dfDrivers
-        self.dfCircuits = dfCircuits
-
-        # catálogo pilotos para H2H
-        self.cat = _catalogo_pilotos_gui(dfDrivers, dfResults)
+        # datos: se completan a medida que llegan del hilo de carga
+        self.recursos = {}
+        self.cargador = CargadorDatos(data_dir)
+        self.al_mostrar = al_mostrar
+        self._ventana_visible = False
+        # análisis fuera del hilo de Tk (los gráficos se arman en el pool)
+        self.tareas = EjecutorTareas(al_error=lambda e: messagebox.showerror("Error", str(e)))
 
         self._build_ui()
+        self.bind("<Map>", self._ventana_lista, add="+")
+        self.cargador.start()
+        self.after(30, self._revisar_colas)
+
+    def destroy(self):
+        self.tareas.cerrar()
+        super().destroy()
+
+    def _ventana_lista(self, event):
+        if event.widget is not self or self._ventana_visible:
+            return
+        self._ventana_visible = True
+        self.ms_primera_ventana = (time.perf_counter() - T_INICIO) * 1000
+        aviso = "" if self.ms_primera_ventana <= OBJETIVO_VENTANA_MS else " — por encima del objetivo"
+        print(f"Ventana lista en {self.ms_primera_ventana:.0f} ms desde el arranque del {ORIGEN_INICIO} "
+              f"(objetivo {OBJETIVO_VENTANA_MS} ms){aviso}")
+        if self.al_mostrar:
+            self.after_idle(self.al_mostrar, self)
+        self._al_cambiar_pestana()
+
+    # ------------- carga y análisis en segundo plano -------------
+    def _revisar_colas(self):
+        self.tareas.procesar()
+        self._estado_ocupado(self.tareas.ocupado())
+        try:
+            while True:
+                tipo, nombre, *datos = self.cargador.mensajes.get_nowait()
+                if tipo == "progreso":
+                    k, total = datos
+                    self.estado.set(f"Cargando {nombre}…")
+                    self.barra.configure(maximum=total, value=k)
+                elif tipo == "listo":
+                    self._guardar_recurso(nombre, datos[0])
+                elif tipo == "fin":
+                    self.estado.set("Listo")
+                    self.barra.configure(value=self.barra["maximum"])
+                    self._al_cambiar_pestana()
+                elif tipo == "error":
+                    self._error_de_carga(datos[0])
+        except queue.Empty:
+            pass
+        self.after(30, self._revisar_colas)
+
+    def _estado_ocupado(self, ocupado):
+        if ocupado == self._ocupado:
+            return
+        self._ocupado = ocupado
+        self.aviso_ocupado.set("Calculando…" if ocupado else "")
+        self.configure(cursor="watch" if ocupado else "")
+
+    def _guardar_recurso(self, nombre, valor):
+        self.recursos[nombre] = valor
+        if nombre == "sesion":
+            # los cálculos van a la sesión; la interfaz sólo arma tablas y gráficos
+            self.sesion = valor
+            self.memo = valor.memo
+        elif nombre == "pilotos":
+            # índice + catálogo de pilotos para H2H (se construyen una sola vez)
+            self.indice = valor
+            self.refs = self.sesion.refs
+            self.cat = valor.catalogo()
+
+    def _error_de_carga(self, err):
+        self.estado.set("Error al cargar los datos")
+        self._pedidas.clear()  # al volver a abrir la pestaña se reintenta
+        if isinstance(err, FileNotFoundError):
+            msg = f"No se encontró el archivo {err.filename}. Asegúrate de que las rutas son correctas."
+        else:
+            msg = str(err)
+        messagebox.showerror("Error", msg)
 
     # ------------- UI -------------
     def _build_ui(self):
-        notebook = ttk.Notebook(self)
+        # barra de estado (progreso de la carga)
+        barra_estado = ttk.Frame(self, padding=(8, 2))
+        barra_estado.pack(side="bottom", fill="x")
+        self.estado = tk.StringVar(value="Iniciando…")
+        ttk.Label(barra_estado, textvariable=self.estado).pack(side="left")
+        self.barra = ttk.Progressbar(barra_estado, length=220, mode="determinate")
+        self.barra.pack(side="right")
+        self.aviso_ocupado = tk.StringVar(value="")
+        self._ocupado = False
+        ttk.Label(barra_estado, textvariable=self.aviso_ocupado).pack(side="right", padx=12)
+
+        self.notebook = notebook = ttk.Notebook(self)
         notebook.pack(fill="both", expand=True)
 
         # Tabs
@@ -112,16 +575,93 @@ class F1AnalyzerApp(tk.Tk):
         self.tab_cir    = ttk.Frame(notebook)
         self.tab_age    = ttk.Frame(notebook)
         self.tab_h2h    = ttk.Frame(notebook)
+        self.tab_clasif = ttk.Frame(notebook)
+        self.tab_pits   = ttk.Frame(notebook)
+        self.tab_camp   = ttk.Frame(notebook)
+        self.tab_previo = ttk.Frame(notebook)
+        self.tab_fiab   = ttk.Frame(notebook)
+        self.tab_equipos = ttk.Frame(notebook)
+        self.tab_elo    = ttk.Frame(notebook)
 
         notebook.add(self.tab_remont, text="Remontadores")
         notebook.add(self.tab_cir,    text="Circuitos")
         notebook.add(self.tab_age,    text="Edades")
         notebook.add(self.tab_h2h,    text="H2H")
+        notebook.add(self.tab_clasif, text="Clasificación")
+        notebook.add(self.tab_pits,   text="Paradas")
+        notebook.add(self.tab_camp,   text="Campeonato")
+        notebook.add(self.tab_previo, text="Previo GP")
+        notebook.add(self.tab_fiab,   text="Fiabilidad")
+        notebook.add(self.tab_equipos, text="Equipos")
+        notebook.add(self.tab_elo,    text="Elo")
+
+        # pestaña -> (constructor, recursos que necesita); se construye al abrirla
+        self._pestanas = {
+            str(self.tab_remont): (self._tab_remontadores, ("agregados", "pilotos")),
+            str(self.tab_cir):    (self._tab_circuitos, ("agregados", "circuits")),
+            str(self.tab_age):    (self._tab_edades, ("drivers",)),
+            str(self.tab_h2h):    (self._tab_h2h, ("hechos", "pilotos")),
+            str(self.tab_clasif): (self._tab_clasificacion, ("clasificacion", "pilotos", "circuits")),
+            str(self.tab_pits):   (self._tab_paradas, ("paradas", "undercuts", "hechos", "constructors", "circuits")),
+            str(self.tab_camp):   (self._tab_campeonato, ("campeonato_pilotos", "campeonato_constructores",
+                                                          "drivers", "constructors")),
+            str(self.tab_previo): (self._tab_previo, ("senales", "pilotos", "constructors")),
+            str(self.tab_fiab):   (self._tab_fiabilidad, ("hechos", "pilotos", "constructors", "circuits")),
+            str(self.tab_equipos): (self._tab_equipos, ("hechos", "pilotos", "constructors",
+                                                        "campeonato_constructores")),
+            str(self.tab_elo):    (self._tab_elo, ("elo_todos", "elo_companeros", "pilotos")),
+        }
+        self._construidas = set()
+        self._pedidas = set()
+        for pestana in self._pestanas:
+            lbl = ttk.Label(self.nametowidget(pestana), text="Cargando datos…", padding=20)
+            lbl.pack()
+            self.nametowidget(pestana)._aviso = lbl
+        notebook.bind("<<NotebookTabChanged>>", self._al_cambiar_pestana)
+
+    def _al_cambiar_pestana(self, event=None):
+        if not self._ventana_visible:
+            return
+        pestana = self.notebook.select()
+        if not pestana or pestana in self._construidas:
+            return
+        construir, necesarios = self._pestanas[pestana]
+        faltan = [r for r in necesarios if r not in self.recursos]
+        if faltan:
+            if pestana not in self._pedidas:
+                self._pedidas.add(pestana)
+                self.cargador.pedir(faltan)
+            return
+        self._construidas.add(pestana)
+        self.nametowidget(pestana)._aviso.destroy()
+        construir()
+
+    def _analizar(self, canal, params, calcular, mostrar):
+        # resultado (tablas + datos de los gráficos) desde el memo si ya se pidió con estos
+        # parámetros; si no, se calcula en el pool y se guarda para la próxima
+        clave = self.memo.clave(f"vista_{canal}", params)
+        guardado = self.memo.obtener(clave)
+        if guardado is not None:
+            self.tareas.cancelar(canal)
+            mostrar(guardado)
+            return
+
+        def calcular_y_guardar():
+            resultado = calcular(**params)
+            self.memo.guardar(clave, resultado)
+            return resultado
+        self.tareas.enviar(canal, calcular_y_guardar, mostrar)
 
-        self._tab_remontadores()
-        self._tab_circuitos()
-        self._tab_edades()
-        self._tab_h2h()
+    # sesiones de un GP que se pueden filtrar (motor.analisis.OPCIONES_SESION)
+    SESIONES = ("carrera", "sprint", "todas")
+
+    def _combo_sesion(self, padre, fila, columna):
+        # etiqueta en `columna` y el selector a su derecha
+        ttk.Label(padre, text="Sesión:").grid(row=fila, column=columna, sticky="w")
+        cb = ttk.Combobox(padre, values=self.SESIONES, state="readonly", width=9)
+        cb.set(self.SESIONES[0])
+        cb.grid(row=fila, column=columna + 1, padx=6)
+        return cb
 
     # ---- TAB 1: Remontadores ----
     def _tab_remontadores(self):
@@ -140,15 +680,14 @@ class F1AnalyzerApp(tk.Tk):
         self.r_topn = tk.IntVar(value=15)
         ttk.Spinbox(top, from_=1, to=100, textvariable=self.r_topn, width=8).grid(row=0, column=5, padx=6)
 
-        ttk.Button(top, text="Generar", command=self.run_remontadores).grid(row=0, column=6, padx=12)
+        self.r_sesion = self._combo_sesion(top, 0, 6)
+
+        ttk.Button(top, text="Generar", command=self.run_remontadores).grid(row=0, column=8, padx=12)
 
         mid = ttk.Frame(self.tab_remont, padding=8)
         mid.pack(fill="both", expand=True)
         # tabla
-        self.tree_remon = ttk.Treeview(mid, height=12)
-        self.tree_remon.pack(side="left", fill="both", expand=True)
-        ttk.Scrollbar(mid, orient="vertical", command=self.tree_remon.yview).pack(side="left", fill="y")
-        self.tree_remon.configure(yscrollcommand=lambda *args: None)
+        self.tree_remon = crear_tabla(mid, height=12)
 
         # gráfico
         self.plot_remon = ttk.LabelFrame(self.tab_remont, text="Gráfico")
@@ -159,37 +698,26 @@ class F1AnalyzerApp(tk.Tk):
             anio_min = int(self.r_anio.get())
             min_gp   = int(self.r_min_gp.get())
             topn     = int(self.r_topn.get())
-
-            df_merged = pd.merge(self.dfResults, self.dfRaces[["raceId","year"]], on="raceId", how="left")
-            dfd = self.dfDrivers.copy()
-            dfd["driver"] = dfd["driverRef"]
-            df_merged = pd.merge(df_merged, dfd[["driverId","driver"]], on="driverId", how="left")
-            df_merged["grid_ajustado"] = df_merged["grid"].replace(0, 20)
-            df_merged["posiciones_ganadas"] = df_merged["grid_ajustado"] - df_merged["positionOrder"]
-
-            df_analisis = df_merged[df_merged["year"] >= anio_min].copy()
-            driver_stats = df_analisis.groupby("driver").agg(
-                total_carreras=("raceId", "count"),
-                promedio_puntos=("points", "mean"),
-                promedio_pos_ganadas=("posiciones_ganadas", "mean")
-            ).reset_index()
-            driver_stats = driver_stats[driver_stats["total_carreras"] > min_gp]
-            mejores = driver_stats.sort_values(by="promedio_pos_ganadas", ascending=False)
-            df_to_treeview(self.tree_remon, mejores.head(10))
-
-            top = mejores.head(topn)
-            fig = Figure(figsize=(7.5, 4.5), dpi=100)
-            ax = fig.add_subplot(111)
-            ax.barh(list(top["driver"])[::-1], list(top["promedio_pos_ganadas"])[::-1])
-            ax.set_title(f"Top {len(top)} — Promedio de posiciones ganadas (≥{anio_min})")
-            ax.set_xlabel("Promedio posiciones ganadas/perdidas")
-            ax.set_ylabel("Piloto")
-            ax.grid(axis="x", linestyle="--", alpha=0.7)
-            ax.axvline(0, linestyle="--")
-            fig.tight_layout()
-            draw_figure(self.plot_remon, fig, "_canvas")
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        params = dict(anio_min=anio_min, min_gp=min_gp, topn=topn, tipo=self.r_sesion.get())
+        self._analizar("remontadores", params, self._calc_remontadores, self._mostrar_remontadores)
+
+    def _calc_remontadores(self, anio_min, min_gp, topn, tipo="carrera"):
+        mejores = self.sesion.remontadores(anio_min, min_gp, tipo)
+
+        top = mejores.head(topn)
+        g = grafico(f"Top {len(top)} — Promedio de posiciones ganadas (≥{anio_min})",
+                    "Promedio posiciones ganadas/perdidas", "Piloto",
+                    [barras_h(top["promedio_pos_ganadas"].to_numpy()[::-1])],
+                    yticks=list(top["driver"])[::-1], refs=[("v", 0)], rejilla="x", tamano=(7.5, 4.5))
+        return mejores, g
+
+    def _mostrar_remontadores(self, resultado):
+        tabla, g = resultado
+        df_to_treeview(self.tree_remon, tabla)
+        draw_figure(self.plot_remon, g)
 
     # ---- TAB 2: Circuitos ----
     def _tab_circuitos(self):
@@ -202,9 +730,7 @@ class F1AnalyzerApp(tk.Tk):
 
         mid = ttk.Frame(self.tab_cir, padding=8)
         mid.pack(fill="both", expand=True)
-        self.tree_cir = ttk.Treeview(mid, height=12)
-        self.tree_cir.pack(side="left", fill="both", expand=True)
-        ttk.Scrollbar(mid, orient="vertical", command=self.tree_cir.yview).pack(side="left", fill="y")
+        self.tree_cir = crear_tabla(mid, height=12)
 
         self.plot_cir = ttk.LabelFrame(self.tab_cir, text="Gráfico")
         self.plot_cir.pack(fill="both", expand=True, padx=8, pady=8)
@@ -212,26 +738,26 @@ class F1AnalyzerApp(tk.Tk):
     def run_circuitos(self):
         try:
             topn = int(self.c_topn.get())
-            df_full = pd.merge(self.dfRaces, self.dfCircuits[["circuitId","name"]],
-                               on="circuitId", how="left", suffixes=("", "_circuit"))
-            conteo = df_full["name_circuit"].value_counts()
-            top = conteo.head(topn)
-            # tabla como DataFrame
-            df_table = top.reset_index()
-            df_table.columns = ["Circuito", "Grandes Premios"]
-            df_to_treeview(self.tree_cir, df_table)
-
-            fig = Figure(figsize=(7.5, 4.5), dpi=100)
-            ax = fig.add_subplot(111)
-            ax.barh(list(top.index)[::-1], list(top.values)[::-1])
-            ax.set_title(f"Top {len(top)} circuitos con más carreras")
-            ax.set_xlabel("Número de Grandes Premios")
-            ax.set_ylabel("Circuito")
-            ax.grid(axis="x", linestyle="--", alpha=0.6)
-            fig.tight_layout()
-            draw_figure(self.plot_cir, fig, "_canvas")
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        self._analizar("circuitos", dict(topn=topn), self._calc_circuitos, self._mostrar_circuitos)
+
+    def _calc_circuitos(self, topn):
+        top = self.sesion.circuitos(topn)
+        # tabla como DataFrame
+        df_table = top.reset_index()
+        df_table.columns = ["Circuito", "Grandes Premios"]
+
+        g = grafico(f"Top {len(top)} circuitos con más carreras", "Número de Grandes Premios", "Circuito",
+                    [barras_h(top.to_numpy()[::-1])],
+                    yticks=list(top.index)[::-1], rejilla="x", tamano=(7.5, 4.5))
+        return df_table, g
+
+    def _mostrar_circuitos(self, resultado):
+        df_table, g = resultado
+        df_to_treeview(self.tree_cir, df_table)
+        draw_figure(self.plot_cir, g)
 
     # ---- TAB 3: Edades ----
     def _tab_edades(self):
@@ -244,9 +770,7 @@ class F1AnalyzerApp(tk.Tk):
 
         mid = ttk.Frame(self.tab_age, padding=8)
         mid.pack(fill="both", expand=True)
-        self.tree_age = ttk.Treeview(mid, height=10)
-        self.tree_age.pack(side="left", fill="both", expand=True)
-        ttk.Scrollbar(mid, orient="vertical", command=self.tree_age.yview).pack(side="left", fill="y")
+        self.tree_age = crear_tabla(mid, height=10)
 
         self.plot_age = ttk.LabelFrame(self.tab_age, text="Gráfico")
         self.plot_age.pack(fill="both", expand=True, padx=8, pady=8)
@@ -254,29 +778,30 @@ class F1AnalyzerApp(tk.Tk):
     def run_edades(self):
         try:
             bins = int(self.e_bins.get())
-            drivers = self.dfDrivers.copy()
-            drivers["dob"] = pd.to_datetime(drivers["dob"], errors="coerce")
-            drivers = drivers.dropna(subset=["dob"])
-            drivers["age"] = ((datetime.now() - drivers["dob"]).dt.days / 365.25).astype(int)
-
-            # resumen
-            desc = drivers["age"].describe().to_frame().T
-            df_to_treeview(self.tree_age, desc)
-
-            fig = Figure(figsize=(7.5, 4.5), dpi=100)
-            ax = fig.add_subplot(111)
-            ax.hist(list(drivers["age"]), bins=bins)
-            mean_age = drivers["age"].mean()
-            ax.axvline(mean_age, linestyle="--", linewidth=2, label=f"Promedio: {mean_age:.1f}")
-            ax.legend()
-            ax.set_title("Distribución de edades de pilotos")
-            ax.set_xlabel("Edad (años)")
-            ax.set_ylabel("Número de pilotos")
-            ax.grid(axis="y", linestyle="--", alpha=0.7)
-            fig.tight_layout()
-            draw_figure(self.plot_age, fig, "_canvas")
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        self._analizar("edades", dict(bins=bins), self._calc_edades, self._mostrar_edades)
+
+    def _calc_edades(self, bins):
+        edades = self.sesion.edades()
+
+        # resumen
+        desc = edades.describe().to_frame().T
+
+        # histograma ya contado: el lienzo sólo ajusta las barras
+        conteo, bordes = np.histogram(edades.dropna().to_numpy(), bins=bins)
+        mean_age = edades.mean()
+        g = grafico("Distribución de edades de pilotos", "Edad (años)", "Número de pilotos",
+                    [barras(bordes[:-1], conteo, ancho=np.diff(bordes), alinear="edge")],
+                    refs=[("v", mean_age, f"Promedio: {mean_age:.1f}")], leyenda={},
+                    rejilla="y", tamano=(7.5, 4.5))
+        return desc, g
+
+    def _mostrar_edades(self, resultado):
+        desc, g = resultado
+        df_to_treeview(self.tree_age, desc)
+        draw_figure(self.plot_age, g)
 
     # ---- TAB 4: H2H ----
     def _tab_h2h(self):
@@ -301,6 +826,9 @@ class F1AnalyzerApp(tk.Tk):
         self.cb_B = ttk.Combobox(top, values=all_values, width=45)
         self.cb_A.grid(row=3, column=0, padx=4, pady=2, sticky="ew")
         self.cb_B.grid(row=3, column=1, padx=4, pady=2, sticky="ew")
+        # autocompletado: al escribir se filtran las opciones con el índice
+        for cb in (self.cb_A, self.cb_B):
+            cb.bind("<KeyRelease>", self._autocompletar)
 
         ttk.Label(top, text="Año desde:").grid(row=4, column=0, sticky="w", pady=(6,0))
         ttk.Label(top, text="Año hasta:").grid(row=4, column=1, sticky="w", pady=(6,0))
@@ -308,15 +836,17 @@ class F1AnalyzerApp(tk.Tk):
         self.h_to   = ttk.Entry(top, width=10)
         self.h_from.grid(row=5, column=0, sticky="w", padx=4)
         self.h_to.grid(row=5, column=1, sticky="w", padx=4)
+        sesion = ttk.Frame(top)
+        sesion.grid(row=5, column=2, sticky="w")
+        self.h_sesion = self._combo_sesion(sesion, 0, 0)
 
-        ttk.Button(top, text="Comparar H2H", command=self.run_h2h).grid(row=6, column=0, columnspan=2, pady=8)
+        ttk.Button(top, text="Comparar H2H", command=self.run_h2h).grid(row=6, column=0, pady=8)
+        ttk.Button(top, text="Exportar matriz H2H…", command=self.exportar_matriz_h2h).grid(row=6, column=1, pady=8)
 
         # Resumen
         mid = ttk.Frame(self.tab_h2h, padding=8)
         mid.pack(fill="both", expand=True)
-        self.tree_h2h = ttk.Treeview(mid, height=6)
-        self.tree_h2h.pack(side="left", fill="both", expand=True)
-        ttk.Scrollbar(mid, orient="vertical", command=self.tree_h2h.yview).pack(side="left", fill="y")
+        self.tree_h2h = crear_tabla(mid, height=6)
 
         # Gráficos
         self.plot_h2h_1 = ttk.LabelFrame(self.tab_h2h, text="Victorias H2H")
@@ -343,116 +873,582 @@ class F1AnalyzerApp(tk.Tk):
             self.cb_B.set(matches[0])
             self.assign_next = "A"
 
+    def _autocompletar(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        cb = event.widget
+        texto = cb.get()
+        cb["values"] = self.indice.sugerir(texto, limite=50) if texto.strip() else list(self.cat["display"])
+
     def run_h2h(self):
+        # tomar driverRef del texto seleccionado (lo primero antes de " — ")
+        def extract_ref(val):
+            if not val or val.strip() == "":
+                return ""
+            return val.split(" — ")[0].strip()
+
+        A_tok = extract_ref(self.cb_A.get())
+        B_tok = extract_ref(self.cb_B.get())
+        if not A_tok or not B_tok:
+            messagebox.showwarning("Atención", "Selecciona ambos pilotos (A y B).")
+            return
+
+        y_from = self.h_from.get().strip() or None
+        y_to   = self.h_to.get().strip() or None
+        params = dict(A_tok=A_tok, B_tok=B_tok, y_from=y_from, y_to=y_to, tipo=self.h_sesion.get())
+        self._analizar("h2h", params, self._calc_h2h, self._mostrar_h2h)
+
+    def _calc_h2h(self, A_tok, B_tok, y_from, y_to, tipo="carrera"):
+        res = self.sesion.h2h(A_tok, B_tok, y_from, y_to, tipo)
+        if res is None:
+            return None
+        _, A_name, A_ref = res["A"]
+        _, B_name, B_ref = res["B"]
+        resumen = res["resumen"]
+        winsA, winsB = res["victorias"]
+
+        # gráfico 1: victorias
+        g1 = grafico(f"H2H: {A_name} vs {B_name} — Victorias", "Piloto", "Carreras donde terminó por delante",
+                     [barras([0, 1], [winsA, winsB])], xticks=[A_ref, B_ref], rejilla="y", tamano=(7.5, 3.8))
+
+        # gráfico 2: diferencia acumulada sobre fechas (reducida al ancho en píxeles;
+        # la rueda o la barra hacen zoom y se vuelve a muestrear el tramo visible)
+        g2 = grafico(f"Diferencia acumulada ({A_ref} – {B_ref})", "Fecha (sólo carreras comunes)",
+                     f"Acumulado a favor de {A_ref}",
+                     [linea(res["fechas"], res["acumulado"], lod=True, marker="o", markersize=3)],
+                     rejilla="both", navegable=True, tamano=(7.5, 3.8))
+        return resumen, g1, g2
+
+    def _mostrar_h2h(self, resultado):
+        if resultado is None:
+            messagebox.showinfo("Sin datos", "No hay carreras comunes con resultados válidos.")
+            return
+        resumen, g1, g2 = resultado
+        df_to_treeview(self.tree_h2h, resumen)
+        draw_figure(self.plot_h2h_1, g1)
+        draw_figure(self.plot_h2h_2, g2)
+
+    def exportar_matriz_h2h(self):
+        # todas las parejas del rango de años indicado en una sola pasada
+        ruta = filedialog.asksaveasfilename(
+            title="Exportar matriz H2H", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NumPy comprimido", "*.npz")])
+        if not ruta:
+            return
+        y_from = self.h_from.get().strip() or None
+        y_to   = self.h_to.get().strip() or None
+        self.tareas.enviar("exportar_h2h", self._calc_exportar_h2h,
+                           lambda msg: messagebox.showinfo("Matriz H2H", msg), ruta, y_from, y_to,
+                           self.h_sesion.get())
+
+    def _calc_exportar_h2h(self, ruta, y_from, y_to, tipo="carrera"):
+        matriz = self.sesion.matriz_h2h(y_from, y_to, sesion=tipo)
+        matriz.exportar(ruta, refs=dict(zip(self.indice.ids, self.indice.refs)))
+        return f"{len(matriz.ids)} pilotos exportados en {ruta}"
+
+    # ---- TAB 5: Clasificación vs carrera ----
+    def _tab_clasificacion(self):
+        top = ttk.Frame(self.tab_clasif, padding=8)
+        top.pack(fill="x")
+
+        ttk.Label(top, text="Año desde:").grid(row=0, column=0, sticky="w")
+        self.q_from = ttk.Entry(top, width=8)
+        self.q_from.grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Año hasta:").grid(row=0, column=2, sticky="w")
+        self.q_to = ttk.Entry(top, width=8)
+        self.q_to.grid(row=0, column=3, padx=6)
+
+        ttk.Label(top, text="Mín clasificaciones:").grid(row=0, column=4, sticky="w")
+        self.q_min = tk.IntVar(value=20)
+        ttk.Spinbox(top, from_=1, to=400, textvariable=self.q_min, width=6).grid(row=0, column=5, padx=6)
+
+        ttk.Label(top, text="Piloto (circuitos):").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.cb_Q = ttk.Combobox(top, values=list(self.cat["display"]), width=45)
+        self.cb_Q.grid(row=1, column=1, columnspan=4, sticky="ew", padx=6, pady=(6, 0))
+        self.cb_Q.set(self.cat["display"].iloc[0])
+        self.cb_Q.bind("<KeyRelease>", self._autocompletar)
+        ttk.Button(top, text="Generar", command=self.run_clasificacion).grid(row=1, column=5, padx=12, pady=(6, 0))
+
+        mid = ttk.Frame(self.tab_clasif, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_clasif = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_clasif)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_clasif_1 = ttk.LabelFrame(graficos, text="Conversión a carrera")
+        self.plot_clasif_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_clasif_2 = ttk.LabelFrame(graficos, text="Fortaleza por circuito")
+        self.plot_clasif_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
+
+    def run_clasificacion(self):
         try:
-            # tomar driverRef del texto seleccionado (lo primero antes de " — ")
-            def extract_ref(val):
-                if not val or val.strip() == "":
-                    return ""
-                return val.split(" — ")[0].strip()
-
-            A_tok = extract_ref(self.cb_A.get())
-            B_tok = extract_ref(self.cb_B.get())
-            if not A_tok or not B_tok:
-                messagebox.showwarning("Atención", "Selecciona ambos pilotos (A y B).")
-                return
+            min_q = int(self.q_min.get())
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        piloto = self.cb_Q.get().split(" — ")[0].strip()
+        if not piloto:
+            messagebox.showwarning("Atención", "Selecciona un piloto.")
+            return
+        params = dict(y_from=self.q_from.get().strip() or None, y_to=self.q_to.get().strip() or None,
+                      min_q=min_q, piloto=piloto)
+        self._analizar("clasificacion", params, self._calc_clasificacion, self._mostrar_clasificacion)
 
-            y_from = self.h_from.get().strip() or None
-            y_to   = self.h_to.get().strip() or None
+    def _calc_clasificacion(self, y_from, y_to, min_q, piloto):
+        pilotos = self.sesion.clasificacion_pilotos(y_from, y_to, min_q)
+        conversion = self.sesion.conversion_clasificacion(y_from, y_to)
+        (_, nombre, ref), circuitos = self.sesion.fortaleza_circuitos(piloto, y_from, y_to)
 
-            # --- cálculo H2H ---
-            cols_races = ["raceId","year","round","name","date"]
-            df = pd.merge(self.dfResults, self.dfRaces[cols_races], on="raceId", how="left")
-            if y_from: df = df[df["year"] >= int(y_from)]
-            if y_to:   df = df[df["year"] <= int(y_to)]
+        g1 = grafico("Resultado según posición de clasificación", "Posición de clasificación", "% de las carreras",
+                     [linea(conversion["pos_clasif"].to_numpy(), conversion[col].to_numpy(), etiqueta, marker="o")
+                      for col, etiqueta in (("victoria_pct", "Victoria"), ("podio_pct", "Podio"),
+                                            ("top10_pct", "Top 10"))],
+                     leyenda={}, rejilla="both")
 
-            A_id, A_name, A_ref = _resolver_piloto_gui(self.dfDrivers, A_tok)
-            B_id, B_name, B_ref = _resolver_piloto_gui(self.dfDrivers, B_tok)
+        extremos = pd.concat([circuitos.head(8), circuitos.tail(8)]).drop_duplicates("circuito")
+        g2 = grafico(f"{ref}: fortaleza en clasificación por circuito",
+                     "Puntos % más cerca de la pole que su mediana", "",
+                     [barras_h(extremos["fortaleza_pct"].to_numpy()[::-1])],
+                     yticks=list(extremos["circuito"])[::-1], refs=[("v", 0)], rejilla="x")
+        return pilotos.round(3), g1, g2
 
-            df = df[df["driverId"].isin([A_id, B_id])].copy()
-            if df.empty:
-                messagebox.showinfo("Sin datos", "No hay carreras para ese filtro.")
-                return
+    def _mostrar_clasificacion(self, resultado):
+        tabla, g1, g2 = resultado
+        if tabla.empty:
+            messagebox.showinfo("Sin datos", "No hay clasificaciones con ese filtro.")
+        df_to_treeview(self.tree_clasif, tabla)
+        draw_figure(self.plot_clasif_1, g1)
+        draw_figure(self.plot_clasif_2, g2)
 
-            df["grid_ajustado"] = df["grid"].replace(0, 20)
-            pv = df.pivot_table(
-                index=["raceId","year","round","name","date"],
-                columns="driverId",
-                values=["positionOrder","grid_ajustado","points"],
-                aggfunc="min"
-            )
-            try:
-                pv = pv.dropna(subset=[("positionOrder", A_id), ("positionOrder", B_id)], how="any")
-            except KeyError:
-                messagebox.showinfo("Sin datos", "Faltan resultados para comparar.")
-                return
-            if pv.empty:
-                messagebox.showinfo("Sin datos", "No hay carreras comunes con resultados válidos.")
-                return
+    # ---- TAB 6: Paradas en boxes ----
+    VISTAS_PARADAS = ("Mediana por equipo", "Undercuts por equipo", "Pérdida por circuito", "Paradas por temporada")
+
+    def _tab_paradas(self):
+        top = ttk.Frame(self.tab_pits, padding=8)
+        top.pack(fill="x")
+        ttk.Label(top, text="Año desde:").grid(row=0, column=0, sticky="w")
+        self.p_from = ttk.Entry(top, width=8)
+        self.p_from.grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Año hasta:").grid(row=0, column=2, sticky="w")
+        self.p_to = ttk.Entry(top, width=8)
+        self.p_to.grid(row=0, column=3, padx=6)
+        ttk.Label(top, text="Tabla:").grid(row=0, column=4, sticky="w")
+        self.p_vista = ttk.Combobox(top, values=self.VISTAS_PARADAS, state="readonly", width=24)
+        self.p_vista.set(self.VISTAS_PARADAS[0])
+        self.p_vista.grid(row=0, column=5, padx=6)
+        self.p_vista.bind("<<ComboboxSelected>>", lambda e: self.run_paradas())
+        ttk.Button(top, text="Generar", command=self.run_paradas).grid(row=0, column=6, padx=12)
+
+        mid = ttk.Frame(self.tab_pits, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_pits = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_pits)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_pits_1 = ttk.LabelFrame(graficos, text="Paradas por temporada")
+        self.plot_pits_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_pits_2 = ttk.LabelFrame(graficos, text="Tiempo en el pit lane")
+        self.plot_pits_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
+
+    def run_paradas(self):
+        params = dict(y_from=self.p_from.get().strip() or None, y_to=self.p_to.get().strip() or None,
+                      vista=self.p_vista.get())
+        self._analizar("paradas", params, self._calc_paradas, self._mostrar_paradas)
+
+    def _calc_paradas(self, y_from, y_to, vista):
+        temporadas = self.sesion.paradas_temporadas(y_from, y_to)
+        if temporadas.empty:
+            return None
+        perdida = self.sesion.perdida_pits(y_from, y_to)
+        tablas = {
+            "Mediana por equipo": lambda: self.sesion.paradas_equipos(y_from, y_to),
+            "Undercuts por equipo": lambda: self.sesion.paradas_undercuts(y_from, y_to),
+            "Pérdida por circuito": lambda: perdida,
+            "Paradas por temporada": lambda: temporadas,
+        }
+        tabla = tablas[vista]()
+
+        series, base = [], np.zeros(len(temporadas))
+        for col in ("0", "1", "2", "3", "4+"):
+            series.append(barras(temporadas["year"].to_numpy(), temporadas[col].to_numpy(), base, col))
+            base = base + temporadas[col].to_numpy()
+        g1 = grafico("Pilotos por nº de paradas", "Temporada", "% de pilotos por carrera", series,
+                     leyenda=dict(title="Paradas", fontsize=8))
+
+        top = perdida.head(12)
+        g2 = grafico("Tiempo mediano en el pit lane", "Segundos", "",
+                     [barras_h(top["mediana_s"].to_numpy()[::-1])],
+                     yticks=list(top["circuito"])[::-1], rejilla="x")
+        return tabla.round(3), g1, g2
+
+    def _mostrar_paradas(self, resultado):
+        if resultado is None:
+            messagebox.showinfo("Sin datos", "No hay paradas registradas en ese rango (pit_stops.csv empieza en 2011).")
+            return
+        tabla, g1, g2 = resultado
+        df_to_treeview(self.tree_pits, tabla)
+        draw_figure(self.plot_pits_1, g1)
+        draw_figure(self.plot_pits_2, g2)
+
+    # ---- TAB 7: Campeonato ----
+    def _tab_campeonato(self):
+        top = ttk.Frame(self.tab_camp, padding=8)
+        top.pack(fill="x")
+        ttk.Label(top, text="Campeonato:").grid(row=0, column=0, sticky="w")
+        self.c_tipo = ttk.Combobox(top, values=("pilotos", "constructores"), state="readonly", width=14)
+        self.c_tipo.set("pilotos")
+        self.c_tipo.grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Temporada:").grid(row=0, column=2, sticky="w")
+        self.c_year = tk.IntVar(value=int(self.recursos["campeonato_pilotos"].years[-1]))
+        ttk.Spinbox(top, from_=1950, to=2100, textvariable=self.c_year, width=6).grid(row=0, column=3, padx=6)
+        ttk.Label(top, text="Tras la ronda (vacío=última):").grid(row=0, column=4, sticky="w")
+        self.c_ronda = ttk.Entry(top, width=5)
+        self.c_ronda.grid(row=0, column=5, padx=6)
+        ttk.Label(top, text="Top N:").grid(row=0, column=6, sticky="w")
+        self.c_top = tk.IntVar(value=5)
+        ttk.Spinbox(top, from_=1, to=20, textvariable=self.c_top, width=5).grid(row=0, column=7, padx=6)
+        self.c_tipo.bind("<<ComboboxSelected>>", lambda e: self.run_campeonato())
+        ttk.Button(top, text="Generar", command=self.run_campeonato).grid(row=0, column=8, padx=12)
+
+        mid = ttk.Frame(self.tab_camp, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_camp = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_camp)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_camp_1 = ttk.LabelFrame(graficos, text="Puntos acumulados")
+        self.plot_camp_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_camp_2 = ttk.LabelFrame(graficos, text="Desventaja con el líder")
+        self.plot_camp_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
+
+    def run_campeonato(self):
+        try:
+            year, top = int(self.c_year.get()), int(self.c_top.get())
+            ronda = int(self.c_ronda.get()) if self.c_ronda.get().strip() else None
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        params = dict(tipo=self.c_tipo.get(), year=year, ronda=ronda, top=top)
+        self._analizar("campeonato", params, self._calc_campeonato, self._mostrar_campeonato)
+
+    def _calc_campeonato(self, tipo, year, ronda, top):
+        tabla = self.sesion.campeonato_tabla(tipo, year, ronda)
+        puntos, diferencia = self.sesion.campeonato_progresion(tipo, year, top)
+
+        graficos = []
+        for datos, titulo, etiqueta in ((puntos, f"Campeonato de {tipo} {year}", "Puntos"),
+                                        (diferencia, "Desventaja con el líder", "Puntos por detrás")):
+            graficos.append(grafico(
+                titulo, "Ronda", etiqueta,
+                [linea(datos.index.to_numpy(), datos[col].to_numpy(), str(col), marker="o", markersize=3)
+                 for col in datos.columns],
+                refs=[("v", ronda)] if ronda is not None else [], leyenda=dict(fontsize=8), rejilla="both",
+                invertir_y=datos is diferencia))
+        return tabla, graficos[0], graficos[1]
+
+    def _mostrar_campeonato(self, resultado):
+        tabla, g1, g2 = resultado
+        df_to_treeview(self.tree_camp, tabla)
+        draw_figure(self.plot_camp_1, g1)
+        draw_figure(self.plot_camp_2, g2)
+
+    # ---- TAB 8: Previo del GP (señales) ----
+    def _tab_previo(self):
+        top = ttk.Frame(self.tab_previo, padding=8)
+        top.pack(fill="x")
+        ultima = self.recursos["races"].sort_values(["year", "round"]).iloc[-1]
+        ttk.Label(top, text="Temporada:").grid(row=0, column=0, sticky="w")
+        self.g_year = tk.IntVar(value=int(ultima["year"]))
+        ttk.Spinbox(top, from_=1950, to=2100, textvariable=self.g_year, width=6).grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Ronda:").grid(row=0, column=2, sticky="w")
+        self.g_ronda = tk.IntVar(value=int(ultima["round"]))
+        ttk.Spinbox(top, from_=1, to=30, textvariable=self.g_ronda, width=5).grid(row=0, column=3, padx=6)
+        ttk.Button(top, text="Generar", command=self.run_previo).grid(row=0, column=4, padx=12)
+        self.g_titulo = tk.StringVar(value="")
+        ttk.Label(top, textvariable=self.g_titulo).grid(row=0, column=5, sticky="w")
+
+        mid = ttk.Frame(self.tab_previo, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_previo = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_previo)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_previo_1 = ttk.LabelFrame(graficos, text="Forma vs circuito")
+        self.plot_previo_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_previo_2 = ttk.LabelFrame(graficos, text="Abandonos")
+        self.plot_previo_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
 
-            posA = pv[("positionOrder", A_id)]
-            posB = pv[("positionOrder", B_id)]
-            gridA = pv[("grid_ajustado", A_id)]
-            gridB = pv[("grid_ajustado", B_id)]
-            ptsA  = pv[("points", A_id)].fillna(0)
-            ptsB  = pv[("points", B_id)].fillna(0)
-
-            winsA = int((posA < posB).sum())
-            winsB = int((posB < posA).sum())
-            ties  = int((posA == posB).sum())
-            n_gp  = len(pv)
-
-            resumen = pd.DataFrame({
-                "Piloto": [A_name, B_name],
-                "Victorias H2H": [winsA, winsB],
-                "Empates": [ties, ties],
-                "Carreras juntos": [n_gp, n_gp],
-                "Promedio Pos. Final": [posA.mean(), posB.mean()],
-                "Mediana Pos. Final": [posA.median(), posB.median()],
-                "Promedio Parrilla": [gridA.mean(), gridB.mean()],
-                "Puntos Totales (H2H)": [ptsA.sum(), ptsB.sum()],
-                "Mejor Resultado (mín)": [posA.min(), posB.min()]
-            })
-            df_to_treeview(self.tree_h2h, resumen)
-
-            # gráfico 1: victorias
-            fig1 = Figure(figsize=(7.5, 3.8), dpi=100)
-            ax1 = fig1.add_subplot(111)
-            ax1.bar([A_ref, B_ref], [winsA, winsB])
-            ax1.set_title(f"H2H: {A_name} vs {B_name} — Victorias")
-            ax1.set_xlabel("Piloto")
-            ax1.set_ylabel("Carreras donde terminó por delante")
-            ax1.grid(axis="y", linestyle="--", alpha=0.6)
-            fig1.tight_layout()
-            draw_figure(self.plot_h2h_1, fig1, "_canvas")
-
-            # gráfico 2: diferencia acumulada
-            pv2 = pv.reset_index().sort_values(["year","round"])
-            step = np.where(pv2[("positionOrder", A_id)] < pv2[("positionOrder", B_id)], 1,
-                    np.where(pv2[("positionOrder", A_id)] > pv2[("positionOrder", B_id)], -1, 0))
-            diff_acum = step.cumsum()
-            etiquetas = pv2["year"].astype(str) + "-" + pv2["round"].astype(str)
-
-            fig2 = Figure(figsize=(7.5, 3.8), dpi=100)
-            ax2 = fig2.add_subplot(111)
-            ax2.plot(list(etiquetas), list(diff_acum), marker="o")
-            ax2.set_title(f"Diferencia acumulada ({A_ref} – {B_ref})")
-            ax2.set_xlabel("Año-Round (sólo carreras comunes)")
-            ax2.set_ylabel(f"Acumulado a favor de {A_ref}")
-            for label in ax2.get_xticklabels():
-                label.set_rotation(60)
-                label.set_ha("right")
-            ax2.grid(True, linestyle="--", alpha=0.6)
-            fig2.tight_layout()
-            draw_figure(self.plot_h2h_2, fig2, "_canvas")
+    def run_previo(self):
+        try:
+            params = dict(year=int(self.g_year.get()), ronda=int(self.g_ronda.get()))
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self._analizar("previo", params, self._calc_previo, self._mostrar_previo)
+
+    def _calc_previo(self, year, ronda):
+        (_, gp), senales = self.sesion.previo_gp(year, ronda)
+
+        x, y = senales["forma_pos_media"], senales["circuito_pos_media"]
+        g1 = grafico("Forma reciente vs historial en el circuito", "Posición media (últimas 5)",
+                     "Posición media en el circuito", [puntos(x, y)],
+                     notas=list(zip(senales["piloto"], x, y)), invertir_x=True, invertir_y=True, rejilla="both")
+
+        g2 = grafico("% de abandonos en su carrera deportiva", "% de carreras sin terminar", "",
+                     [barras_h(senales["abandonos_pct"].to_numpy()[::-1])],
+                     yticks=list(senales["piloto"])[::-1], ytick_size=7, rejilla="x")
+        return f"{gp} {year}", senales.round(2), g1, g2
+
+    def _mostrar_previo(self, resultado):
+        titulo, tabla, g1, g2 = resultado
+        self.g_titulo.set(titulo)
+        df_to_treeview(self.tree_previo, tabla)
+        draw_figure(self.plot_previo_1, g1)
+        draw_figure(self.plot_previo_2, g2)
+
+    # ---- TAB 9: Fiabilidad (abandonos) ----
+    VISTAS_FIABILIDAD = ("equipos", "circuitos", "pilotos", "temporadas")
+
+    def _tab_fiabilidad(self):
+        top = ttk.Frame(self.tab_fiab, padding=8)
+        top.pack(fill="x")
+        ttk.Label(top, text="Año desde:").grid(row=0, column=0, sticky="w")
+        self.f_from = ttk.Entry(top, width=8)
+        self.f_from.grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Año hasta:").grid(row=0, column=2, sticky="w")
+        self.f_to = ttk.Entry(top, width=8)
+        self.f_to.grid(row=0, column=3, padx=6)
+        ttk.Label(top, text="Mín salidas:").grid(row=0, column=4, sticky="w")
+        self.f_min = tk.IntVar(value=20)
+        ttk.Spinbox(top, from_=1, to=1000, textvariable=self.f_min, width=6).grid(row=0, column=5, padx=6)
+        ttk.Label(top, text="Por:").grid(row=0, column=6, sticky="w")
+        self.f_vista = ttk.Combobox(top, values=self.VISTAS_FIABILIDAD, state="readonly", width=12)
+        self.f_vista.set(self.VISTAS_FIABILIDAD[0])
+        self.f_vista.grid(row=0, column=7, padx=6)
+        self.f_vista.bind("<<ComboboxSelected>>", lambda e: self.run_fiabilidad())
+        self.f_sesion = self._combo_sesion(top, 0, 8)
+        ttk.Button(top, text="Generar", command=self.run_fiabilidad).grid(row=0, column=10, padx=12)
+
+        mid = ttk.Frame(self.tab_fiab, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_fiab = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_fiab)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_fiab_1 = ttk.LabelFrame(graficos, text="Abandonos por temporada")
+        self.plot_fiab_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_fiab_2 = ttk.LabelFrame(graficos, text="Más abandonos")
+        self.plot_fiab_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
+
+    def run_fiabilidad(self):
+        try:
+            min_s = int(self.f_min.get())
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        params = dict(y_from=self.f_from.get().strip() or None, y_to=self.f_to.get().strip() or None,
+                      min_s=min_s, vista=self.f_vista.get(), tipo=self.f_sesion.get())
+        self._analizar("fiabilidad", params, self._calc_fiabilidad, self._mostrar_fiabilidad)
+
+    def _calc_fiabilidad(self, y_from, y_to, min_s, vista, tipo="carrera"):
+        temporadas = self.sesion.fiabilidad("temporadas", y_from, y_to, 1, tipo)
+        if temporadas.empty:
+            return None
+        tabla = self.sesion.fiabilidad(vista, y_from, y_to, min_s, tipo)
+        causas = (("mecanica_pct", "Mecánica"), ("accidente_pct", "Accidente"), ("otro_pct", "Otro"))
+
+        series, base = [], np.zeros(len(temporadas))
+        for col, etiqueta in causas:
+            series.append(barras(temporadas["year"].to_numpy(), temporadas[col].to_numpy(), base, etiqueta))
+            base = base + temporadas[col].to_numpy()
+        g1 = grafico("Abandonos por temporada y causa", "Temporada", "% de las salidas", series,
+                     leyenda=dict(fontsize=8))
+
+        top = tabla.head(15).iloc[::-1]
+        etiquetas = [str(v) for v in (top["year"] if vista == "temporadas" else top["nombre"])]
+        series, izquierda = [], np.zeros(len(top))
+        for col, etiqueta in causas:
+            series.append(barras_h(top[col].to_numpy(), izquierda, etiqueta))
+            izquierda = izquierda + top[col].to_numpy()
+        g2 = grafico(f"Abandonos por {vista[:-1] if vista != 'temporadas' else 'temporada'}",
+                     "% de las salidas", "", series, yticks=etiquetas, ytick_size=7, leyenda=dict(fontsize=8))
+        return tabla.round(2), g1, g2
+
+    def _mostrar_fiabilidad(self, resultado):
+        if resultado is None:
+            messagebox.showinfo("Sin datos", "No hay resultados en ese rango.")
+            return
+        tabla, g1, g2 = resultado
+        df_to_treeview(self.tree_fiab, tabla)
+        draw_figure(self.plot_fiab_1, g1)
+        draw_figure(self.plot_fiab_2, g2)
+
+    # ---- TAB 10: Equipos ----
+    VISTAS_EQUIPOS = ("Temporadas", "Compañeros", "Coche vs piloto")
+
+    def _tab_equipos(self):
+        top = ttk.Frame(self.tab_equipos, padding=8)
+        top.pack(fill="x")
+        ttk.Label(top, text="Año desde:").grid(row=0, column=0, sticky="w")
+        self.e_from = ttk.Entry(top, width=8)
+        self.e_from.grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Año hasta:").grid(row=0, column=2, sticky="w")
+        self.e_to = ttk.Entry(top, width=8)
+        self.e_to.grid(row=0, column=3, padx=6)
+        ttk.Label(top, text="Mín carreras:").grid(row=0, column=4, sticky="w")
+        self.e_min = tk.IntVar(value=10)
+        ttk.Spinbox(top, from_=1, to=500, textvariable=self.e_min, width=6).grid(row=0, column=5, padx=6)
+        ttk.Label(top, text="Tabla:").grid(row=0, column=6, sticky="w")
+        self.e_vista = ttk.Combobox(top, values=self.VISTAS_EQUIPOS, state="readonly", width=16)
+        self.e_vista.set(self.VISTAS_EQUIPOS[0])
+        self.e_vista.grid(row=0, column=7, padx=6)
+        self.e_vista.bind("<<ComboboxSelected>>", lambda e: self.run_equipos())
+        self.e_sesion = self._combo_sesion(top, 0, 8)
+        ttk.Button(top, text="Generar", command=self.run_equipos).grid(row=0, column=10, padx=12)
+
+        mid = ttk.Frame(self.tab_equipos, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_equipos = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_equipos)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_equipos_1 = ttk.LabelFrame(graficos, text="Puntos por temporada")
+        self.plot_equipos_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_equipos_2 = ttk.LabelFrame(graficos, text="Coche vs piloto")
+        self.plot_equipos_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
+
+    def run_equipos(self):
+        try:
+            min_gp = int(self.e_min.get())
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        params = dict(y_from=self.e_from.get().strip() or None, y_to=self.e_to.get().strip() or None,
+                      min_gp=min_gp, vista=self.e_vista.get(), tipo=self.e_sesion.get())
+        self._analizar("equipos", params, self._calc_equipos, self._mostrar_equipos)
+
+    def _calc_equipos(self, y_from, y_to, min_gp, vista, tipo="carrera"):
+        temporadas = self.sesion.equipos_temporadas(y_from, y_to)
+        if temporadas.empty:
+            return None
+        aportes = self.sesion.coche_piloto(y_from, y_to, min_gp, tipo)
+        tablas = {
+            "Temporadas": lambda: temporadas,
+            "Compañeros": lambda: self.sesion.companeros(y_from, y_to, min_gp, tipo),
+            "Coche vs piloto": lambda: aportes,
+        }
+        tabla = tablas[vista]()
+
+        series = []
+        for equipo in temporadas.groupby("equipo")["puntos"].sum().nlargest(5).index:
+            t = temporadas[temporadas["equipo"] == equipo]
+            series.append(linea(t["year"].to_numpy(), t["puntos"].to_numpy(), str(equipo),
+                                marker="o", markersize=3))
+        g1 = grafico("Equipos con más puntos", "Temporada", "Puntos", series,
+                     leyenda=dict(fontsize=8), rejilla="both")
+
+        extremos = pd.concat([aportes.head(5), aportes.tail(3)])
+        g2 = grafico("Coche vs piloto (negativo = mejor que sus compañeros)",
+                     "Posición media de sus compañeros", "Posiciones propias",
+                     [puntos(aportes["aporte_coche"], aportes["aporte_piloto"], s=10, alpha=0.6)],
+                     notas=list(zip(extremos["nombre"], extremos["aporte_coche"], extremos["aporte_piloto"])),
+                     refs=[("h", 0)], invertir_y=True, rejilla="both")
+        return tabla.round(2), g1, g2
+
+    def _mostrar_equipos(self, resultado):
+        if resultado is None:
+            messagebox.showinfo("Sin datos", "No hay resultados en ese rango.")
+            return
+        tabla, g1, g2 = resultado
+        df_to_treeview(self.tree_equipos, tabla)
+        draw_figure(self.plot_equipos_1, g1)
+        draw_figure(self.plot_equipos_2, g2)
+
+    # ---- TAB 11: Rating Elo ----
+    def _tab_elo(self):
+        top = ttk.Frame(self.tab_elo, padding=8)
+        top.pack(fill="x")
+        ttk.Label(top, text="Duelos:").grid(row=0, column=0, sticky="w")
+        self.elo_modo = ttk.Combobox(top, values=("todos", "companeros"), state="readonly", width=11)
+        self.elo_modo.set("todos")
+        self.elo_modo.grid(row=0, column=1, padx=6)
+        ttk.Label(top, text="Orden:").grid(row=0, column=2, sticky="w")
+        self.elo_orden = ttk.Combobox(top, values=("pico", "final"), state="readonly", width=6)
+        self.elo_orden.set("pico")
+        self.elo_orden.grid(row=0, column=3, padx=6)
+        ttk.Label(top, text="Hasta el año:").grid(row=0, column=4, sticky="w")
+        self.elo_hasta = ttk.Entry(top, width=8)
+        self.elo_hasta.grid(row=0, column=5, padx=6)
+        ttk.Label(top, text="Mín carreras:").grid(row=0, column=6, sticky="w")
+        self.elo_min = tk.IntVar(value=50)
+        ttk.Spinbox(top, from_=1, to=500, textvariable=self.elo_min, width=6).grid(row=0, column=7, padx=6)
+        ttk.Label(top, text="Pilotos (vacío=5 primeros):").grid(row=1, column=0, columnspan=2, sticky="w", pady=(6, 0))
+        self.elo_pilotos = ttk.Entry(top, width=45)
+        self.elo_pilotos.grid(row=1, column=2, columnspan=5, sticky="ew", padx=6, pady=(6, 0))
+        for cb in (self.elo_modo, self.elo_orden):
+            cb.bind("<<ComboboxSelected>>", lambda e: self.run_elo())
+        ttk.Button(top, text="Generar", command=self.run_elo).grid(row=1, column=7, padx=12, pady=(6, 0))
 
+        mid = ttk.Frame(self.tab_elo, padding=8)
+        mid.pack(fill="both", expand=True)
+        self.tree_elo = crear_tabla(mid, height=8)
+
+        graficos = ttk.Frame(self.tab_elo)
+        graficos.pack(fill="both", expand=True, padx=8, pady=4)
+        self.plot_elo_1 = ttk.LabelFrame(graficos, text="Clasificación")
+        self.plot_elo_1.pack(side="left", fill="both", expand=True, padx=(0, 4))
+        self.plot_elo_2 = ttk.LabelFrame(graficos, text="Rating en el tiempo")
+        self.plot_elo_2.pack(side="left", fill="both", expand=True, padx=(4, 0))
+
+    def run_elo(self):
+        try:
+            min_gp = int(self.elo_min.get())
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        pilotos = tuple(p.strip() for p in self.elo_pilotos.get().split(",") if p.strip())
+        params = dict(modo=self.elo_modo.get(), orden=self.elo_orden.get(),
+                      hasta=self.elo_hasta.get().strip() or None, min_gp=min_gp, pilotos=pilotos)
+        self._analizar("elo", params, self._calc_elo, self._mostrar_elo)
+
+    def _calc_elo(self, modo, orden, hasta, min_gp, pilotos=()):
+        tabla = self.sesion.elo_clasificacion(modo, hasta, min_gp, orden)
+        if tabla.empty:
+            return None
+        progresion = self.sesion.elo_progresion(modo, pilotos or tuple(tabla["piloto"].head(5)), hasta)
+
+        top = tabla.head(15)
+        col = "pico" if orden == "pico" else "rating"
+        g1 = grafico(f"Rating Elo ({modo}, {orden})", "Rating", "", [barras_h(top[col].to_numpy()[::-1])],
+                     yticks=list(top["piloto"])[::-1], xlim_izq=min(top[col].min() - 50, 1500),
+                     ytick_size=7, rejilla="x")
+
+        series = []
+        for piloto in progresion.columns:
+            serie = progresion[piloto].dropna()
+            series.append(linea(serie.index.to_numpy(), serie.to_numpy(), str(piloto)))
+        g2 = grafico("Rating tras cada carrera", "Fecha", "Rating", series,
+                     refs=[("h", 1500)], leyenda=dict(fontsize=8), rejilla="both")
+        return tabla.round(1), g1, g2
+
+    def _mostrar_elo(self, resultado):
+        if resultado is None:
+            messagebox.showinfo("Sin datos", "No hay pilotos con ese filtro.")
+            return
+        tabla, g1, g2 = resultado
+        df_to_treeview(self.tree_elo, tabla)
+        draw_figure(self.plot_elo_1, g1)
+        draw_figure(self.plot_elo_2, g2)
 
 # ---- Lanzar GUI si se ejecuta como script principal ----
+# python interfaz.py --medir-arranque  -> abre, mide el tiempo hasta la ventana y sale
 if __name__ == "__main__":
+    medir = "--medir-arranque" in sys.argv
     try:
-        app = F1AnalyzerApp(dfRaces, dfResults, dfDrivers, dfCircuits)
+        app = F1AnalyzerApp(al_mostrar=(lambda a: a.destroy()) if medir else None)
         app.mainloop()
     except Exception as err:
         print("Error al iniciar la interfaz:", err)
+        sys.exit(1)
+    if medir:
+        sys.exit(0 if app.ms_primera_ventana <= OBJETIVO_VENTANA_MS else 1)
@@ -1,30 +1,39 @@
 # Importar librerias
-import numpy as np
-import pandas as pd
+import sys
+
 import matplotlib.pyplot as plt
-from datetime import datetime
-
-try:
-    # Rutas de los archivos CSV 
-    urlRaces = "./Data/races.csv"
-    urlResults = "./Data/results.csv"
-    urlDrivers = "./Data/drivers.csv"
-    urlCircuits = "./Data/circuits.csv" 
-
-    # Lectura de todos los archivos necesarios
-    dfRaces = pd.read_csv(urlRaces)
-    dfResults = pd.read_csv(urlResults)
-    dfDrivers = pd.read_csv(urlDrivers)
-    dfCircuits = pd.read_csv(urlCircuits)
-    
-    print("Todos los archivos de datos fueron cargados exitosamente.")
-
-except FileNotFoundError as e:
-    print(f"Error: No se encontró el archivo {e.filename}. Asegúrate de que las rutas son correctas.")
-    exit()
+
+from motor.analisis import OPCIONES_SESION, SesionAnalisis
+from motor.lod import SerieLOD
+
+# python main.py report ...: informes en lote sin menú ni ventanas (motor/informe.py)
+if __name__ == "__main__" and sys.argv[1:2] == ["report"]:
+    from motor.informe import main as informe
+    sys.exit(informe(sys.argv[2:]))
+
+# python main.py serve ...: servicio HTTP/JSON para los widgets web (motor/servicio.py)
+if __name__ == "__main__" and sys.argv[1:2] == ["serve"]:
+    from motor.servicio import main as servicio
+    sys.exit(servicio(sys.argv[2:]))
+
+# Sólo al ejecutar el menú: los procesos de "report" importan este archivo
+# (arranque spawn en Windows) y no deben cargar datos ni abrir el menú.
+if __name__ == "__main__":
+    try:
+        # Sesión de análisis: tablas (caché columnar en Data/.cache), tabla de
+        # hechos, agregados incrementales, índice de pilotos y memo de resultados.
+        # Los cálculos viven en motor/analisis.py; aquí sólo se pregunta y se dibuja.
+        sesion = SesionAnalisis()
+        sesion.cargar()
+
+        print("Todos los archivos de datos fueron cargados exitosamente.")
+
+    except FileNotFoundError as e:
+        print(f"Error: No se encontró el archivo {e.filename}. Asegúrate de que las rutas son correctas.")
+        exit()
 
 # ==============================
-# MENÚ DE ANÁLISIS (1–4)
+# MENÚ DE ANÁLISIS (1–12)
 # ==============================
 
 # ---- Utilidades de entrada con valores por defecto ----
@@ -36,8 +45,16 @@ def _ask_str(msg, default=None):
     txt = input(f"{msg}" + (f" [Enter={default}]" if default is not None else "") + ": ").strip()
     return default if (default is not None and txt == "") else txt
 
+def _ask_sesion():
+    # se repite hasta que sea una sesión válida (un error tumbaría el análisis 1)
+    while True:
+        tipo = _ask_str("Sesión (carrera/sprint/todas)", "carrera").lower()
+        if tipo in OPCIONES_SESION:
+            return tipo
+        print(f"Sesión no válida: '{tipo}'. Opciones: {', '.join(OPCIONES_SESION)}.")
+
 # ---- ANÁLISIS 1: Mejores remontadores ----
-def analisis_1_remontadores(dfRaces, dfResults, dfDrivers):
+def analisis_1_remontadores(sesion):
     print("\n" + "="*80)
     print("ANÁLISIS 1: MEJORES REMONTADORES POR CARRERA")
     print("="*80)
@@ -45,24 +62,9 @@ def analisis_1_remontadores(dfRaces, dfResults, dfDrivers):
     anio_min = _ask_int("Año mínimo a considerar", 2000)
     min_gp   = _ask_int("Mínimo de carreras por piloto", 50)
     topn     = _ask_int("Top N para la gráfica", 15)
+    tipo     = _ask_sesion()
 
-    df_merged = pd.merge(dfResults, dfRaces[['raceId', 'year']], on='raceId', how='left')
-    dfDrivers = dfDrivers.copy()
-    dfDrivers['driver'] = dfDrivers['driverRef']
-    df_merged = pd.merge(df_merged, dfDrivers[['driverId', 'driver']], on='driverId', how='left')
-
-    df_merged['grid_ajustado'] = df_merged['grid'].replace(0, 20)
-    df_merged['posiciones_ganadas'] = df_merged['grid_ajustado'] - df_merged['positionOrder']
-
-    df_analisis = df_merged[df_merged['year'] >= anio_min].copy()
-    driver_stats = df_analisis.groupby('driver').agg(
-        total_carreras=('raceId', 'count'),
-        promedio_puntos=('points', 'mean'),
-        promedio_pos_ganadas=('posiciones_ganadas', 'mean')
-    ).reset_index()
-
-    driver_stats = driver_stats[driver_stats['total_carreras'] > min_gp]
-    mejores = driver_stats.sort_values(by='promedio_pos_ganadas', ascending=False)
+    mejores = sesion.remontadores(anio_min, min_gp, tipo)
 
     print("\n--- Tabla 1: Top 10 Mejores Remontadores ---")
     print(mejores.head(10).to_string(index=False))
@@ -79,19 +81,14 @@ def analisis_1_remontadores(dfRaces, dfResults, dfDrivers):
     plt.show()
 
 # ---- ANÁLISIS 2: Circuitos con más carreras ----
-def analisis_2_circuitos(dfRaces, dfCircuits):
+def analisis_2_circuitos(sesion):
     print("\n" + "="*80)
     print("ANÁLISIS 2: CIRCUITOS CON MÁS CARRERAS")
     print("="*80)
 
     topn = _ask_int("Top N de circuitos", 15)
 
-    df_races_full = pd.merge(
-        dfRaces, dfCircuits[['circuitId', 'name']],
-        on='circuitId', how='left', suffixes=('', '_circuit')
-    )
-    conteo = df_races_full['name_circuit'].value_counts()
-    top = conteo.head(topn)
+    top = sesion.circuitos(topn)
 
     print(f"\n--- Tabla 2: Top {len(top)} Circuitos con Más Grandes Premios ---")
     print(top.to_string())
@@ -106,24 +103,21 @@ def analisis_2_circuitos(dfRaces, dfCircuits):
     plt.show()
 
 # ---- ANÁLISIS 3: Distribución de edades de pilotos ----
-def analisis_3_edades(dfDrivers):
+def analisis_3_edades(sesion):
     print("\n" + "="*80)
     print("ANÁLISIS 3: DISTRIBUCIÓN DE EDADES DE LOS PILOTOS")
     print("="*80)
 
     bins = _ask_int("Número de bins del histograma", 30)
 
-    drivers = dfDrivers.copy()
-    drivers['dob'] = pd.to_datetime(drivers['dob'], errors='coerce')
-    drivers = drivers.dropna(subset=['dob'])
-    drivers['age'] = ((datetime.now() - drivers['dob']).dt.days / 365.25).astype(int)
+    edades = sesion.edades()
 
     print("\n--- Tabla 3: Resumen Estadístico de la Edad ---")
-    print(drivers['age'].describe().to_string())
+    print(edades.describe().to_string())
 
     plt.figure(figsize=(12, 7))
-    plt.hist(drivers['age'], bins=bins, edgecolor='black')
-    edad_promedio = drivers['age'].mean()
+    plt.hist(edades, bins=bins, edgecolor='black')
+    edad_promedio = edades.mean()
     plt.axvline(edad_promedio, linestyle='--', linewidth=2, label=f'Promedio: {edad_promedio:.1f} años')
     plt.title('Distribución de Edades de los Pilotos de F1', fontsize=16)
     plt.xlabel('Edad (años)', fontsize=12)
@@ -134,37 +128,6 @@ def analisis_3_edades(dfDrivers):
     plt.show()
 
 # ---- H2H: helpers (reutiliza tu lógica) ----
-def _resolver_piloto(dfDrivers, query):
-    t = dfDrivers.copy()
-    t['driverRefLower'] = t['driverRef'].astype(str).str.lower()
-    t['codeLower']      = t['code'].astype(str).str.lower()
-    t['nameLower']      = (t['forename'].astype(str) + " " + t['surname'].astype(str)).str.lower()
-    t['surnameLower']   = t['surname'].astype(str).str.lower()
-
-    q = str(query).strip().lower()
-    cand = t[
-        (t['driverRefLower'] == q) |
-        (t['codeLower']      == q) |
-        (t['nameLower']      == q) |
-        (t['surnameLower']   == q)
-    ]
-    if cand.empty:
-        cand = t[t['nameLower'].str.contains(q, na=False) | t['surnameLower'].str.contains(q, na=False)]
-    if cand.empty:
-        raise ValueError(f"No se encontró el piloto '{query}'. Intenta con driverRef, code o nombre completo.")
-    row = cand.iloc[0]
-    return int(row['driverId']), f"{row['forename']} {row['surname']}", row['driverRef']
-
-def _catalogo_pilotos(dfDrivers, dfResults):
-    starts = dfResults.groupby('driverId')['raceId'].nunique().reset_index(name='starts')
-    cat = pd.merge(dfDrivers.copy(), starts, on='driverId', how='left')
-    cat['starts'] = cat['starts'].fillna(0).astype(int)
-    def fmt(row):
-        code = (f" ({row['code']})" if pd.notna(row['code']) and str(row['code']).strip() != '' else '')
-        return f"{row['driverRef']} — {row['forename']} {row['surname']}{code}"
-    cat['display'] = cat.apply(fmt, axis=1)
-    return cat.sort_values('starts', ascending=False)[['driverId','driverRef','forename','surname','code','starts','display']]
-
 def _mostrar_lista_corta(cat, n=30):
     print("\n[H2H] Pilotos sugeridos (ordenados por nº de carreras):")
     for i, row in enumerate(cat.head(n).itertuples(), start=1):
@@ -186,59 +149,17 @@ def _elegir_dos_pilotos(cat, n=30):
         return tok
     return resolve_tok(A_tok), resolve_tok(B_tok)
 
-def h2h_report(dfResults, dfRaces, dfDrivers, piloto_A, piloto_B, anio_desde=None, anio_hasta=None):
-    # Merge + filtros
-    cols_races = ['raceId', 'year', 'round', 'name', 'date']
-    df = pd.merge(dfResults, dfRaces[cols_races], on='raceId', how='left')
-    if anio_desde is not None: df = df[df['year'] >= int(anio_desde)]
-    if anio_hasta is not None: df = df[df['year'] <= int(anio_hasta)]
-
-    A_id, A_name, A_ref = _resolver_piloto(dfDrivers, piloto_A)
-    B_id, B_name, B_ref = _resolver_piloto(dfDrivers, piloto_B)
-    df = df[df['driverId'].isin([A_id, B_id])].copy()
-    if df.empty:
-        print("No hay carreras para ese filtro de años.")
-        return
-
-    df['grid_ajustado'] = df['grid'].replace(0, 20)
-    pv = df.pivot_table(
-        index=['raceId', 'year', 'round', 'name', 'date'],
-        columns='driverId',
-        values=['positionOrder', 'grid_ajustado', 'points'],
-        aggfunc='min'
-    )
-    try:
-        pv = pv.dropna(subset=[('positionOrder', A_id), ('positionOrder', B_id)], how='any')
-    except KeyError:
-        print("No hay suficientes datos de resultados para comparar a ambos pilotos.")
-        return
-    if pv.empty:
+def h2h_report(sesion, piloto_A, piloto_B, anio_desde=None, anio_hasta=None, tipo="carrera"):
+    res = sesion.h2h(piloto_A, piloto_B, anio_desde, anio_hasta, tipo)
+    if res is None:
         print("No hay carreras comunes con resultados válidos para ambos pilotos.")
         return
 
-    posA = pv[('positionOrder', A_id)]
-    posB = pv[('positionOrder', B_id)]
-    gridA = pv[('grid_ajustado', A_id)]
-    gridB = pv[('grid_ajustado', B_id)]
-    ptsA  = pv[('points', A_id)].fillna(0)
-    ptsB  = pv[('points', B_id)].fillna(0)
-
-    winsA = (posA < posB).sum()
-    winsB = (posB < posA).sum()
-    ties  = (posA == posB).sum()
-    n_gp  = len(pv)
-
-    resumen = pd.DataFrame({
-        'Piloto': [A_name, B_name],
-        'Victorias H2H': [winsA, winsB],
-        'Empates': [ties, ties],
-        'Carreras juntos': [n_gp, n_gp],
-        'Promedio Pos. Final': [posA.mean(), posB.mean()],
-        'Mediana Pos. Final': [posA.median(), posB.median()],
-        'Promedio Parrilla': [gridA.mean(), gridB.mean()],
-        'Puntos Totales (H2H)': [ptsA.sum(), ptsB.sum()],
-        'Mejor Resultado (mín)': [posA.min(), posB.min()]
-    })
+    _, A_name, A_ref = res['A']
+    _, B_name, B_ref = res['B']
+    resumen = res['resumen']
+    winsA, winsB = res['victorias']
+    fechas, diff_acum = res['fechas'], res['acumulado']
 
     print("\n--- Tabla 4: Resumen H2H ---")
     print(resumen.to_string(index=False))
@@ -251,27 +172,23 @@ def h2h_report(dfResults, dfRaces, dfDrivers, piloto_A, piloto_B, anio_desde=Non
     plt.grid(axis='y', linestyle='--', alpha=0.6)
     plt.tight_layout(); plt.show()
 
-    # Gráfica B
-    pv2 = pv.reset_index().sort_values(['year', 'round'])
-    step = np.where(pv2[('positionOrder', A_id)] < pv2[('positionOrder', B_id)], 1,
-            np.where(pv2[('positionOrder', A_id)] > pv2[('positionOrder', B_id)], -1, 0))
-    diff_acum = step.cumsum()
-    etiquetas = pv2['year'].astype(str) + "-" + pv2['round'].astype(str)
-
-    plt.figure(figsize=(12, 5))
-    plt.plot(etiquetas, diff_acum, marker='o')
-    plt.title(f'H2H: Diferencia acumulada ( {A_ref} – {B_ref} ) por carrera')
-    plt.xlabel('Año-Round (sólo carreras comunes)'); plt.ylabel(f'Acumulado a favor de {A_ref}')
-    plt.xticks(rotation=60, ha='right')
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.tight_layout(); plt.show()
+    # Gráfica B: eje de fechas; la serie se reduce a min/max por píxel y se
+    # vuelve a muestrear al hacer zoom (rueda o barra de herramientas)
+    fig, ax = plt.subplots(figsize=(12, 5))
+    linea, = ax.plot([], [], marker='o', markersize=3)
+    lod = SerieLOD(ax, linea, fechas, diff_acum)
+    ax.set_title(f'H2H: Diferencia acumulada ( {A_ref} – {B_ref} ) por carrera')
+    ax.set_xlabel('Fecha (sólo carreras comunes)'); ax.set_ylabel(f'Acumulado a favor de {A_ref}')
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.tight_layout(); plt.show()
+    lod.desconectar()
 
 # ---- ANÁLISIS 4: Interfaz H2H ----
-def analisis_4_h2h(dfResults, dfRaces, dfDrivers):
+def analisis_4_h2h(sesion):
     print("\n" + "="*80)
     print("ANÁLISIS 4: HEAD-TO-HEAD (H2H)")
     print("="*80)
-    cat = _catalogo_pilotos(dfDrivers, dfResults)
+    cat = sesion.indice.catalogo()
     try:
         _mostrar_lista_corta(cat, n=30)
         raw = _ask_str("\nEscribe dos índices o dos nombres/driverRef separados por coma (ej. '1,7' o 'alonso, hamilton')", None)
@@ -289,10 +206,331 @@ def analisis_4_h2h(dfResults, dfRaces, dfDrivers):
         A_sel, B_sel = _resolve(A_tok), _resolve(B_tok)
         y_from = _ask_str("Año desde (Enter=todos)", None)
         y_to   = _ask_str("Año hasta (Enter=todos)", None)
-        h2h_report(dfResults, dfRaces, dfDrivers, A_sel, B_sel, y_from or None, y_to or None)
+        tipo   = _ask_sesion()
+        h2h_report(sesion, A_sel, B_sel, y_from or None, y_to or None, tipo)
     except Exception as e:
         print(f"[H2H] Aviso: {e}")
 
+# ---- ANÁLISIS 5: Matriz H2H de todas las parejas ----
+def analisis_5_matriz_h2h(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 5: MATRIZ H2H (TODAS LAS PAREJAS)")
+    print("="*80)
+    try:
+        y_from = _ask_str("Año desde (Enter=todos)", None) or None
+        y_to   = _ask_str("Año hasta (Enter=todos)", None) or None
+        solo_comp = _ask_str("¿Sólo compañeros de equipo? (s/n)", "n").lower().startswith("s")
+        min_gp = _ask_int("Mínimo de carreras en común", 10)
+        tipo   = _ask_sesion()
+
+        tabla = sesion.parejas_desiguales(y_from, y_to, solo_comp, min_gp, tipo)
+        if tabla.empty:
+            print("No hay parejas con ese filtro.")
+            return
+
+        print(f"\n--- Tabla 5: Parejas más desiguales ({len(tabla)} parejas) ---")
+        cols = ['piloto_A', 'piloto_B', 'carreras', 'victorias_A', 'victorias_B', 'empates',
+                'delta_pos_medio', 'delta_puntos']
+        print(tabla[cols].head(15).to_string(index=False))
+
+        ruta = _ask_str("Exportar matriz completa a (CSV o .npz, Enter=no exportar)", "")
+        if ruta:
+            refs = dict(zip(sesion.indice.ids, sesion.indice.refs))
+            sesion.matriz_h2h(y_from, y_to, solo_comp, tipo).exportar(ruta, min_carreras=min_gp, refs=refs)
+            print(f"Matriz exportada en {ruta}")
+    except Exception as e:
+        print(f"[H2H] Aviso: {e}")
+
+# ---- ANÁLISIS 6: Clasificación vs carrera ----
+def analisis_6_clasificacion(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 6: CLASIFICACIÓN VS CARRERA")
+    print("="*80)
+    try:
+        y_from = _ask_str("Año desde (Enter=todos)", None) or None
+        y_to   = _ask_str("Año hasta (Enter=todos)", None) or None
+        min_q  = _ask_int("Mínimo de clasificaciones por piloto", 20)
+        piloto = _ask_str("Piloto para fortaleza por circuito (driverRef, código o nombre)", "hamilton")
+
+        pilotos = sesion.clasificacion_pilotos(y_from, y_to, min_q)
+        conversion = sesion.conversion_clasificacion(y_from, y_to)
+        (_, nombre, ref), circuitos = sesion.fortaleza_circuitos(piloto, y_from, y_to)
+        if pilotos.empty:
+            print("No hay clasificaciones con ese filtro.")
+            return
+
+        print("\n--- Tabla 6: Brecha a la pole y con el compañero (menor brecha primero) ---")
+        print(pilotos.head(15).to_string(index=False))
+        print("\n--- Tabla 7: De la posición de clasificación al resultado ---")
+        print(conversion.head(10).to_string(index=False))
+        print(f"\n--- Tabla 8: {nombre} — circuitos más fuertes y más débiles en clasificación ---")
+        print(circuitos.head(5).to_string(index=False))
+        print("...")
+        print(circuitos.tail(5).to_string(index=False))
+
+        plt.figure(figsize=(10, 5))
+        for col, etiqueta in (("victoria_pct", "Victoria"), ("podio_pct", "Podio"), ("top10_pct", "Top 10")):
+            plt.plot(conversion['pos_clasif'], conversion[col], marker='o', label=etiqueta)
+        plt.title('Resultado en carrera según la posición de clasificación', fontsize=14)
+        plt.xlabel('Posición de clasificación'); plt.ylabel('% de las carreras')
+        plt.xticks(conversion['pos_clasif'])
+        plt.legend(); plt.grid(True, linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+
+        if not circuitos.empty:
+            plt.figure(figsize=(10, 8))
+            plt.barh(circuitos['circuito'][::-1], circuitos['fortaleza_pct'][::-1])
+            plt.title(f'{nombre}: brecha a la pole por circuito frente a su mediana', fontsize=14)
+            plt.xlabel('Fortaleza (puntos % más cerca de la pole que su mediana)'); plt.ylabel('Circuito')
+            plt.axvline(0, linestyle='--')
+            plt.grid(axis='x', linestyle='--', alpha=0.6)
+            plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Clasificación] Aviso: {e}")
+
+# ---- ANÁLISIS 7: Paradas en boxes ----
+def analisis_7_paradas(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 7: PARADAS EN BOXES")
+    print("="*80)
+    try:
+        y_from = _ask_str("Año desde (Enter=todos)", None) or None
+        y_to   = _ask_str("Año hasta (Enter=todos)", None) or None
+
+        temporadas = sesion.paradas_temporadas(y_from, y_to)
+        if temporadas.empty:
+            print("No hay paradas registradas en ese rango (pit_stops.csv empieza en 2011).")
+            return
+        equipos = sesion.paradas_equipos(y_from, y_to)
+        undercuts = sesion.paradas_undercuts(y_from, y_to)
+        perdida = sesion.perdida_pits(y_from, y_to)
+
+        print("\n--- Tabla 9: Paradas por piloto y carrera, por temporada (%) ---")
+        print(temporadas.to_string(index=False))
+        ultimo = equipos['year'].max()
+        print(f"\n--- Tabla 10: Mediana de parada por equipo ({ultimo}) ---")
+        print(equipos[equipos['year'] == ultimo].to_string(index=False))
+        print("\n--- Tabla 11: Undercuts por equipo (orden previo aproximado con la parrilla) ---")
+        print(undercuts.head(10).to_string(index=False))
+        print("\n--- Tabla 12: Circuitos con más tiempo perdido en el pit lane ---")
+        print(perdida.head(10).to_string(index=False))
+
+        plt.figure(figsize=(11, 6))
+        base = None
+        for col in ['0', '1', '2', '3', '4+']:
+            plt.bar(temporadas['year'], temporadas[col], bottom=base, label=f'{col} paradas')
+            base = temporadas[col] if base is None else base + temporadas[col]
+        plt.title('Pilotos por número de paradas en cada temporada', fontsize=14)
+        plt.xlabel('Temporada'); plt.ylabel('% de pilotos por carrera')
+        plt.legend(); plt.grid(axis='y', linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+
+        top = perdida.head(15)
+        plt.figure(figsize=(11, 7))
+        plt.barh(top['circuito'][::-1], top['mediana_s'][::-1])
+        plt.title('Tiempo mediano en el pit lane por circuito', fontsize=14)
+        plt.xlabel('Segundos (entrada a salida del pit lane)'); plt.ylabel('Circuito')
+        plt.grid(axis='x', linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Paradas] Aviso: {e}")
+
+# ---- ANÁLISIS 8: Campeonato ----
+def analisis_8_campeonato(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 8: CAMPEONATO")
+    print("="*80)
+    try:
+        tipo  = _ask_str("Campeonato (pilotos/constructores)", "pilotos")
+        year  = _ask_int("Temporada", 2021)
+        ronda = _ask_str("Tras la ronda (Enter=última)", None) or None
+        top   = _ask_int("Top N para la gráfica", 5)
+
+        tabla = sesion.campeonato_tabla(tipo, year, ronda)
+        puntos, diferencia = sesion.campeonato_progresion(tipo, year, top)
+        decisivas = sesion.rondas_decisivas(tipo)
+
+        print(f"\n--- Tabla 13: Campeonato de {tipo} {year}" + (f" tras la ronda {ronda}" if ronda else "") + " ---")
+        print(tabla.head(15).to_string(index=False))
+        print("\n--- Tabla 14: Títulos decididos con más rondas de antelación ---")
+        print(decisivas.sort_values(['rondas_restantes', 'year'], ascending=False).head(10).to_string(index=False))
+
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(11, 9), sharex=True)
+        for col in puntos.columns:
+            ax1.plot(puntos.index, puntos[col], marker='o', markersize=3, label=col)
+            ax2.plot(diferencia.index, diferencia[col], marker='o', markersize=3, label=col)
+        ax1.set_title(f'Campeonato de {tipo} {year}: puntos acumulados', fontsize=14)
+        ax1.set_ylabel('Puntos'); ax1.legend(); ax1.grid(True, linestyle='--', alpha=0.6)
+        ax2.set_title('Desventaja con el líder', fontsize=14)
+        ax2.set_xlabel('Ronda'); ax2.set_ylabel('Puntos por detrás')
+        ax2.invert_yaxis(); ax2.grid(True, linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Campeonato] Aviso: {e}")
+
+# ---- ANÁLISIS 9: Previo del GP (señales) ----
+def analisis_9_previo(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 9: PREVIO DEL GP (SEÑALES)")
+    print("="*80)
+    try:
+        year  = _ask_int("Temporada", 2024)
+        ronda = _ask_int("Ronda", 1)
+
+        (_, gp), senales = sesion.previo_gp(year, ronda)
+
+        print(f"\n--- Tabla 15: Señales antes del {gp} {year} (forma = últimas 5 carreras) ---")
+        print(senales.round(2).to_string(index=False))
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 7))
+        ax1.scatter(senales['forma_pos_media'], senales['circuito_pos_media'])
+        for _, fila in senales.iterrows():
+            ax1.annotate(fila['piloto'], (fila['forma_pos_media'], fila['circuito_pos_media']), fontsize=8)
+        ax1.set_title('Forma reciente vs historial en el circuito', fontsize=14)
+        ax1.set_xlabel('Posición media (últimas 5 carreras)'); ax1.set_ylabel('Posición media en el circuito')
+        ax1.invert_xaxis(); ax1.invert_yaxis(); ax1.grid(True, linestyle='--', alpha=0.6)
+        ax2.barh(senales['piloto'][::-1], senales['abandonos_pct'][::-1])
+        ax2.set_title('% de abandonos en su carrera deportiva', fontsize=14)
+        ax2.set_xlabel('% de carreras sin terminar'); ax2.grid(axis='x', linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Previo] Aviso: {e}")
+
+# ---- ANÁLISIS 10: Fiabilidad (abandonos) ----
+def analisis_10_fiabilidad(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 10: FIABILIDAD (ABANDONOS)")
+    print("="*80)
+    try:
+        y_from = _ask_str("Año desde (Enter=todos)", None) or None
+        y_to   = _ask_str("Año hasta (Enter=todos)", None) or None
+        min_s  = _ask_int("Mínimo de salidas por equipo/circuito/piloto", 20)
+        tipo   = _ask_sesion()
+
+        temporadas = sesion.fiabilidad("temporadas", y_from, y_to, 1, tipo)
+        equipos = sesion.fiabilidad("equipos", y_from, y_to, min_s, tipo)
+        circuitos = sesion.fiabilidad("circuitos", y_from, y_to, min_s, tipo)
+        pilotos = sesion.fiabilidad("pilotos", y_from, y_to, min_s, tipo)
+        if temporadas.empty:
+            print("No hay resultados en ese rango.")
+            return
+
+        print("\n--- Tabla 16: Equipos con más abandonos (% de salidas) ---")
+        print(equipos.head(10).round(1).to_string(index=False))
+        print("\n--- Tabla 17: Circuitos con más abandonos ---")
+        print(circuitos.head(10).round(1).to_string(index=False))
+        print("\n--- Tabla 18: Pilotos con más abandonos mecánicos ---")
+        print(pilotos.sort_values('mecanica_pct', ascending=False).head(10).round(1).to_string(index=False))
+
+        plt.figure(figsize=(12, 6))
+        base = None
+        for col, etiqueta in (("mecanica_pct", "Mecánica"), ("accidente_pct", "Accidente"), ("otro_pct", "Otro")):
+            plt.bar(temporadas['year'], temporadas[col], bottom=base, label=etiqueta)
+            base = temporadas[col] if base is None else base + temporadas[col]
+        plt.title('Abandonos por temporada y causa', fontsize=14)
+        plt.xlabel('Temporada'); plt.ylabel('% de las salidas')
+        plt.legend(); plt.grid(axis='y', linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Fiabilidad] Aviso: {e}")
+
+# ---- ANÁLISIS 11: Equipos ----
+def analisis_11_equipos(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 11: EQUIPOS (COMPAÑEROS Y COCHE vs PILOTO)")
+    print("="*80)
+    try:
+        y_from = _ask_str("Año desde (Enter=todos)", None) or None
+        y_to   = _ask_str("Año hasta (Enter=todos)", None) or None
+        min_gp = _ask_int("Mínimo de carreras juntos (compañeros)", 10)
+        min_cp = _ask_int("Mínimo de carreras por piloto (coche vs piloto)", 50)
+        tipo   = _ask_sesion()
+
+        temporadas = sesion.equipos_temporadas(y_from, y_to)
+        duelos = sesion.companeros(y_from, y_to, min_gp, tipo)
+        aportes = sesion.coche_piloto(y_from, y_to, min_cp, tipo)
+        if temporadas.empty:
+            print("No hay resultados en ese rango.")
+            return
+
+        print("\n--- Tabla 19: Los tres equipos con más puntos de cada temporada ---")
+        mejores = temporadas.sort_values(['year', 'puntos'], ascending=[False, False]).groupby('year').head(3)
+        print(mejores.head(15).to_string(index=False))
+        print("\n--- Tabla 20: Duelos entre compañeros más desiguales ---")
+        cols = ['year', 'equipo', 'piloto_A', 'piloto_B', 'carreras', 'delante_A', 'delante_B',
+                'delta_pos_medio', 'delta_puntos']
+        print(duelos[cols].head(15).round(2).to_string(index=False))
+        print("\n--- Tabla 21: Coche vs piloto (aporte negativo = mejor que sus compañeros) ---")
+        print(aportes.head(10).round(2).to_string(index=False))
+
+        equipos = temporadas.groupby('equipo')['puntos'].sum().nlargest(5).index
+        plt.figure(figsize=(12, 6))
+        for equipo in equipos:
+            t = temporadas[temporadas['equipo'] == equipo]
+            plt.plot(t['year'], t['puntos'], marker='o', markersize=3, label=equipo)
+        plt.title('Puntos por temporada de los equipos con más puntos', fontsize=14)
+        plt.xlabel('Temporada'); plt.ylabel('Puntos')
+        plt.legend(); plt.grid(True, linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+
+        plt.figure(figsize=(11, 7))
+        plt.scatter(aportes['aporte_coche'], aportes['aporte_piloto'], s=12, alpha=0.6)
+        for fila in list(aportes.head(5).itertuples()) + list(aportes.tail(3).itertuples()):
+            plt.annotate(fila.nombre, (fila.aporte_coche, fila.aporte_piloto), fontsize=8)
+        plt.axhline(0, linestyle='--')
+        plt.title('Coche vs piloto: posición media de los compañeros y diferencia propia', fontsize=14)
+        plt.xlabel('Aporte del coche (posición media de sus compañeros)')
+        plt.ylabel('Aporte del piloto (posiciones; negativo = mejor)')
+        plt.gca().invert_yaxis(); plt.grid(True, linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Equipos] Aviso: {e}")
+
+# ---- ANÁLISIS 12: Rating Elo ----
+def analisis_12_elo(sesion):
+    print("\n" + "="*80)
+    print("ANÁLISIS 12: RATING ELO DE PILOTOS")
+    print("="*80)
+    try:
+        modo   = _ask_str("Duelos (todos/companeros)", "todos").lower()
+        orden  = _ask_str("Ordenar por (pico/final)", "pico").lower()
+        hasta  = _ask_str("Hasta el año (Enter=todos)", None) or None
+        min_gp = _ask_int("Mínimo de carreras por piloto", 50)
+        topn   = _ask_int("Top N", 15)
+
+        tabla = sesion.elo_clasificacion(modo, hasta, min_gp, orden)
+        if tabla.empty:
+            print("No hay pilotos con ese filtro.")
+            return
+        print(f"\n--- Tabla 22: Rating Elo ({modo}, por {orden}) ---")
+        print(tabla.head(topn).round(1).to_string(index=False))
+
+        raw = _ask_str("Pilotos para la gráfica, separados por coma (Enter=los 5 primeros)")
+        pilotos = [p.strip() for p in raw.split(',') if p.strip()] or list(tabla['piloto'].head(5))
+        progresion = sesion.elo_progresion(modo, pilotos, hasta)
+
+        top = tabla.head(topn)
+        col = 'pico' if orden == 'pico' else 'rating'
+        plt.figure(figsize=(12, 8))
+        plt.barh(top['piloto'][::-1], top[col][::-1])
+        plt.xlim(left=min(top[col].min() - 50, 1500))
+        plt.title(f'Top {len(top)} pilotos por rating Elo ({orden})', fontsize=16)
+        plt.xlabel('Rating Elo'); plt.ylabel('Piloto')
+        plt.grid(axis='x', linestyle='--', alpha=0.7)
+        plt.tight_layout(); plt.show()
+
+        plt.figure(figsize=(12, 6))
+        for piloto in progresion.columns:
+            serie = progresion[piloto].dropna()
+            plt.plot(serie.index, serie.to_numpy(), label=piloto)
+        plt.axhline(1500, linestyle='--', color='grey')
+        plt.title('Rating Elo tras cada carrera', fontsize=14)
+        plt.xlabel('Fecha'); plt.ylabel('Rating Elo')
+        plt.legend(); plt.grid(True, linestyle='--', alpha=0.6)
+        plt.tight_layout(); plt.show()
+    except Exception as e:
+        print(f"[Elo] Aviso: {e}")
+
 # ---- MENÚ PRINCIPAL ----
 def menu_principal():
     while True:
@@ -303,17 +541,41 @@ def menu_principal():
         print("2) Circuitos con más carreras")
         print("3) Distribución de edades de pilotos")
         print("4) Head-to-Head (H2H) entre pilotos")
+        print("5) Matriz H2H de todas las parejas")
+        print("6) Clasificación vs carrera")
+        print("7) Paradas en boxes")
+        print("8) Campeonato")
+        print("9) Previo del GP (señales)")
+        print("10) Fiabilidad (abandonos)")
+        print("11) Equipos (compañeros y coche vs piloto)")
+        print("12) Rating Elo de pilotos")
         print("0) Salir")
         op = input("> Elige una opción: ").strip()
 
         if op == '1':
-            analisis_1_remontadores(dfRaces, dfResults, dfDrivers)
+            analisis_1_remontadores(sesion)
         elif op == '2':
-            analisis_2_circuitos(dfRaces, dfCircuits)
+            analisis_2_circuitos(sesion)
         elif op == '3':
-            analisis_3_edades(dfDrivers)
+            analisis_3_edades(sesion)
         elif op == '4':
-            analisis_4_h2h(dfResults, dfRaces, dfDrivers)
+            analisis_4_h2h(sesion)
+        elif op == '5':
+            analisis_5_matriz_h2h(sesion)
+        elif op == '6':
+            analisis_6_clasificacion(sesion)
+        elif op == '7':
+            analisis_7_paradas(sesion)
+        elif op == '8':
+            analisis_8_campeonato(sesion)
+        elif op == '9':
+            analisis_9_previo(sesion)
+        elif op == '10':
+            analisis_10_fiabilidad(sesion)
+        elif op == '11':
+            analisis_11_equipos(sesion)
+        elif op == '12':
+            analisis_12_elo(sesion)
         elif op == '0':
             print("¡Hasta la próxima! 🏁")
             break
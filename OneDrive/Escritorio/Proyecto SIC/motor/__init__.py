@@ -0,0 +1,6 @@
+# ==============================
+# MOTOR DE DATOS Y ANÁLISIS F1
+# ==============================
+# Paquete compartido por la consola (main.py) y la interfaz (interfaz.py).
+
+from .datos import DATA_DIR, cargar_tabla, cargar_datos
@@ -0,0 +1,106 @@
+# ==============================
+# AGREGADOS DERIVADOS (mantenidos de forma incremental)
+# ==============================
+# Sumas que alimentan los análisis y que se pueden actualizar carrera a
+# carrera sin volver a recorrer la historia:
+#   - por (piloto, año, sesión): carreras, suma de puntos y de posiciones
+#     ganadas, salidas y abandonos mecánicos / por accidente (código de estado
+#     de la tabla de hechos) -> remontadores para cualquier "año mínimo" y
+#     sesión (carrera, sprint o ambas) sumando años
+#   - carreras por circuito
+#   - GP disputados por piloto (catálogo / índice de pilotos; sólo carreras)
+#   - matriz H2H histórica de todas las parejas (sólo carreras)
+import numpy as np
+import pandas as pd
+
+from .datos import guardar_objeto, huellas_fuentes, leer_objeto
+from .estados import ACCIDENTE, MECANICA
+from .h2h import MatrizH2H
+from .hechos import CARRERA, FUENTES as FUENTES_HECHOS, codigo_sesion
+
+NOMBRE_CACHE = "agregados"
+FUENTES = list(FUENTES_HECHOS)
+
+class Agregados:
+    def __init__(self):
+        self.piloto_anio = pd.DataFrame(
+            columns=["carreras", "suma_puntos", "suma_ganadas", "salidas", "mecanicos", "accidentes"],
+            index=pd.MultiIndex.from_arrays([[], [], []], names=["driverId", "year", "sesion"]),
+            dtype=np.float64)
+        self.circuitos = pd.Series(dtype=np.int64, name="carreras")   # circuitId -> nº de GP
+        self.starts = pd.Series(dtype=np.int64, name="starts")        # driverId -> nº de GP
+        self.h2h = MatrizH2H(np.empty(0, dtype=np.int64))
+        self.carreras = set()                                         # raceId ya contados
+
+    @classmethod
+    def desde_hechos(cls, hechos, dfRaces):
+        ag = cls()
+        ag.anexar(hechos, dfRaces)
+        return ag
+
+    def anexar(self, hechos_nuevos, races_nuevas):
+        """Suma las filas nuevas de la tabla de hechos y las carreras nuevas de races."""
+        races_nuevas = races_nuevas[~races_nuevas["raceId"].isin(self.carreras)]
+        self.carreras.update(int(r) for r in races_nuevas["raceId"])
+        cir = races_nuevas.groupby("circuitId").size()
+        self.circuitos = self.circuitos.add(cir, fill_value=0).astype(np.int64)
+        if len(hechos_nuevos) == 0:
+            return
+        estado = hechos_nuevos["estado"].to_numpy()
+        salio = hechos_nuevos["salio"].to_numpy()
+        g = hechos_nuevos.assign(
+            mecanico=salio & (estado == MECANICA), accidente=salio & (estado == ACCIDENTE),
+        ).groupby(["driverId", "year", "sesion"], observed=True).agg(
+            carreras=("raceId", "count"),
+            suma_puntos=("points", "sum"),
+            suma_ganadas=("posiciones_ganadas", "sum"),
+            salidas=("salio", "sum"),
+            mecanicos=("mecanico", "sum"),
+            accidentes=("accidente", "sum"),
+        ).astype(np.float64)
+        self.piloto_anio = self.piloto_anio.add(g, fill_value=0)
+        carreras = hechos_nuevos[hechos_nuevos["sesion"].to_numpy() == CARRERA]
+        st = carreras.groupby("driverId")["raceId"].nunique()
+        self.starts = self.starts.add(st, fill_value=0).astype(np.int64)
+        self.h2h.acumular(carreras)
+
+    # ---- consultas ----
+    def remontadores(self, anio_min, refs, sesion=CARRERA):
+        """Estadísticas por piloto desde `anio_min` en `sesion` (None: todas; refs: driverId -> driverRef)."""
+        pa = self.piloto_anio
+        filtro = pa.index.get_level_values("year") >= int(anio_min)
+        codigo = codigo_sesion(sesion)
+        if codigo is not None:
+            filtro &= pa.index.get_level_values("sesion") == codigo
+        sel = pa[filtro]
+        tot = sel.groupby(level="driverId").sum()
+        stats = pd.DataFrame({
+            "driver": tot.index.map(refs),
+            "total_carreras": tot["carreras"].astype(np.int64).to_numpy(),
+            "promedio_puntos": (tot["suma_puntos"] / tot["carreras"]).to_numpy(),
+            "promedio_pos_ganadas": (tot["suma_ganadas"] / tot["carreras"]).to_numpy(),
+            # covariables: una remontada con muchos abandonos mecánicos vale distinto
+            "abandonos_mecanicos_pct": (tot["mecanicos"] / tot["salidas"] * 100).to_numpy(),
+            "abandonos_accidente_pct": (tot["accidentes"] / tot["salidas"] * 100).to_numpy(),
+        })
+        return stats.dropna(subset=["driver"]).sort_values("driver").reset_index(drop=True)
+
+    def circuitos_top(self, dfCircuits, topn=None):
+        """Serie nombre de circuito -> nº de GP, de mayor a menor."""
+        nombres = dfCircuits.set_index("circuitId")["name"]
+        conteo = self.circuitos.copy()
+        conteo.index = conteo.index.map(nombres)
+        conteo = conteo.groupby(level=0).sum().sort_values(ascending=False, kind="stable")
+        conteo.index.name = "name_circuit"
+        conteo.name = "count"
+        return conteo if topn is None else conteo.head(topn)
+
+def cargar_agregados(dfHechos, dfRaces, data_dir=None):
+    """Agregados desde la caché; si algún CSV cambió se recalculan y se guardan."""
+    ag = leer_objeto(NOMBRE_CACHE, FUENTES, data_dir)
+    if ag is not None:
+        return ag
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    ag = Agregados.desde_hechos(dfHechos, dfRaces)
+    guardar_objeto(NOMBRE_CACHE, ag, huellas, data_dir)
+    return ag
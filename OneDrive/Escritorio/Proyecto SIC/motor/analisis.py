@@ -0,0 +1,454 @@
+# ==============================
+# MOTOR DE ANÁLISIS (sin entrada/salida)
+# ==============================
+# Funciones puras: reciben tablas y parámetros tipados y devuelven DataFrames
+# o arrays, sin input(), print(), plt.show() ni messagebox. La consola y la
+# interfaz sólo piden parámetros y dibujan; los workers, el memo y los
+# benchmarks llaman a estas mismas funciones.
+#
+# SesionAnalisis junta los datos de Data/ (cargados bajo demanda y una sola
+# vez, también desde varios hilos) con el memo de resultados.
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from . import clasificacion as clf
+from . import equipos as eqp
+from . import fiabilidad as fia
+from . import paradas as prd
+from .agregados import cargar_agregados
+from .campeonato import TIPOS as TIPOS_CAMPEONATO, cargar_campeonato
+from .datos import cargar_tabla, version_datos
+from .elo import MODOS as MODOS_ELO, cargar_elo
+from .h2h import MatrizH2H, diferencia_acumulada, resumen_par, serie_par
+from .hechos import CARRERA, SPRINT, cargar_hechos
+from .memo import MAX_BYTES, MemoLRU
+from .pilotos import IndicePilotos
+from .senales import cargar_senales
+
+# Las funciones sobre la tabla de hechos aceptan `sesion`: "carrera" (por
+# defecto), "sprint" o "todas".
+OPCIONES_SESION = ("carrera", "sprint", "todas")
+
+# ---- Análisis 1: remontadores ----
+def remontadores(agregados, refs, anio_min=2000, min_gp=50, sesion="carrera"):
+    """Pilotos con más de `min_gp` carreras desde `anio_min`, por promedio de posiciones ganadas."""
+    stats = agregados.remontadores(int(anio_min), refs, sesion)
+    stats = stats[stats["total_carreras"] > int(min_gp)]
+    return stats.sort_values(by="promedio_pos_ganadas", ascending=False)
+
+# ---- Análisis 2: circuitos ----
+def circuitos(agregados, dfCircuits, topn=None):
+    """Nº de Grandes Premios por circuito, de mayor a menor."""
+    return agregados.circuitos_top(dfCircuits, topn)
+
+# ---- Análisis 3: edades ----
+def edades(dfDrivers, hoy=None):
+    """Edad actual (años cumplidos) de cada piloto con fecha de nacimiento válida."""
+    dob = pd.to_datetime(dfDrivers["dob"], errors="coerce").dropna()
+    return (((hoy or datetime.now()) - dob).dt.days / 365.25).astype(int).rename("age")
+
+# ---- Análisis 4: H2H de dos pilotos ----
+def h2h(hechos, indice, piloto_A, piloto_B, desde=None, hasta=None, sesion="carrera"):
+    """Cara a cara de dos pilotos (driverRef, código o nombre); None si no tienen carreras comunes."""
+    A_id, A_name, A_ref = indice.resolver(piloto_A)
+    B_id, B_name, B_ref = indice.resolver(piloto_B)
+    serie = serie_par(hechos, A_id, B_id, desde, hasta, sesion)
+    if serie.empty:
+        return None
+    resumen = resumen_par(serie, A_name, B_name)
+    etiquetas = serie["year"].astype(str) + "-" + serie["round"].astype(str)
+    etiquetas = etiquetas.mask(serie["sesion"] == SPRINT, etiquetas + "S")  # sprint: "2023-4S"
+    return {
+        "A": (A_id, A_name, A_ref),
+        "B": (B_id, B_name, B_ref),
+        "serie": serie,
+        "resumen": resumen,
+        "victorias": tuple(int(v) for v in resumen["Victorias H2H"]),
+        "etiquetas": etiquetas.to_numpy(),
+        "fechas": serie["date"].to_numpy(),
+        "acumulado": diferencia_acumulada(serie),
+    }
+
+# ---- Análisis 5: matriz H2H ----
+def matriz_h2h(hechos, desde=None, hasta=None, solo_companeros=False, sesion="carrera"):
+    return MatrizH2H.desde_hechos(hechos, desde, hasta, solo_companeros=solo_companeros, sesion=sesion)
+
+def parejas_desiguales(matriz, indice, min_carreras=10):
+    """Cada pareja una vez, de la más desigual a la más pareja (dominio = |vA - vB| / carreras)."""
+    tabla = matriz.a_dataframe(min_carreras=min_carreras)
+    tabla = tabla[tabla["driverId_A"] < tabla["driverId_B"]].copy()
+    tabla["piloto_A"] = [indice.nombre(d)[1] for d in tabla["driverId_A"]]
+    tabla["piloto_B"] = [indice.nombre(d)[1] for d in tabla["driverId_B"]]
+    tabla["dominio"] = (tabla["victorias_A"] - tabla["victorias_B"]).abs() / tabla["carreras"]
+    return tabla.sort_values("dominio", ascending=False)
+
+# ---- Análisis 6: clasificación vs carrera ----
+def clasificacion_pilotos(clasif, refs, desde=None, hasta=None, min_clasif=20):
+    """Brechas a la pole y con el compañero y conversión a carrera, por piloto (menor brecha primero)."""
+    tabla = clf.brechas_pilotos(clasif, desde, hasta)
+    tabla = tabla[tabla["clasificaciones"] >= int(min_clasif)]
+    tabla.insert(0, "driver", tabla.index.map(refs))
+    return tabla.sort_values("gap_pole_mediano_pct").reset_index(drop=True)
+
+def conversion_clasificacion(clasif, desde=None, hasta=None):
+    return clf.conversion_posiciones(clasif, desde, hasta).reset_index()
+
+def fortaleza_circuitos(clasif, indice, dfCircuits, piloto, desde=None, hasta=None, min_clasif=3):
+    """((driverId, nombre, driverRef), circuitos del piloto de más fuerte a más débil)."""
+    driver = indice.resolver(piloto)
+    tabla = clf.fortaleza_circuitos(clasif, driver[0], desde, hasta, min_clasif)
+    nombres = dfCircuits.set_index("circuitId")["name"]
+    tabla.insert(0, "circuito", tabla.index.map(nombres))
+    return driver, tabla.reset_index(drop=True)
+
+# ---- Análisis 7: paradas en boxes ----
+def _nombres(df, columna_id, columna="name"):
+    return df.set_index(columna_id)[columna]
+
+def paradas_temporadas(paradas, hechos, desde=None, hasta=None):
+    """Nº medio de paradas y % de pilotos con 0/1/2/3/4+ paradas, por temporada."""
+    return prd.distribucion_paradas(paradas, hechos, desde, hasta).reset_index()
+
+def paradas_equipos(paradas, dfConstructors, desde=None, hasta=None, min_paradas=10):
+    """Mediana de parada (s) por equipo y temporada, del equipo más rápido al más lento."""
+    tabla = prd.mediana_equipos(paradas, desde, hasta)
+    tabla = tabla[tabla["paradas"] >= int(min_paradas)]
+    tabla.insert(2, "equipo", tabla["constructorId"].map(_nombres(dfConstructors, "constructorId")))
+    tabla["mediana_s"] = tabla.pop("mediana_ms") / 1000
+    return tabla.drop(columns="constructorId").sort_values(["year", "mediana_s"]).reset_index(drop=True)
+
+def paradas_undercuts(candidatos, dfConstructors, desde=None, hasta=None):
+    """Intentos y éxitos de undercut por equipo del atacante (más intentos primero)."""
+    intentos = prd.undercuts(candidatos, desde, hasta)
+    g = intentos.groupby("constructorId")["exito"]
+    tabla = pd.DataFrame({"intentos": g.size(), "exitos": g.sum()})
+    tabla["exito_pct"] = tabla["exitos"] / tabla["intentos"] * 100
+    tabla.insert(0, "equipo", tabla.index.map(_nombres(dfConstructors, "constructorId")))
+    return tabla.sort_values(["intentos", "exito_pct"], ascending=False).reset_index(drop=True)
+
+def perdida_pits(paradas, dfCircuits, desde=None, hasta=None, min_paradas=20):
+    """Tiempo en el pit lane por circuito (s), de mayor a menor pérdida."""
+    tabla = prd.perdida_circuitos(paradas, desde, hasta)
+    tabla = tabla[tabla["paradas"] >= int(min_paradas)]
+    tabla.insert(0, "circuito", tabla.index.map(_nombres(dfCircuits, "circuitId")))
+    for col in ("mediana", "p25", "p75"):
+        tabla[col + "_s"] = tabla.pop(col + "_ms") / 1000
+    return tabla.sort_values("mediana_s", ascending=False).reset_index(drop=True)
+
+# ---- Análisis 8: campeonato ----
+def campeonato_tabla(campeonato, nombres, year, ronda=None):
+    """Clasificación tras la ronda `ronda` (Enter/None = final) con el nombre de cada participante."""
+    tabla = campeonato.tabla(year, ronda)
+    tabla.insert(1, "nombre", tabla.pop(campeonato.columna_id).map(nombres))
+    return tabla
+
+def campeonato_progresion(campeonato, nombres, year, top=5):
+    """(puntos, desventaja con el líder) ronda a ronda de los `top` primeros al cierre."""
+    puntos = campeonato.progresion(year, top=top)
+    diferencia = campeonato.diferencia_lider(year, puntos.columns)
+    etiquetas = [nombres.get(i, str(i)) for i in puntos.columns]
+    puntos.columns = diferencia.columns = etiquetas
+    return puntos, diferencia
+
+def rondas_decisivas(campeonato, nombres, dfRaces):
+    """Por temporada: campeón, ronda y GP en que quedó matemáticamente decidido, margen final."""
+    tabla = campeonato.decisivas().copy()
+    tabla.insert(1, "campeon", tabla.pop(campeonato.columna_id).map(nombres))
+    gp = dfRaces.set_index(["year", "round"])["name"]
+    tabla.insert(3, "gp_decisivo", gp.reindex(pd.MultiIndex.from_arrays(
+        [tabla["year"], tabla["ronda_decisiva"]])).to_numpy())
+    return tabla
+
+# ---- Análisis 9: previo del GP (señales) ----
+def carrera(dfRaces, year, ronda):
+    """(raceId, nombre del GP) de la ronda `ronda` del año `year`."""
+    fila = dfRaces[(dfRaces["year"] == int(year)) & (dfRaces["round"] == int(ronda))]
+    if fila.empty:
+        raise ValueError(f"No hay ronda {ronda} en {year}.")
+    return int(fila["raceId"].iloc[0]), str(fila["name"].iloc[0])
+
+def inscritos_gp(dfRaces, dfQualifying, hechos, race_id):
+    """Pilotos y equipos de una carrera sin resultados: los de su clasificación o, si
+    tampoco la hay, la última alineación de cada equipo de la temporada más reciente."""
+    gp = dfRaces[dfRaces["raceId"] == int(race_id)][["raceId", "year", "round", "circuitId"]]
+    q = dfQualifying[dfQualifying["raceId"] == int(race_id)][["driverId", "constructorId"]]
+    if q.empty:
+        h = hechos[hechos["sesion"].to_numpy() == CARRERA]
+        h = h[h["year"].to_numpy() == h["year"].max()]
+        ultima = h.groupby("constructorId")["raceId"].transform("last")
+        q = h[h["raceId"] == ultima][["driverId", "constructorId"]]
+    q = q.drop_duplicates("driverId", keep="last")
+    return gp.merge(q.assign(raceId=int(race_id)), on="raceId")
+
+def previo_gp(senales, refs, dfConstructors, race_id, inscritos=None):
+    """Señales previas a la carrera de cada piloto inscrito, de mejor a peor forma."""
+    tabla = senales.previo(race_id, inscritos)
+    if tabla.empty:
+        raise ValueError("No hay pilotos inscritos en esa carrera.")
+    tabla.insert(0, "piloto", tabla["driverId"].map(refs))
+    tabla.insert(1, "equipo", tabla["constructorId"].map(_nombres(dfConstructors, "constructorId")))
+    tabla["companero"] = tabla.pop("companeroId").map(refs)
+    tabla = tabla.drop(columns=["raceId", "year", "round", "circuitId", "driverId", "constructorId"])
+    return tabla.sort_values(["forma_pos_media", "clasif_media"], na_position="last").reset_index(drop=True)
+
+# ---- Análisis 10: fiabilidad ----
+VISTAS_FIABILIDAD = {"equipos": "constructorId", "temporadas": "year", "circuitos": "circuitId", "pilotos": "driverId"}
+
+def fiabilidad(hechos, vista, nombres=None, desde=None, hasta=None, min_salidas=20, sesion="carrera"):
+    """% de abandonos por equipo / temporada / circuito / piloto, de más a menos abandonos."""
+    if vista not in VISTAS_FIABILIDAD:
+        raise ValueError(f"Vista de fiabilidad desconocida: {vista}")
+    tabla = fia.tasas_abandono(hechos, VISTAS_FIABILIDAD[vista], desde, hasta, min_salidas, sesion)
+    if vista == "temporadas":
+        return tabla.reset_index()
+    tabla.insert(0, "nombre", tabla.index.map(nombres))
+    return tabla.sort_values("abandono_pct", ascending=False).reset_index(drop=True)
+
+# ---- Análisis 11: equipos ----
+def equipos_temporadas(hechos, dfConstructorResults, dfRaces, campeonato, nombres, desde=None, hasta=None):
+    """Puntos, posición final, GP, victorias, podios y posición media de cada equipo por temporada."""
+    tabla = eqp.temporadas_equipos(hechos, dfConstructorResults, dfRaces, campeonato, desde, hasta)
+    tabla.insert(1, "equipo", tabla.pop("constructorId").map(nombres))
+    return tabla
+
+def companeros(hechos, refs, nombres, desde=None, hasta=None, min_carreras=5, sesion="carrera"):
+    """Duelos entre compañeros de equipo por temporada, del más desigual al más parejo."""
+    tabla = eqp.duelos_companeros(hechos, desde, hasta, sesion)
+    tabla = tabla[tabla["carreras"] >= int(min_carreras)].copy()
+    tabla["dominio"] = (tabla["delante_A"] - tabla["delante_B"]).abs() / tabla["carreras"]
+    tabla.insert(1, "equipo", tabla.pop("constructorId").map(nombres))
+    tabla.insert(2, "piloto_A", tabla.pop("driverA").map(refs))
+    tabla.insert(3, "piloto_B", tabla.pop("driverB").map(refs))
+    return tabla.sort_values(["dominio", "carreras"], ascending=False).reset_index(drop=True)
+
+def coche_piloto(hechos, refs, desde=None, hasta=None, min_carreras=20, sesion="carrera"):
+    """Por piloto: posición media = coche (sus compañeros) + piloto, de mejor a peor aporte propio."""
+    tabla = eqp.resumen_coche_piloto(eqp.coche_piloto(hechos, desde, hasta, sesion))
+    tabla = tabla[tabla["carreras"] >= int(min_carreras)]
+    tabla.insert(0, "nombre", tabla.index.map(refs))
+    return tabla.sort_values("aporte_piloto").reset_index(drop=True)
+
+# ---- Análisis 12: rating Elo ----
+ORDENES_ELO = {"pico": "pico", "final": "rating"}
+
+def elo_clasificacion(motor, refs, hasta=None, min_carreras=50, orden="pico"):
+    """Pilotos por rating Elo máximo ("pico") o al final del período ("final")."""
+    if orden not in ORDENES_ELO:
+        raise ValueError(f"Orden desconocido: {orden}")
+    tabla = motor.clasificacion(hasta, min_carreras)
+    tabla.insert(0, "piloto", tabla.index.map(refs))
+    return tabla.sort_values(ORDENES_ELO[orden], ascending=False).reset_index(drop=True)
+
+def elo_progresion(motor, indice, pilotos, hasta=None):
+    """Rating tras cada carrera (filas = fecha, columnas = driverRef) de los pilotos indicados."""
+    resueltos = [indice.resolver(p) for p in pilotos]
+    serie = motor.progresion([d for d, _, _ in resueltos], hasta)
+    refs = {d: ref for d, _, ref in resueltos}
+    tabla = serie.pivot_table(index="date", columns="driverId", values="rating", aggfunc="last")
+    columnas = [d for d, _, _ in resueltos if d in tabla.columns]   # en el orden pedido
+    tabla = tabla[columnas]
+    tabla.columns = [refs[d] for d in columnas]
+    return tabla
+
+# ---- Sesión: datos bajo demanda + memo ----
+class SesionAnalisis:
+    """Tablas, hechos, agregados e índice de pilotos de un Data/, con el memo de resultados."""
+
+    def __init__(self, data_dir=None, max_bytes_memo=MAX_BYTES):
+        self.data_dir = data_dir
+        self.memo = MemoLRU(max_bytes_memo, version=version_datos(data_dir))
+        self._lock = threading.RLock()
+        self._cargados = {}
+
+    def _perezoso(self, nombre, cargar):
+        # cada recurso se carga una sola vez aunque lo pidan varios hilos
+        with self._lock:
+            if nombre not in self._cargados:
+                self._cargados[nombre] = cargar()
+            return self._cargados[nombre]
+
+    def tabla(self, nombre):
+        return self._perezoso(nombre, lambda: cargar_tabla(nombre, self.data_dir))
+
+    races = property(lambda self: self.tabla("races"))
+    results = property(lambda self: self.tabla("results"))
+    drivers = property(lambda self: self.tabla("drivers"))
+    circuits = property(lambda self: self.tabla("circuits"))
+    constructors = property(lambda self: self.tabla("constructors"))
+
+    @property
+    def hechos(self):
+        return self._perezoso("hechos", lambda: cargar_hechos(
+            self.data_dir, dfResults=self.results, dfRaces=self.races, dfDrivers=self.drivers,
+            dfStatus=self.tabla("status"), dfSprint=self.tabla("sprint_results")))
+
+    @property
+    def agregados(self):
+        return self._perezoso("agregados", lambda: cargar_agregados(self.hechos, self.races, self.data_dir))
+
+    @property
+    def clasificacion(self):
+        return self._perezoso("clasificacion", lambda: clf.cargar_clasificacion(
+            self.data_dir, dfRaces=self.races, dfResults=self.results))
+
+    @property
+    def undercuts(self):
+        return self._perezoso("undercuts", lambda: prd.cargar_undercuts(self.paradas, self.data_dir))
+
+    @property
+    def paradas(self):
+        return self._perezoso("paradas", lambda: prd.cargar_paradas(
+            self.data_dir, dfRaces=self.races, dfResults=self.results))
+
+    @property
+    def undercuts(self):
+        return self._perezoso("undercuts", lambda: prd.cargar_undercuts(self.paradas, self.data_dir))
+
+    @property
+    def senales(self):
+        return self._perezoso("senales", lambda: cargar_senales(self.hechos, self.clasificacion, self.data_dir))
+
+    def campeonato(self, tipo="pilotos"):
+        """Índice del campeonato de pilotos o de constructores."""
+        if tipo not in TIPOS_CAMPEONATO:
+            raise ValueError(f"Tipo de campeonato desconocido: {tipo}")
+        return self._perezoso(f"campeonato_{tipo}", lambda: cargar_campeonato(tipo, self.data_dir, self.races))
+
+    def elo(self, modo="todos"):
+        """Rating Elo con todos los rivales ("todos") o sólo con el compañero ("companeros")."""
+        if modo not in MODOS_ELO:
+            raise ValueError(f"Modo de Elo desconocido: {modo}")
+        return self._perezoso(f"elo_{modo}", lambda: cargar_elo(self.hechos, modo, self.data_dir))
+
+    def nombres(self, tipo="pilotos"):
+        """id -> nombre corto (driverRef o nombre del constructor)."""
+        if tipo == "pilotos":
+            return self.refs
+        return self._perezoso("nombres_constructores",
+                              lambda: self.constructors.set_index("constructorId")["name"])
+
+    @property
+    def indice(self):
+        return self._perezoso("indice", lambda: IndicePilotos(self.drivers, self.agregados.starts))
+
+    @property
+    def refs(self):
+        return self._perezoso("refs", lambda: pd.Series(self.indice.refs, index=self.indice.ids))
+
+    def cargar(self):
+        """Carga todo de una vez (la consola lo hace al arrancar)."""
+        return self.circuits, self.indice, self.refs
+
+    # ---- análisis con memo ----
+    def remontadores(self, anio_min=2000, min_gp=50, sesion="carrera"):
+        return self.memo.memo("remontadores", dict(anio_min=anio_min, min_gp=min_gp, sesion=sesion),
+                              lambda: remontadores(self.agregados, self.refs, anio_min, min_gp, sesion))
+
+    def circuitos(self, topn=None):
+        conteo = self.memo.memo("circuitos", {}, lambda: circuitos(self.agregados, self.circuits))
+        return conteo if topn is None else conteo.head(topn)
+
+    def edades(self):
+        return self.memo.memo("edades", {}, lambda: edades(self.drivers))
+
+    def h2h(self, piloto_A, piloto_B, desde=None, hasta=None, sesion="carrera"):
+        return self.memo.memo("h2h", dict(a=piloto_A, b=piloto_B, desde=desde, hasta=hasta, sesion=sesion),
+                              lambda: h2h(self.hechos, self.indice, piloto_A, piloto_B, desde, hasta, sesion))
+
+    def matriz_h2h(self, desde=None, hasta=None, solo_companeros=False, sesion="carrera"):
+        params = dict(desde=desde, hasta=hasta, solo_companeros=solo_companeros, sesion=sesion)
+        return self.memo.memo("matriz_h2h", params,
+                              lambda: matriz_h2h(self.hechos, desde, hasta, solo_companeros, sesion))
+
+    def parejas_desiguales(self, desde=None, hasta=None, solo_companeros=False, min_carreras=10, sesion="carrera"):
+        params = dict(desde=desde, hasta=hasta, solo_companeros=solo_companeros, min_carreras=min_carreras,
+                      sesion=sesion)
+        return self.memo.memo("parejas_desiguales", params, lambda: parejas_desiguales(
+            self.matriz_h2h(desde, hasta, solo_companeros, sesion), self.indice, min_carreras))
+
+    def clasificacion_pilotos(self, desde=None, hasta=None, min_clasif=20):
+        return self.memo.memo("clasificacion_pilotos", dict(desde=desde, hasta=hasta, min_clasif=min_clasif),
+                              lambda: clasificacion_pilotos(self.clasificacion, self.refs, desde, hasta, min_clasif))
+
+    def conversion_clasificacion(self, desde=None, hasta=None):
+        return self.memo.memo("conversion_clasificacion", dict(desde=desde, hasta=hasta),
+                              lambda: conversion_clasificacion(self.clasificacion, desde, hasta))
+
+    def fortaleza_circuitos(self, piloto, desde=None, hasta=None, min_clasif=3):
+        return self.memo.memo("fortaleza_circuitos", dict(piloto=piloto, desde=desde, hasta=hasta, min_clasif=min_clasif),
+                              lambda: fortaleza_circuitos(self.clasificacion, self.indice, self.circuits,
+                                                          piloto, desde, hasta, min_clasif))
+
+    def paradas_temporadas(self, desde=None, hasta=None):
+        return self.memo.memo("paradas_temporadas", dict(desde=desde, hasta=hasta),
+                              lambda: paradas_temporadas(self.paradas, self.hechos, desde, hasta))
+
+    def paradas_equipos(self, desde=None, hasta=None, min_paradas=10):
+        return self.memo.memo("paradas_equipos", dict(desde=desde, hasta=hasta, min_paradas=min_paradas),
+                              lambda: paradas_equipos(self.paradas, self.constructors, desde, hasta, min_paradas))
+
+    def paradas_undercuts(self, desde=None, hasta=None):
+        return self.memo.memo("paradas_undercuts", dict(desde=desde, hasta=hasta),
+                              lambda: paradas_undercuts(self.undercuts, self.constructors, desde, hasta))
+
+    def perdida_pits(self, desde=None, hasta=None, min_paradas=20):
+        return self.memo.memo("perdida_pits", dict(desde=desde, hasta=hasta, min_paradas=min_paradas),
+                              lambda: perdida_pits(self.paradas, self.circuits, desde, hasta, min_paradas))
+
+    def campeonato_tabla(self, tipo, year, ronda=None):
+        return self.memo.memo("campeonato_tabla", dict(tipo=tipo, year=year, ronda=ronda),
+                              lambda: campeonato_tabla(self.campeonato(tipo), self.nombres(tipo), year, ronda))
+
+    def campeonato_progresion(self, tipo, year, top=5):
+        return self.memo.memo("campeonato_progresion", dict(tipo=tipo, year=year, top=top),
+                              lambda: campeonato_progresion(self.campeonato(tipo), self.nombres(tipo), year, top))
+
+    def rondas_decisivas(self, tipo="pilotos"):
+        return self.memo.memo("rondas_decisivas", dict(tipo=tipo),
+                              lambda: rondas_decisivas(self.campeonato(tipo), self.nombres(tipo), self.races))
+
+    def previo_gp(self, year, ronda):
+        """((raceId, nombre del GP), señales de los pilotos inscritos)."""
+        gp = carrera(self.races, year, ronda)
+        return gp, self.memo.memo("previo_gp", dict(race_id=gp[0]), lambda: self._previo_gp(gp[0]))
+
+    def _previo_gp(self, race_id):
+        # carrera sin resultados (la próxima): inscritos desde qualifying o la última alineación
+        inscritos = None
+        if race_id not in self.senales.carreras:
+            inscritos = inscritos_gp(self.races, self.tabla("qualifying"), self.hechos, race_id)
+        return previo_gp(self.senales, self.refs, self.constructors, race_id, inscritos)
+
+    def fiabilidad(self, vista, desde=None, hasta=None, min_salidas=20, sesion="carrera"):
+        nombres = {"equipos": lambda: self.nombres("constructores"), "pilotos": lambda: self.refs,
+                   "circuitos": lambda: self.circuits.set_index("circuitId")["name"]}.get(vista, lambda: None)
+        params = dict(vista=vista, desde=desde, hasta=hasta, min_salidas=min_salidas, sesion=sesion)
+        return self.memo.memo("fiabilidad", params,
+                              lambda: fiabilidad(self.hechos, vista, nombres(), desde, hasta, min_salidas, sesion))
+
+    def equipos_temporadas(self, desde=None, hasta=None):
+        return self.memo.memo("equipos_temporadas", dict(desde=desde, hasta=hasta), lambda: equipos_temporadas(
+            self.hechos, self.tabla("constructor_results"), self.races, self.campeonato("constructores"),
+            self.nombres("constructores"), desde, hasta))
+
+    def companeros(self, desde=None, hasta=None, min_carreras=5, sesion="carrera"):
+        params = dict(desde=desde, hasta=hasta, min_carreras=min_carreras, sesion=sesion)
+        return self.memo.memo("companeros", params, lambda: companeros(
+            self.hechos, self.refs, self.nombres("constructores"), desde, hasta, min_carreras, sesion))
+
+    def coche_piloto(self, desde=None, hasta=None, min_carreras=20, sesion="carrera"):
+        params = dict(desde=desde, hasta=hasta, min_carreras=min_carreras, sesion=sesion)
+        return self.memo.memo("coche_piloto", params,
+                              lambda: coche_piloto(self.hechos, self.refs, desde, hasta, min_carreras, sesion))
+
+    def elo_clasificacion(self, modo="todos", hasta=None, min_carreras=50, orden="pico"):
+        params = dict(modo=modo, hasta=hasta, min_carreras=min_carreras, orden=orden)
+        return self.memo.memo("elo_clasificacion", params, lambda: elo_clasificacion(
+            self.elo(modo), self.refs, hasta, min_carreras, orden))
+
+    def elo_progresion(self, modo, pilotos, hasta=None):
+        pilotos = tuple(pilotos)
+        return self.memo.memo("elo_progresion", dict(modo=modo, pilotos=pilotos, hasta=hasta),
+                              lambda: elo_progresion(self.elo(modo), self.indice, pilotos, hasta))
@@ -0,0 +1,317 @@
+# ==============================
+# BENCHMARKS DEL MOTOR A 1x / 10x / 100x
+# ==============================
+# Mide la carga, el índice de pilotos y cada análisis del menú sobre datos
+# sintéticos con el esquema de Ergast, N veces más grandes que Data/:
+#   python -m motor.bench                      # escalas 1, 10 y 100
+#   python -m motor.bench --escalas 1 10 --repeticiones 5
+#   python -m motor.bench --guardar            # fija la línea base
+#
+# Generador: cada copia c > 0 de la historia agrega carreras nuevas en las
+# mismas temporadas (rondas desplazadas) con los pilotos barajados dentro de
+# cada carrera, y pilotos extra (driverRef_c) que sólo engordan el catálogo.
+# Así crecen results / races / qualifying / pit_stops / drivers sin que la
+# matriz H2H (pilotos que corren) crezca con el cuadrado de la escala.
+#
+# Cada escala se mide en un proceso aparte (el pico de RSS no se arrastra
+# entre escalas) y por paso se informa:
+#   tiempo_ms     mediana de las repeticiones
+#   rss_pico_mb   pico de RSS del proceso al terminar el paso
+#   mem_pico_mb   pico de memoria asignada por el paso (tracemalloc)
+#   asignaciones  bloques que el paso deja asignados (tracemalloc)
+# Los resultados se comparan con benchmarks/linea_base.json y se marca
+# REGRESIÓN cuando tiempo o memoria empeoran más que --umbral.
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .datos import CACHE_SUBDIR, DATA_DIR, version_datos
+
+try:
+    import resource
+except ImportError:  # Windows: el pico de RSS sale de psutil, si está instalado
+    resource = None
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_SINTETICOS = os.path.join(DATA_DIR, ".bench")
+LINEA_BASE = os.path.join(RAIZ, "benchmarks", "linea_base.json")
+
+ESCALAS = (1, 10, 100)
+REPETICIONES = 3
+UMBRAL = 0.25
+RUIDO_MS = 5.0   # diferencias menores son ruido del reloj, no regresiones
+
+# los standings se copian tal cual: las carreras copiadas no son campeonatos
+# reales y el índice del campeonato es denso por año × ronda × participante
+TABLAS_FIJAS = ("circuits", "constructors", "status", "seasons", "driver_standings", "constructor_standings")
+VERSION_GENERADOR = 4  # subirla cuando cambie lo que escribe generar_sintetico
+PILOTOS_A_RESOLVER = ("hamilton", "VER", "Alonso", "michael schumacher", "raikkonen", "senna", "prost")
+
+# ---- Generador sintético ----
+def _leer(nombre, origen):
+    # todo como texto: las columnas que no se tocan se copian tal cual (\N incluido)
+    return pd.read_csv(os.path.join(origen, nombre + ".csv"), dtype=str, keep_default_na=False)
+
+def _ids(df, columna):
+    return df[columna].astype(np.int64)
+
+def _barajar_en_carrera(raceIds, rng):
+    """Permutación que mueve cada fila a otra de la misma carrera."""
+    por_carrera = np.argsort(raceIds, kind="stable")
+    barajado = np.lexsort((rng.random(len(raceIds)), raceIds))
+    destino = np.empty(len(raceIds), dtype=np.int64)
+    destino[por_carrera] = barajado
+    return destino
+
+def generar_sintetico(factor, destino, origen=None, semilla=0):
+    """Escribe en `destino` un Data/ sintético `factor` veces más grande que `origen`."""
+    origen = origen or DATA_DIR
+    rng = np.random.default_rng(semilla)
+    os.makedirs(destino, exist_ok=True)
+    for nombre in TABLAS_FIJAS:
+        shutil.copyfile(os.path.join(origen, nombre + ".csv"), os.path.join(destino, nombre + ".csv"))
+
+    races, results = _leer("races", origen), _leer("results", origen)
+    quali, pits, drivers = _leer("qualifying", origen), _leer("pit_stops", origen), _leer("drivers", origen)
+    sprints, equipos = _leer("sprint_results", origen), _leer("constructor_results", origen)
+    salto_carrera = int(_ids(races, "raceId").max())
+    salto_ronda = int(_ids(races, "round").max())
+    salto_piloto = int(_ids(drivers, "driverId").max())
+    salto_resultado = int(_ids(results, "resultId").max())
+    salto_quali = int(_ids(quali, "qualifyId").max())
+    salto_sprint = int(_ids(sprints, "resultId").max()) if len(sprints) else 0
+    salto_equipo = int(_ids(equipos, "constructorResultsId").max())
+    rid_results = _ids(results, "raceId").to_numpy()
+
+    copias = {"races": [], "results": [], "sprint_results": [], "constructor_results": [], "qualifying": [], "pit_stops": [], "drivers": []}
+    for c in range(factor):
+        r = races.copy()
+        r["raceId"] = _ids(races, "raceId") + c * salto_carrera
+        r["round"] = _ids(races, "round") + c * salto_ronda
+        copias["races"].append(r)
+
+        res = results.copy()
+        res["resultId"] = _ids(results, "resultId") + c * salto_resultado
+        res["raceId"] = rid_results + c * salto_carrera
+        q, p, s = quali.copy(), pits.copy(), sprints.copy()
+        if c > 0:
+            # mismo parque de pilotos, otro orden de llegada en cada carrera
+            mover = ["driverId", "constructorId", "number"]
+            res[mover] = results[mover].to_numpy()[_barajar_en_carrera(rid_results, rng)]
+            mapa = pd.DataFrame({"raceId": rid_results, "driverId": _ids(results, "driverId"),
+                                 "nuevo": res["driverId"].to_numpy(),
+                                 "constructor": res["constructorId"].to_numpy()})
+            mapa = mapa.drop_duplicates(["raceId", "driverId"])
+            for df, base in ((q, quali), (p, pits), (s, sprints)):
+                clave = pd.DataFrame({"raceId": _ids(base, "raceId"), "driverId": _ids(base, "driverId")})
+                m = clave.merge(mapa, on=["raceId", "driverId"], how="left")
+                hay = m["nuevo"].notna().to_numpy()
+                df.loc[hay, "driverId"] = m.loc[hay, "nuevo"].to_numpy()
+                if "constructorId" in df.columns:
+                    df.loc[hay, "constructorId"] = m.loc[hay, "constructor"].to_numpy()
+        q["qualifyId"] = _ids(quali, "qualifyId") + c * salto_quali
+        q["raceId"] = _ids(quali, "raceId") + c * salto_carrera
+        p["raceId"] = _ids(pits, "raceId") + c * salto_carrera
+        s["resultId"] = _ids(sprints, "resultId") + c * salto_sprint
+        s["raceId"] = _ids(sprints, "raceId") + c * salto_carrera
+        copias["results"].append(res)
+        copias["sprint_results"].append(s)
+        e = equipos.copy()
+        e["constructorResultsId"] = _ids(equipos, "constructorResultsId") + c * salto_equipo
+        e["raceId"] = _ids(equipos, "raceId") + c * salto_carrera
+        copias["constructor_results"].append(e)
+        copias["qualifying"].append(q)
+        copias["pit_stops"].append(p)
+
+        d = drivers.copy()
+        if c > 0:
+            d["driverId"] = _ids(drivers, "driverId") + c * salto_piloto
+            d["driverRef"] = drivers["driverRef"] + f"_{c}"
+        copias["drivers"].append(d)
+
+    for nombre, partes in copias.items():
+        pd.concat(partes, ignore_index=True).to_csv(os.path.join(destino, nombre + ".csv"), index=False)
+    with open(os.path.join(destino, "origen.json"), "w", encoding="utf-8") as f:
+        json.dump({"factor": factor, "semilla": semilla, "version_origen": version_datos(origen),
+                   "generador": VERSION_GENERADOR}, f)
+    return destino
+
+def datos_sinteticos(factor, semilla=0):
+    """Carpeta Data/.bench/x<factor>; se regenera sólo si cambió Data/, la semilla o el generador."""
+    destino = os.path.join(DIR_SINTETICOS, f"x{factor}")
+    esperado = {"factor": factor, "semilla": semilla, "version_origen": version_datos(DATA_DIR),
+                "generador": VERSION_GENERADOR}
+    try:
+        with open(os.path.join(destino, "origen.json"), encoding="utf-8") as f:
+            if json.load(f) == esperado:
+                return destino
+    except (OSError, ValueError):
+        pass
+    shutil.rmtree(destino, ignore_errors=True)
+    return generar_sintetico(factor, destino, DATA_DIR, semilla)
+
+# ---- Medición de un paso ----
+def _rss_pico_mb():
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 2**20 if sys.platform == "darwin" else pico / 1024  # bytes en macOS, KB en Linux
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().peak_wset / 2**20
+
+def medir(calcular, repeticiones=REPETICIONES, preparar=None):
+    """Tiempo (mediana), pico de RSS y memoria/asignaciones de tracemalloc de `calcular()`."""
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        gc.collect()
+        t0 = time.perf_counter()
+        calcular()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    rss = _rss_pico_mb()
+
+    # corrida aparte con tracemalloc: el rastreo distorsiona los tiempos
+    if preparar:
+        preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = calcular()
+        _, pico = tracemalloc.get_traced_memory()
+        bloques = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return {"tiempo_ms": round(statistics.median(tiempos), 3), "rss_pico_mb": rss and round(rss, 1),
+            "mem_pico_mb": round(pico / 2**20, 2), "asignaciones": int(bloques)}
+
+def medir_escala(data_dir, repeticiones=REPETICIONES):
+    """Todos los pasos sobre un Data/ (se ejecuta dentro del proceso de la escala)."""
+    from . import analisis as an
+    from .elo import MotorElo
+    from .pilotos import IndicePilotos
+
+    def sin_cache():
+        shutil.rmtree(os.path.join(data_dir, CACHE_SUBDIR), ignore_errors=True)
+
+    def cargar():
+        sesion = an.SesionAnalisis(data_dir)
+        sesion.cargar()
+        return sesion
+
+    pasos = {"carga_csv": medir(cargar, repeticiones, preparar=sin_cache),
+             "carga_cache": medir(cargar, repeticiones)}
+    s = cargar()
+    hechos, ag, refs = s.hechos, s.agregados, s.refs
+    pasos["catalogo"] = medir(lambda: IndicePilotos(s.drivers, ag.starts).catalogo(), repeticiones)
+    pasos["resolver_pilotos"] = medir(lambda: [s.indice.resolver(p) for p in PILOTOS_A_RESOLVER], repeticiones)
+    pasos["remontadores"] = medir(lambda: an.remontadores(ag, refs, 2000, 50), repeticiones)
+    pasos["circuitos"] = medir(lambda: an.circuitos(ag, s.circuits), repeticiones)
+    pasos["edades"] = medir(lambda: an.edades(s.drivers), repeticiones)
+    pasos["h2h"] = medir(lambda: an.h2h(hechos, s.indice, "hamilton", "rosberg"), repeticiones)
+    pasos["matriz_h2h"] = medir(lambda: an.matriz_h2h(hechos, 2010, 2020), repeticiones)
+    clasif = s.clasificacion
+    pasos["clasificacion"] = medir(lambda: an.clasificacion_pilotos(clasif, refs, 2010, 2020), repeticiones)
+    undercuts = s.undercuts
+    pasos["paradas"] = medir(lambda: an.paradas_undercuts(undercuts, s.constructors, 2015, 2020), repeticiones)
+    campeonato = s.campeonato("pilotos")
+    pasos["campeonato"] = medir(lambda: an.campeonato_tabla(campeonato, refs, 2021, 10), repeticiones)
+    senales = s.senales
+    race_id, _ = an.carrera(s.races, 2021, 10)
+    pasos["previo_gp"] = medir(lambda: an.previo_gp(senales, refs, s.constructors, race_id), repeticiones)
+    pasos["fiabilidad"] = medir(lambda: an.fiabilidad(hechos, "equipos", s.nombres("constructores")), repeticiones)
+    pasos["elo"] = medir(lambda: MotorElo().anexar(hechos), repeticiones)
+    pasos["equipos"] = medir(lambda: an.companeros(hechos, refs, s.nombres("constructores"), 2000, 2020), repeticiones)
+    return {"filas_results": int(len(hechos)), "pasos": pasos}
+
+def _escala_en_proceso(factor, repeticiones):
+    data_dir = datos_sinteticos(factor)
+    cmd = [sys.executable, "-m", "motor.bench", "--medir", data_dir, "--repeticiones", str(repeticiones)]
+    proc = subprocess.run(cmd, cwd=RAIZ, capture_output=True, text=True)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1:] or [f"código de salida {proc.returncode}"]
+        return {"error": error[0]}
+    return json.loads(proc.stdout)
+
+# ---- Línea base y comparación ----
+def leer_linea_base(ruta=LINEA_BASE):
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def guardar_linea_base(resultados, ruta=LINEA_BASE):
+    """Reemplaza en la línea base las escalas medidas sin error (las demás se conservan)."""
+    escalas = (leer_linea_base(ruta) or {}).get("escalas", {})
+    escalas.update({e: r for e, r in resultados.items() if "error" not in r})
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump({"fecha": datetime.now().isoformat(timespec="seconds"),
+                   "maquina": f"{platform.machine()} {platform.system()} / Python {platform.python_version()}",
+                   "escalas": escalas}, f, indent=1, ensure_ascii=False)
+
+def comparar(resultados, base, umbral=UMBRAL):
+    """Filas (escala, paso, métricas, variación de tiempo, ¿regresión?) frente a la línea base."""
+    filas = []
+    base = (base or {}).get("escalas", {})
+    for escala, res in resultados.items():
+        for paso, m in res.get("pasos", {}).items():
+            b = base.get(escala, {}).get("pasos", {}).get(paso)
+            var = m["tiempo_ms"] / b["tiempo_ms"] - 1 if b and b["tiempo_ms"] > 0 else None
+            peor_tiempo = var is not None and var > umbral and m["tiempo_ms"] - b["tiempo_ms"] > RUIDO_MS
+            peor_mem = b is not None and m["mem_pico_mb"] > b["mem_pico_mb"] * (1 + umbral) + 1
+            filas.append((escala, paso, m, var, peor_tiempo or peor_mem))
+    return filas
+
+def imprimir(resultados, filas):
+    print(f"{'escala':>6} {'paso':<17} {'tiempo ms':>10} {'vs base':>8} {'RSS MB':>8} "
+          f"{'pico MB':>8} {'asign.':>9}")
+    for escala, res in resultados.items():
+        if "error" in res:
+            print(f"{escala:>6} ERROR: {res['error']}")
+    for escala, paso, m, var, regresion in filas:
+        var_txt = f"{var:+.0%}" if var is not None else "—"
+        rss_txt = f"{m['rss_pico_mb']:.1f}" if m["rss_pico_mb"] is not None else "—"
+        print(f"{escala:>6} {paso:<17} {m['tiempo_ms']:>10.1f} {var_txt:>8} {rss_txt:>8} "
+              f"{m['mem_pico_mb']:>8.1f} {m['asignaciones']:>9,}" + ("  REGRESIÓN" if regresion else ""))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de análisis")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS), help="múltiplos de Data/")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="empeoramiento tolerado (0.25 = 25%%)")
+    parser.add_argument("--guardar", action="store_true", help="guarda los resultados como línea base")
+    parser.add_argument("--medir", metavar="DATA_DIR", help=argparse.SUPPRESS)  # proceso hijo
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir_escala(args.medir, args.repeticiones)))
+        sys.exit(0)
+
+    resultados = {}
+    for factor in args.escalas:
+        print(f"Midiendo escala {factor}x…", file=sys.stderr)
+        resultados[f"{factor}x"] = _escala_en_proceso(factor, args.repeticiones)
+    filas = comparar(resultados, leer_linea_base(), args.umbral)
+    imprimir(resultados, filas)
+    if args.guardar:
+        guardar_linea_base(resultados)
+        print(f"Línea base guardada en {LINEA_BASE}")
+    elif any(f[4] for f in filas):
+        sys.exit(1)
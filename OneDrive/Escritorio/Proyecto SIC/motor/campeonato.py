@@ -0,0 +1,142 @@
+# ==============================
+# ÍNDICE DEL CAMPEONATO (pilotos y constructores)
+# ==============================
+# driver_standings / constructor_standings + races -> arrays densos
+# año × ronda × participante de puntos, posición y victorias, construidos una
+# sola vez. "Clasificación tras la ronda N del año Y" es leer una fila
+# [y, N-1]; la progresión de puntos es una rebanada [y, :, ids] y las rondas
+# en que se decidió cada título salen de una sola pasada vectorizada.
+# Un participante que no figura en una ronda conserva lo que tenía en la
+# anterior (y tras la última ronda del año, lo del cierre).
+import numpy as np
+import pandas as pd
+
+from .datos import cargar_tabla, guardar_objeto, huellas_fuentes, leer_objeto
+
+TIPOS = {
+    # tipo -> (tabla de standings, columna del participante)
+    "pilotos": ("driver_standings", "driverId"),
+    "constructores": ("constructor_standings", "constructorId"),
+}
+
+class IndiceCampeonato:
+    def __init__(self, dfStandings, dfRaces, columna_id):
+        df = dfStandings[["raceId", columna_id, "points", "position", "wins"]].merge(
+            dfRaces[["raceId", "year", "round"]], on="raceId", how="inner")
+        self.columna_id = columna_id
+        self.years = np.unique(df["year"].to_numpy()).astype(np.int64)
+        self.ids = np.unique(df[columna_id].to_numpy()).astype(np.int64)
+        Y, R, N = len(self.years), int(df["round"].max()) if len(df) else 0, len(self.ids)
+
+        y = np.searchsorted(self.years, df["year"].to_numpy())
+        r = df["round"].to_numpy(np.int64) - 1
+        n = np.searchsorted(self.ids, df[columna_id].to_numpy())
+        puntos = np.full((Y, R, N), np.nan, dtype=np.float32)
+        posicion = np.zeros((Y, R, N), dtype=np.int16)
+        victorias = np.zeros((Y, R, N), dtype=np.int16)
+        puntos[y, r, n] = df["points"].to_numpy(np.float32)
+        posicion[y, r, n] = df["position"].to_numpy(np.int16)
+        victorias[y, r, n] = df["wins"].to_numpy(np.int16)
+
+        # arrastre hacia adelante: cada celda vacía toma la última ronda con datos
+        hay = ~np.isnan(puntos)
+        ultima = np.maximum.accumulate(np.where(hay, np.arange(R)[None, :, None], 0), axis=1)
+        self.puntos = np.take_along_axis(puntos, ultima, axis=1)
+        self.posicion = np.where(np.isnan(self.puntos), 0, np.take_along_axis(posicion, ultima, axis=1))
+        self.victorias = np.take_along_axis(victorias, ultima, axis=1)
+        self.rondas = pd.Series(df["round"].to_numpy()).groupby(y).max().reindex(
+            range(Y), fill_value=0).to_numpy(np.int64)
+        self._decisivas = None
+
+    # ---- acceso ----
+    def _anio(self, year):
+        k = int(np.searchsorted(self.years, int(year)))
+        if k >= len(self.years) or self.years[k] != int(year):
+            raise ValueError(f"No hay clasificación del campeonato para {year}.")
+        return k
+
+    def _ronda(self, k, ronda):
+        ultima = int(self.rondas[k])
+        return ultima if ronda is None else min(max(int(ronda), 1), ultima)
+
+    def tabla(self, year, ronda=None):
+        """Clasificación tras la ronda `ronda` (por defecto la última) del año."""
+        k = self._anio(year)
+        r = self._ronda(k, ronda) - 1
+        pos = self.posicion[k, r]
+        n = np.flatnonzero(pos > 0)
+        n = n[np.argsort(pos[n], kind="stable")]
+        pts = self.puntos[k, r, n].astype(np.float64)
+        return pd.DataFrame({
+            "posicion": pos[n].astype(np.int64), self.columna_id: self.ids[n], "puntos": pts,
+            "victorias": self.victorias[k, r, n].astype(np.int64),
+            "diferencia_lider": (pts.max() - pts) if len(pts) else pts,
+        })
+
+    def finales(self):
+        """Posición, puntos y victorias de cada participante al cierre de cada año."""
+        k = np.arange(len(self.years))
+        r = np.maximum(self.rondas - 1, 0)
+        pos = self.posicion[k, r]
+        y, n = np.nonzero(pos > 0)
+        return pd.DataFrame({
+            "year": self.years[y], self.columna_id: self.ids[n], "posicion": pos[y, n].astype(np.int64),
+            "puntos": self.puntos[k, r][y, n].astype(np.float64),
+            "victorias": self.victorias[k, r][y, n].astype(np.int64),
+        })
+
+    def progresion(self, year, ids=None, top=5):
+        """Puntos ronda a ronda (filas) de `ids` o de los `top` primeros al cierre (columnas)."""
+        k = self._anio(year)
+        R = int(self.rondas[k])
+        if ids is None:
+            ids = self.tabla(year)[self.columna_id].head(top).to_numpy()
+        n = np.searchsorted(self.ids, np.asarray(ids, dtype=np.int64))
+        puntos = pd.DataFrame(self.puntos[k, :R][:, n], index=pd.RangeIndex(1, R + 1, name="ronda"),
+                              columns=np.asarray(ids, dtype=np.int64))
+        return puntos.fillna(0.0)
+
+    def diferencia_lider(self, year, ids=None, top=5):
+        """Puntos de desventaja con el líder de cada ronda (0 = líder)."""
+        k = self._anio(year)
+        lider = np.nanmax(self.puntos[k, :int(self.rondas[k])], axis=1)
+        puntos = self.progresion(year, ids, top)
+        return puntos.rsub(lider, axis=0)
+
+    def decisivas(self):
+        """Por año: campeón, ronda en que el título quedó matemáticamente decidido y margen final.
+
+        Decidido = ventaja del líder > rondas restantes × máximo de puntos que alguien
+        sumó en una ronda ese año. Con los sistemas antiguos de "mejores N resultados"
+        es una aproximación.
+        """
+        if self._decisivas is None:
+            Y = len(self.years)
+            pts = np.nan_to_num(self.puntos, nan=0.0).astype(np.float64)
+            dos = -np.partition(-pts, 1, axis=2)[:, :, :2]   # líder y segundo de cada ronda
+            ventaja = dos[:, :, 0] - dos[:, :, 1]
+            por_ronda = np.diff(pts, axis=1, prepend=0.0).max(axis=(1, 2))
+            restantes = self.rondas[:, None] - np.arange(1, pts.shape[1] + 1)[None, :]
+            decidido = (ventaja > restantes * por_ronda[:, None]) & (restantes >= 0)
+            ronda = np.where(decidido.any(axis=1), decidido.argmax(axis=1) + 1, self.rondas)
+            final = np.maximum(self.rondas - 1, 0)
+            campeon = pts[np.arange(Y), final].argmax(axis=1)
+            self._decisivas = pd.DataFrame({
+                "year": self.years, self.columna_id: self.ids[campeon], "rondas": self.rondas,
+                "ronda_decisiva": ronda, "rondas_restantes": self.rondas - ronda,
+                "margen_final": ventaja[np.arange(Y), final],
+            })
+        return self._decisivas
+
+def cargar_campeonato(tipo, data_dir=None, dfRaces=None):
+    """Índice del campeonato de `tipo` ("pilotos" o "constructores") desde la caché."""
+    tabla, columna_id = TIPOS[tipo]
+    nombre, fuentes = f"campeonato_{tipo}", [tabla + ".csv", "races.csv"]
+    indice = leer_objeto(nombre, fuentes, data_dir)
+    if indice is not None:
+        return indice
+    huellas = huellas_fuentes(fuentes, data_dir)
+    indice = IndiceCampeonato(cargar_tabla(tabla, data_dir),
+                              dfRaces if dfRaces is not None else cargar_tabla("races", data_dir), columna_id)
+    guardar_objeto(nombre, indice, huellas, data_dir)
+    return indice
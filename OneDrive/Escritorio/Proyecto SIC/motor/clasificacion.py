@@ -0,0 +1,153 @@
+# ==============================
+# CLASIFICACIÓN VS CARRERA
+# ==============================
+# qualifying + races + results unidos UNA vez, con los tiempos q1/q2/q3
+# ("m:ss.sss") ya convertidos a milisegundos enteros y las columnas derivadas
+# (brecha a la pole, compañero y brecha con él, posición final). Se persiste
+# como caché columnar y los análisis son sólo filtros y groupby: en consulta
+# no se vuelve a leer ningún texto.
+import numpy as np
+import pandas as pd
+
+from .datos import cargar_tabla, guardar_cache, huellas_fuentes, leer_cache
+from .hechos import seleccionar
+
+NOMBRE_CACHE = "hechos_clasificacion"
+FUENTES = ["qualifying.csv", "races.csv", "results.csv"]
+SESIONES = ("q1", "q2", "q3")
+SIN_TIEMPO = 0  # ms de una sesión sin tiempo (\N, vacío o inválido)
+
+ESQUEMA_CLASIFICACION = {
+    "raceId": "int32", "year": "int16", "round": "int16", "circuitId": "int16",
+    "driverId": "int32", "constructorId": "int16", "pos_clasif": "int16",
+    "q1_ms": "int32", "q2_ms": "int32", "q3_ms": "int32", "mejor_ms": "int32",
+    "gap_pole_pct": "float64", "companeroId": "int32", "gap_companero_pct": "float64",
+    "grid": "float64", "pos_carrera": "float64",
+}
+
+# ---- Tiempos de vuelta ----
+def a_milisegundos(tiempos):
+    """'1:26.572' / '58.1' -> ms enteros; nulos o inválidos -> SIN_TIEMPO.
+
+    Con una columna categórica sólo se convierten las categorías (unos pocos
+    miles de textos distintos) y luego se indexa con los códigos.
+    """
+    serie = pd.Series(tiempos)
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        ms_cats = a_milisegundos(np.asarray(serie.cat.categories, dtype=object))
+        codigos = serie.cat.codes.to_numpy()
+        return np.where(codigos >= 0, ms_cats[np.maximum(codigos, 0)], SIN_TIEMPO).astype(np.int32)
+    partes = serie.astype("string").str.extract(r"^\s*(?:(\d+):)?(\d+)(?:\.(\d{1,3}))?\s*$")
+    minutos = pd.to_numeric(partes[0], errors="coerce").fillna(0).to_numpy(np.int64)
+    segundos = pd.to_numeric(partes[1], errors="coerce").to_numpy(np.float64)
+    fraccion = pd.to_numeric(partes[2].str.ljust(3, "0"), errors="coerce").fillna(0).to_numpy(np.int64)
+    ms = (minutos * 60_000 + np.nan_to_num(segundos) * 1000 + fraccion).astype(np.int64)
+    return np.where(np.isnan(segundos), SIN_TIEMPO, ms).astype(np.int32)
+
+def _con_tiempo(ms):
+    return np.where(ms > SIN_TIEMPO, ms, np.nan).astype(np.float64)
+
+# ---- Construcción ----
+def construir_clasificacion(dfQualifying, dfRaces, dfResults):
+    """Una fila por piloto y clasificación, con tiempos en ms y columnas derivadas."""
+    df = pd.DataFrame({
+        "raceId": dfQualifying["raceId"].to_numpy(),
+        "driverId": dfQualifying["driverId"].to_numpy(),
+        "constructorId": dfQualifying["constructorId"].to_numpy(),
+        "pos_clasif": dfQualifying["position"].to_numpy(),
+    })
+    for q in SESIONES:
+        df[q + "_ms"] = a_milisegundos(dfQualifying[q])
+    tiempos = np.column_stack([_con_tiempo(df[q + "_ms"].to_numpy()) for q in SESIONES])
+    mejor = np.fmin.reduce(tiempos, axis=1)
+    df["mejor_ms"] = np.nan_to_num(mejor, nan=SIN_TIEMPO).astype(np.int32)
+
+    df = df.merge(dfRaces[["raceId", "year", "round", "circuitId"]], on="raceId", how="inner")
+    carrera = dfResults[["raceId", "driverId", "grid", "positionOrder"]].drop_duplicates(["raceId", "driverId"])
+    df = df.merge(carrera.rename(columns={"positionOrder": "pos_carrera"}), on=["raceId", "driverId"], how="left")
+
+    # brecha a la pole: mejor vuelta del piloto contra la mejor de la sesión
+    mejor = _con_tiempo(df["mejor_ms"].to_numpy())
+    pole = pd.Series(mejor).groupby(df["raceId"].to_numpy()).transform("min").to_numpy()
+    df["gap_pole_pct"] = (mejor / pole - 1) * 100
+
+    # compañero: el otro coche del equipo, comparado en la última sesión que
+    # ambos completaron (q3 si los dos llegaron, si no q2, si no q1)
+    cols = ["raceId", "constructorId", "driverId"] + [q + "_ms" for q in SESIONES]
+    pares = df[cols].merge(df[cols], on=["raceId", "constructorId"], suffixes=("", "_c"))
+    pares = pares[pares["driverId"] != pares["driverId_c"]].drop_duplicates(["raceId", "driverId"])
+    propio = np.full(len(pares), np.nan)
+    rival = np.full(len(pares), np.nan)
+    for q in SESIONES:
+        a, b = _con_tiempo(pares[q + "_ms"].to_numpy()), _con_tiempo(pares[q + "_ms_c"].to_numpy())
+        ambos = ~np.isnan(a) & ~np.isnan(b)
+        propio = np.where(ambos, a, propio)
+        rival = np.where(ambos, b, rival)
+    pares = pd.DataFrame({"raceId": pares["raceId"].to_numpy(), "driverId": pares["driverId"].to_numpy(),
+                          "companeroId": pares["driverId_c"].to_numpy(),
+                          "gap_companero_pct": (propio / rival - 1) * 100})
+    df = df.merge(pares, on=["raceId", "driverId"], how="left")
+    df["companeroId"] = df["companeroId"].fillna(0)
+
+    df = df.sort_values(["year", "round", "raceId", "pos_clasif"], kind="mergesort")
+    return df[list(ESQUEMA_CLASIFICACION)].reset_index(drop=True)
+
+def cargar_clasificacion(data_dir=None, dfRaces=None, dfResults=None):
+    """Tabla de clasificación desde la caché; se reconstruye sólo si cambió algún CSV fuente."""
+    df = leer_cache(NOMBRE_CACHE, FUENTES, data_dir)
+    if df is not None:
+        return df
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    clasif = construir_clasificacion(
+        cargar_tabla("qualifying", data_dir),
+        dfRaces if dfRaces is not None else cargar_tabla("races", data_dir),
+        dfResults if dfResults is not None else cargar_tabla("results", data_dir),
+    )
+    return guardar_cache(NOMBRE_CACHE, clasif, huellas, data_dir, ESQUEMA_CLASIFICACION)
+
+# ---- Consultas (sólo filtros y groupby) ----
+def brechas_pilotos(clasif, desde=None, hasta=None):
+    """Por piloto: posición media en clasificación y en carrera, brecha a la pole y con el compañero."""
+    df = seleccionar(clasif, desde, hasta)
+    con_comp = df["gap_companero_pct"]
+    g = df.assign(delante=(con_comp < 0).astype(np.float64).where(con_comp.notna()),
+                  ganadas=df["pos_clasif"] - df["pos_carrera"]).groupby("driverId")
+    return pd.DataFrame({
+        "clasificaciones": g.size(),
+        "pos_media_clasif": g["pos_clasif"].mean(),
+        "pos_media_carrera": g["pos_carrera"].mean(),
+        "ganancia_media": g["ganadas"].mean(),
+        "gap_pole_mediano_pct": g["gap_pole_pct"].median(),
+        "gap_companero_mediano_pct": g["gap_companero_pct"].median(),
+        "delante_companero_pct": g["delante"].mean() * 100,
+    })
+
+def conversion_posiciones(clasif, desde=None, hasta=None, max_pos=20):
+    """Por posición de clasificación: cuántas veces terminó ganando, en el podio o en puntos (top 10)."""
+    df = seleccionar(clasif, desde, hasta)
+    df = df[df["pos_carrera"].notna() & (df["pos_clasif"] <= max_pos)]
+    pos = df["pos_carrera"]
+    g = df.assign(victoria=pos == 1, podio=pos <= 3, top10=pos <= 10).groupby("pos_clasif")
+    tabla = pd.DataFrame({
+        "carreras": g.size(),
+        "victoria_pct": g["victoria"].mean() * 100,
+        "podio_pct": g["podio"].mean() * 100,
+        "top10_pct": g["top10"].mean() * 100,
+        "pos_media_final": g["pos_carrera"].mean(),
+    })
+    tabla.index.name = "pos_clasif"
+    return tabla
+
+def fortaleza_circuitos(clasif, driver_id, desde=None, hasta=None, min_clasif=3):
+    """Circuitos donde el piloto clasifica mejor (o peor) que en su mediana general.
+
+    fortaleza_pct = mediana general de la brecha a la pole − mediana en el circuito
+    (positiva: en ese circuito queda más cerca de la pole que de costumbre).
+    """
+    df = seleccionar(clasif, desde, hasta)
+    df = df[(df["driverId"].to_numpy() == int(driver_id)) & df["gap_pole_pct"].notna()]
+    g = df.groupby("circuitId")["gap_pole_pct"]
+    tabla = pd.DataFrame({"clasificaciones": g.size(), "gap_pole_mediano_pct": g.median()})
+    tabla = tabla[tabla["clasificaciones"] >= min_clasif]
+    tabla["fortaleza_pct"] = df["gap_pole_pct"].median() - tabla["gap_pole_mediano_pct"]
+    return tabla.sort_values("fortaleza_pct", ascending=False)
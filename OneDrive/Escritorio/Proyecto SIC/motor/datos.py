@@ -0,0 +1,402 @@
+# ==============================
+# ACCESO A DATOS CON CACHÉ COLUMNAR
+# ==============================
+# Cada CSV de Data/ se convierte una sola vez a columnas NumPy (.npy) con
+# tipos explícitos. En los siguientes arranques las columnas se abren con
+# memory-map, así que cargar las tablas cuesta milisegundos.
+# La caché se invalida cuando cambia el CSV (mtime/tamaño y, si hace falta, hash).
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data")
+CACHE_SUBDIR = ".cache"
+VERSION_CACHE = 3
+NULO_ERGAST = r"\N"
+FILAS_MIN_MMAP = 4096
+
+# ---- Esquemas por tabla ----
+# Tipos NumPy explícitos; los enteros que traen \N se guardan como float64.
+# "category": códigos + categorías (texto repetido), "texto": texto libre,
+# "fecha": datetime64. Las columnas no listadas se infieren al convertir.
+# raceId y driverId van en int32: con datos sintéticos a escala 100x
+# (motor/bench.py) superan el rango de int16.
+ESQUEMAS = {
+    "circuits": {
+        "circuitId": "int16", "circuitRef": "texto", "name": "texto", "location": "texto",
+        "country": "category", "lat": "float64", "lng": "float64", "alt": "float64", "url": "texto",
+    },
+    "constructor_results": {
+        "constructorResultsId": "int32", "raceId": "int32", "constructorId": "int16",
+        "points": "float64", "status": "category",
+    },
+    "constructor_standings": {
+        "constructorStandingsId": "int32", "raceId": "int32", "constructorId": "int16",
+        "points": "float64", "position": "int16", "positionText": "category", "wins": "int16",
+    },
+    "constructors": {
+        "constructorId": "int16", "constructorRef": "texto", "name": "texto",
+        "nationality": "category", "url": "texto",
+    },
+    "driver_standings": {
+        "driverStandingsId": "int32", "raceId": "int32", "driverId": "int32",
+        "points": "float64", "position": "int16", "positionText": "category", "wins": "int16",
+    },
+    "drivers": {
+        "driverId": "int32", "driverRef": "texto", "number": "float64", "code": "texto",
+        "forename": "texto", "surname": "texto", "dob": "fecha", "nationality": "category",
+        "url": "texto",
+    },
+    "pit_stops": {
+        "raceId": "int32", "driverId": "int32", "stop": "int16", "lap": "int16",
+        "time": "category", "duration": "category", "milliseconds": "int32",
+    },
+    "qualifying": {
+        "qualifyId": "int32", "raceId": "int32", "driverId": "int32", "constructorId": "int16",
+        "number": "int16", "position": "int16", "q1": "category", "q2": "category", "q3": "category",
+    },
+    "races": {
+        "raceId": "int32", "year": "int16", "round": "int16", "circuitId": "int16",
+        "name": "texto", "date": "fecha", "time": "category", "url": "texto",
+    },
+    "results": {
+        "resultId": "int32", "raceId": "int32", "driverId": "int32", "constructorId": "int16",
+        "number": "float64", "grid": "int16", "position": "float64", "positionText": "category",
+        "positionOrder": "int16", "points": "float64", "laps": "int16", "time": "category",
+        "milliseconds": "float64", "fastestLap": "float64", "rank": "float64",
+        "fastestLapTime": "category", "fastestLapSpeed": "float64", "statusId": "int16",
+    },
+    "seasons": {"year": "int16", "url": "texto"},
+    "sprint_results": {
+        "resultId": "int32", "raceId": "int32", "driverId": "int32", "constructorId": "int16",
+        "number": "float64", "grid": "int16", "position": "float64", "positionText": "category",
+        "positionOrder": "int16", "points": "float64", "laps": "int16", "time": "category",
+        "milliseconds": "float64", "fastestLap": "float64", "fastestLapTime": "category",
+        "statusId": "int16",
+    },
+    "status": {"statusId": "int16", "status": "texto"},
+}
+
+# ---- Huellas de los CSV ----
+def _huella_rapida(ruta):
+    st = os.stat(ruta)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+def _sha1(ruta):
+    h = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+def huellas_fuentes(archivos, data_dir=None):
+    """Huella (mtime, tamaño y sha1) de cada CSV fuente; se toma ANTES de leerlo."""
+    data_dir = data_dir or DATA_DIR
+    huellas = {}
+    for archivo in archivos:
+        ruta = os.path.join(data_dir, archivo)
+        huellas[archivo] = dict(_huella_rapida(ruta), sha1=_sha1(ruta))
+    return huellas
+
+def version_datos(data_dir=None):
+    """Versión corta de Data/ (mtime y tamaño de cada CSV); cambia con cualquier ingesta."""
+    data_dir = data_dir or DATA_DIR
+    h = hashlib.sha1()
+    for archivo in sorted(os.listdir(data_dir)):
+        if archivo.endswith(".csv"):
+            rapida = _huella_rapida(os.path.join(data_dir, archivo))
+            h.update(f"{archivo}:{rapida['mtime_ns']}:{rapida['size']};".encode())
+    return h.hexdigest()[:12]
+
+def _fuentes_vigentes(guardadas, data_dir):
+    # Devuelve (vigente, huellas_refrescadas). Si sólo cambió el mtime pero el
+    # contenido es idéntico, la caché sigue valiendo y se refresca el manifiesto.
+    refrescadas = dict(guardadas)
+    cambio = False
+    for archivo, h in guardadas.items():
+        ruta = os.path.join(data_dir, archivo)
+        rapida = _huella_rapida(ruta)
+        if rapida["mtime_ns"] == h["mtime_ns"] and rapida["size"] == h["size"]:
+            continue
+        if rapida["size"] != h["size"] or _sha1(ruta) != h["sha1"]:
+            return False, None
+        refrescadas[archivo] = dict(rapida, sha1=h["sha1"])
+        cambio = True
+    return True, (refrescadas if cambio else None)
+
+# ---- Conversión DataFrame <-> columnas tipadas ----
+def _tipo_inferido(serie):
+    if pd.api.types.is_integer_dtype(serie):
+        return str(pd.to_numeric(serie, downcast="integer").dtype)
+    if pd.api.types.is_numeric_dtype(serie):
+        return "float64"
+    return "texto"
+
+def _codificar(df, esquema):
+    # Convierte cada columna a (nombre, tipo, valores, categorías)
+    columnas = []
+    for nombre in df.columns:
+        serie = df[nombre]
+        tipo = esquema.get(nombre) or _tipo_inferido(serie)
+        cats = None
+        if tipo in ("category", "texto"):
+            codigos, uniques = pd.factorize(serie.astype(object), sort=True)
+            cats = np.array([str(u) for u in uniques], dtype=str)
+            if cats.size == 0:
+                cats = np.array([], dtype="U1")
+            valores = codigos.astype(np.int16 if len(uniques) < np.iinfo(np.int16).max else np.int32)
+        elif tipo == "fecha":
+            valores = pd.to_datetime(serie, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        else:
+            if serie.isna().any() and np.dtype(tipo).kind in "iu":
+                tipo = "float64"
+            valores = serie.to_numpy(dtype=tipo)
+        columnas.append((nombre, tipo, valores, cats))
+    return columnas
+
+def _armar(columnas):
+    datos = {}
+    for nombre, tipo, valores, cats in columnas:
+        if tipo == "category":
+            datos[nombre] = pd.Categorical.from_codes(valores, categories=cats)
+        elif tipo == "texto":
+            textos = cats.astype(object).take(np.maximum(valores, 0)) if cats.size else np.full(len(valores), np.nan, dtype=object)
+            textos[np.asarray(valores) < 0] = np.nan
+            datos[nombre] = textos
+        else:
+            datos[nombre] = valores
+    return pd.DataFrame(datos, copy=False)
+
+def _leer_csv(ruta, esquema):
+    df = pd.read_csv(ruta, na_values=[NULO_ERGAST, ""], keep_default_na=False)
+    return _codificar(df, esquema)
+
+# ---- Lectura y escritura de la caché ----
+def _dir_cache(nombre, data_dir):
+    return os.path.join(data_dir, CACHE_SUBDIR, nombre)
+
+def _leer_manifiesto(directorio):
+    try:
+        with open(os.path.join(directorio, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _escribir_manifiesto(directorio, manifiesto):
+    tmp = os.path.join(directorio, f"manifest.json.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=1)
+    os.replace(tmp, os.path.join(directorio, "manifest.json"))
+
+def _cargar_columnas(directorio, manifiesto):
+    # memory-map de cada .npy; las tablas pequeñas se leen directo (mapear
+    # cuesta más que leer unos pocos KB y los archivos vacíos no se pueden mapear)
+    modo = "r" if manifiesto["filas"] >= FILAS_MIN_MMAP else None
+    columnas = []
+    for col in manifiesto["columnas"]:
+        valores = np.load(os.path.join(directorio, col["nombre"] + ".npy"), mmap_mode=modo)
+        cats = None
+        if col["tipo"] in ("category", "texto"):
+            cats = np.load(os.path.join(directorio, col["nombre"] + ".cats.npy"))
+        columnas.append((col["nombre"], col["tipo"], valores, cats))
+    return columnas
+
+def _manifiesto_vigente(nombre, fuentes, data_dir):
+    # (directorio, manifiesto) si la caché existe y corresponde a los CSV actuales
+    directorio = _dir_cache(nombre, data_dir)
+    manifiesto = _leer_manifiesto(directorio)
+    if (manifiesto is None or manifiesto.get("version") != VERSION_CACHE
+            or sorted(manifiesto.get("fuentes", {})) != sorted(fuentes)):
+        return None
+    try:
+        vigente, refrescadas = _fuentes_vigentes(manifiesto["fuentes"], data_dir)
+    except OSError:
+        return None
+    if not vigente:
+        return None
+    if refrescadas is not None:
+        manifiesto["fuentes"] = refrescadas
+        try:
+            _escribir_manifiesto(directorio, manifiesto)
+        except OSError:
+            pass
+    return directorio, manifiesto
+
+def cache_vigente(nombre, fuentes, data_dir=None):
+    """True si la caché `nombre` existe y coincide con sus CSV fuente."""
+    return _manifiesto_vigente(nombre, fuentes, data_dir or DATA_DIR) is not None
+
+def leer_cache(nombre, fuentes, data_dir=None):
+    """DataFrame memory-mapped de la caché `nombre`, o None si falta o está vencida."""
+    vigente = _manifiesto_vigente(nombre, fuentes, data_dir or DATA_DIR)
+    if vigente is None:
+        return None
+    directorio, manifiesto = vigente
+    try:
+        return _armar(_cargar_columnas(directorio, manifiesto))
+    except (OSError, ValueError):
+        return None
+
+def _guardar_columnas(nombre, columnas, huellas, data_dir):
+    # Se escribe en un directorio temporal y se reemplaza de una vez
+    destino = _dir_cache(nombre, data_dir)
+    tmp = f"{destino}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for col_nombre, tipo, valores, cats in columnas:
+        np.save(os.path.join(tmp, col_nombre + ".npy"), np.ascontiguousarray(valores))
+        if cats is not None:
+            np.save(os.path.join(tmp, col_nombre + ".cats.npy"), cats)
+    _escribir_manifiesto(tmp, {
+        "version": VERSION_CACHE,
+        "fuentes": huellas,
+        "filas": int(len(columnas[0][2])) if columnas else 0,
+        "columnas": [{"nombre": c[0], "tipo": c[1]} for c in columnas],
+    })
+    viejo = f"{destino}.old-{os.getpid()}"
+    if os.path.isdir(destino):
+        os.rename(destino, viejo)
+    os.rename(tmp, destino)
+    shutil.rmtree(viejo, ignore_errors=True)
+
+def _persistir(nombre, columnas, huellas, data_dir):
+    # Guarda y devuelve la versión mapeada; si la carpeta no admite escritura
+    # (p. ej. sólo lectura) se usa la tabla en memoria con los mismos tipos.
+    try:
+        _guardar_columnas(nombre, columnas, huellas, data_dir)
+        directorio = _dir_cache(nombre, data_dir)
+        return _armar(_cargar_columnas(directorio, _leer_manifiesto(directorio)))
+    except OSError:
+        return _armar(columnas)
+
+def guardar_cache(nombre, df, huellas, data_dir=None, esquema=None):
+    """Persiste `df` como caché columnar ligada a las huellas de sus CSV fuente y la devuelve mapeada."""
+    data_dir = data_dir or DATA_DIR
+    return _persistir(nombre, _codificar(df, esquema or {}), huellas, data_dir)
+
+# ---- Anexar filas sin reconstruir (ingesta incremental) ----
+def _cabecera_npy(f):
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        return (version,) + np.lib.format.read_array_header_1_0(f)
+    return (version,) + np.lib.format.read_array_header_2_0(f)
+
+def _anexar_npy(ruta, valores):
+    # Escribe las filas nuevas al final del .npy y actualiza la forma en la
+    # cabecera (NumPy la deja con relleno para crecer sin moverla de lugar).
+    with open(ruta, "r+b") as f:
+        version, shape, fortran, dtype = _cabecera_npy(f)
+        largo_cabecera = f.tell()
+        valores = np.ascontiguousarray(valores, dtype=dtype)
+        cabecera = io.BytesIO()
+        escribir = (np.lib.format.write_array_header_1_0 if version == (1, 0)
+                    else np.lib.format.write_array_header_2_0)
+        escribir(cabecera, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": fortran,
+                            "shape": (shape[0] + len(valores),)})
+        if len(cabecera.getvalue()) != largo_cabecera:
+            raise ValueError("la cabecera del .npy no admite crecer en su lugar")
+        f.seek(0, os.SEEK_END)
+        f.write(valores.tobytes())
+        f.seek(0)
+        f.write(cabecera.getvalue())
+
+def anexar_cache(nombre, df_nuevo, huellas, data_dir=None):
+    """Agrega filas al final de una caché y la liga a las nuevas huellas de sus CSV.
+
+    Devuelve False si no se pudo (caché ausente, tipos incompatibles...); en ese
+    caso la caché queda vencida y se reconstruye sola en la próxima carga.
+    """
+    data_dir = data_dir or DATA_DIR
+    directorio = _dir_cache(nombre, data_dir)
+    manifiesto = _leer_manifiesto(directorio)
+    if manifiesto is None or sorted(manifiesto.get("fuentes", {})) != sorted(huellas):
+        return False
+    try:
+        # primero se preparan todas las columnas; sólo después se escribe
+        preparadas = []
+        for col in manifiesto["columnas"]:
+            nombre_col, tipo = col["nombre"], col["tipo"]
+            ruta = os.path.join(directorio, nombre_col + ".npy")
+            serie = df_nuevo[nombre_col]
+            cats_nuevas = None
+            if tipo in ("category", "texto"):
+                cats = np.load(os.path.join(directorio, nombre_col + ".cats.npy")).tolist()
+                posicion = {c: i for i, c in enumerate(cats)}
+                extra = [v for v in pd.unique(serie.dropna().astype(str)) if v not in posicion]
+                for v in extra:
+                    posicion[v] = len(posicion)
+                with open(ruta, "rb") as f:
+                    dtype_codigos = _cabecera_npy(f)[3]
+                if len(posicion) >= np.iinfo(dtype_codigos).max:
+                    return False
+                valores = np.array([posicion[str(v)] if pd.notna(v) else -1 for v in serie], dtype=np.int64)
+                if extra:
+                    cats_nuevas = np.array(cats + extra, dtype=str)
+            elif tipo == "fecha":
+                valores = pd.to_datetime(serie, errors="coerce").to_numpy(dtype="datetime64[ns]")
+            else:
+                if serie.isna().any() and np.dtype(tipo).kind in "iu":
+                    return False
+                valores = serie.to_numpy(dtype=tipo)
+            preparadas.append((ruta, nombre_col, valores, cats_nuevas))
+        for ruta, nombre_col, valores, cats_nuevas in preparadas:
+            if cats_nuevas is not None:
+                np.save(os.path.join(directorio, nombre_col + ".cats.npy"), cats_nuevas)
+            _anexar_npy(ruta, valores)
+    except (OSError, ValueError, KeyError):
+        shutil.rmtree(directorio, ignore_errors=True)
+        return False
+    manifiesto["filas"] += len(df_nuevo)
+    manifiesto["fuentes"] = huellas
+    _escribir_manifiesto(directorio, manifiesto)
+    return True
+
+# ---- Objetos derivados (agregados, índices) ----
+def leer_objeto(nombre, fuentes, data_dir=None):
+    """Objeto Python guardado con guardar_objeto, o None si sus CSV cambiaron."""
+    vigente = _manifiesto_vigente(nombre, fuentes, data_dir or DATA_DIR)
+    if vigente is None:
+        return None
+    try:
+        with open(os.path.join(vigente[0], "objeto.pkl"), "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+def guardar_objeto(nombre, obj, huellas, data_dir=None):
+    """Persiste un objeto derivado ligado a las huellas de sus CSV fuente."""
+    directorio = _dir_cache(nombre, data_dir or DATA_DIR)
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        tmp = os.path.join(directorio, f"objeto.pkl.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, os.path.join(directorio, "objeto.pkl"))
+        _escribir_manifiesto(directorio, {"version": VERSION_CACHE, "fuentes": huellas, "filas": 0, "columnas": []})
+    except OSError:
+        pass
+
+# ---- API pública ----
+def cargar_tabla(nombre, data_dir=None, usar_cache=True):
+    """Carga Data/<nombre>.csv con tipos explícitos, usando la caché si está vigente."""
+    data_dir = data_dir or DATA_DIR
+    archivo = nombre + ".csv"
+    if usar_cache:
+        df = leer_cache(nombre, [archivo], data_dir)
+        if df is not None:
+            return df
+    huellas = huellas_fuentes([archivo], data_dir)
+    columnas = _leer_csv(os.path.join(data_dir, archivo), ESQUEMAS.get(nombre, {}))
+    if usar_cache:
+        return _persistir(nombre, columnas, huellas, data_dir)
+    return _armar(columnas)
+
+def cargar_datos(data_dir=None):
+    """Tablas base de los análisis: (races, results, drivers, circuits)."""
+    return tuple(cargar_tabla(n, data_dir) for n in ("races", "results", "drivers", "circuits"))
@@ -0,0 +1,131 @@
+# ==============================
+# RATING ELO DE PILOTOS
+# ==============================
+# Una sola pasada cronológica (carreras por races.date) sobre la tabla de
+# hechos. En cada carrera los pilotos que tomaron la salida se comparan por
+# parejas: el que terminó delante gana el duelo. La actualización de cada
+# carrera es vectorizada sobre la matriz n × n de resultados y esperados:
+#     E_ij = 1 / (1 + 10^((r_j − r_i) / 400))
+#     Δr_i = K · Σ_j (S_ij − E_ij) / nº de rivales de i
+# (S_ij = 1 si i terminó delante de j). Con solo_companeros sólo cuentan los
+# duelos dentro del mismo equipo.
+#
+# El estado (rating actual de cada piloto, carreras procesadas e historial)
+# se guarda como objeto junto a la caché; anexar() sigue desde ahí con las
+# carreras nuevas sin volver a recorrer la historia.
+import numpy as np
+import pandas as pd
+
+from .datos import guardar_objeto, huellas_fuentes, leer_objeto
+from .hechos import CARRERA, FUENTES as FUENTES_HECHOS
+
+FUENTES = list(FUENTES_HECHOS)
+MODOS = {"todos": False, "companeros": True}   # modo -> solo_companeros
+K = 32.0
+INICIAL = 1500.0
+
+class MotorElo:
+    def __init__(self, solo_companeros=False, k=K, inicial=INICIAL):
+        self.solo_companeros = solo_companeros
+        self.k, self.inicial = k, inicial
+        self.ids = np.empty(0, dtype=np.int64)       # driverId de cada posición de `rating`
+        self.rating = np.empty(0, dtype=np.float64)
+        self.procesadas = set()                      # raceId ya procesados
+        self.ultima_fecha = None
+        self.historial = pd.DataFrame()              # una fila por (carrera, piloto)
+
+    @staticmethod
+    def lote(hechos):
+        """Carreras (sin sprints) de los pilotos que tomaron la salida, en orden cronológico."""
+        df = hechos[(hechos["sesion"].to_numpy() == CARRERA) & hechos["salio"].to_numpy()]
+        df = df.sort_values(["date", "raceId", "positionOrder"], kind="mergesort")
+        return df.drop_duplicates(["raceId", "driverId"], keep="first")
+
+    def _indices(self, driver_ids):
+        # posición de cada piloto en self.rating; los nuevos entran con el rating inicial
+        nuevos = np.setdiff1d(driver_ids, self.ids)
+        if len(nuevos):
+            ids = np.concatenate([self.ids, nuevos])
+            orden = np.argsort(ids, kind="stable")
+            self.ids = ids[orden]
+            self.rating = np.concatenate([self.rating, np.full(len(nuevos), self.inicial)])[orden]
+        return np.searchsorted(self.ids, driver_ids)
+
+    # ---- Actualización ----
+    def anexar(self, hechos):
+        """Procesa en orden las carreras nuevas de `hechos`; False si alguna es anterior a la última."""
+        df = self.lote(hechos)
+        df = df[~df["raceId"].isin(self.procesadas)]
+        if df.empty:
+            return True
+        fechas = df["date"].to_numpy()
+        if self.ultima_fecha is not None and fechas[0] < self.ultima_fecha:
+            return False
+
+        idx = self._indices(df["driverId"].to_numpy(np.int64))
+        pos = df["positionOrder"].to_numpy(np.float64)
+        equipo = df["constructorId"].to_numpy(np.int64)
+        rid = df["raceId"].to_numpy(np.int64)
+        limites = np.concatenate(([0], np.flatnonzero(rid[1:] != rid[:-1]) + 1, [len(rid)]))
+        previo, posterior = np.empty(len(df)), np.empty(len(df))
+        rivales = np.zeros(len(df), dtype=np.int64)
+        for ini, fin in zip(limites[:-1], limites[1:]):
+            i, p = idx[ini:fin], pos[ini:fin]
+            r = self.rating[i]
+            previo[ini:fin] = r
+            validos = ~np.eye(fin - ini, dtype=bool)
+            if self.solo_companeros:
+                e = equipo[ini:fin]
+                validos &= e[:, None] == e[None, :]
+            S = (p[:, None] < p[None, :]) + 0.5 * (p[:, None] == p[None, :])
+            E = 1.0 / (1.0 + 10.0 ** ((r[None, :] - r[:, None]) / 400.0))
+            n = validos.sum(axis=1)
+            self.rating[i] = r + self.k * np.where(validos, S - E, 0.0).sum(axis=1) / np.maximum(n, 1)
+            posterior[ini:fin] = self.rating[i]
+            rivales[ini:fin] = n
+
+        nuevo = pd.DataFrame({
+            "raceId": rid, "year": df["year"].to_numpy(), "round": df["round"].to_numpy(), "date": fechas,
+            "driverId": df["driverId"].to_numpy(np.int64), "rivales": rivales,
+            "rating_previo": previo, "rating": posterior,
+        })
+        self.historial = pd.concat([self.historial, nuevo], ignore_index=True) if len(self.historial) else nuevo
+        self.procesadas.update(int(r) for r in np.unique(rid))
+        self.ultima_fecha = fechas[-1]
+        return True
+
+    # ---- Consultas ----
+    def clasificacion(self, hasta=None, min_carreras=1):
+        """Por piloto (hasta el año `hasta`): rating final, pico, año del pico y carreras con duelos."""
+        h = self.historial
+        if hasta is not None:
+            h = h[h["year"].to_numpy() <= int(hasta)]
+        h = h[h["rivales"].to_numpy() > 0]
+        g = h.groupby("driverId")
+        picos = h.sort_values("rating", kind="mergesort").drop_duplicates("driverId", keep="last")
+        picos = picos.set_index("driverId")
+        tabla = pd.DataFrame({
+            "rating": g["rating"].last(), "pico": picos["rating"], "anio_pico": picos["year"],
+            "carreras": g.size(), "ultima": g["year"].last(),
+        })
+        return tabla[tabla["carreras"] >= int(min_carreras)]
+
+    def progresion(self, driver_ids, hasta=None):
+        """Rating tras cada carrera de los pilotos `driver_ids` (fecha, driverId, rating)."""
+        h = self.historial
+        if hasta is not None:
+            h = h[h["year"].to_numpy() <= int(hasta)]
+        h = h[h["driverId"].isin(np.asarray(driver_ids, dtype=np.int64)) & (h["rivales"].to_numpy() > 0)]
+        return h[["date", "driverId", "rating"]].reset_index(drop=True)
+
+def cargar_elo(hechos, modo="todos", data_dir=None):
+    """Rating Elo (`modo`: "todos" o "companeros") desde la caché; si algún CSV cambió se recalcula."""
+    nombre = f"elo_{modo}"
+    motor = leer_objeto(nombre, FUENTES, data_dir)
+    if motor is not None:
+        return motor
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    motor = MotorElo(MODOS[modo])
+    motor.anexar(hechos)
+    guardar_objeto(nombre, motor, huellas, data_dir)
+    return motor
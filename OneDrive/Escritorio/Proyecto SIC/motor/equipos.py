@@ -0,0 +1,107 @@
+# ==============================
+# EQUIPOS: TEMPORADAS, COMPAÑEROS Y COCHE vs PILOTO
+# ==============================
+# Todo sale de la tabla de hechos (una fila por coche y sesión), de
+# constructor_results.csv y del índice del campeonato de constructores:
+#   - temporadas: puntos, posición en el campeonato, GP, victorias, podios y
+#     posición media de cada equipo en cada año (los puntos son la suma de
+#     constructor_results, sin los descartes de "mejores N resultados" de los
+#     años 50-70; la posición es la oficial)
+#   - compañeros: cada pareja de pilotos de un mismo equipo en una misma
+#     carrera (bloques carrera × equipo, como la matriz H2H con
+#     solo_companeros) sumada por temporada, equipo y pareja
+#   - coche vs piloto: la posición de cada coche se parte en "coche" (posición
+#     media de sus compañeros en esa carrera) + "piloto" (lo que terminó por
+#     delante o por detrás de ellos). Sólo cuentan las carreras en que el
+#     equipo llevó dos o más coches; valores negativos = mejor posición.
+import numpy as np
+import pandas as pd
+
+from .h2h import parejas_por_bloque
+from .hechos import CARRERA, clave_sesion, seleccionar
+
+def _por_coche(hechos, desde, hasta, sesion):
+    # un piloto puede figurar dos veces en carreras antiguas (coche compartido):
+    # se queda su mejor resultado; filas agrupadas por sesión y equipo
+    df = seleccionar(hechos, desde, hasta, sesion)
+    df = df.sort_values(["raceId", "sesion", "constructorId", "positionOrder"], kind="mergesort")
+    return df[~df.duplicated(["raceId", "sesion", "driverId"]).to_numpy()]
+
+def _clave_equipo(df):
+    return clave_sesion(df) * 2**16 + df["constructorId"].to_numpy(np.int64)
+
+# ---- Temporadas por equipo ----
+def temporadas_equipos(hechos, dfConstructorResults, dfRaces, campeonato, desde=None, hasta=None):
+    """Por año y equipo: puntos, posición final, GP, victorias, podios y posición media."""
+    carreras = seleccionar(hechos, desde, hasta)
+    pos = carreras["positionOrder"].to_numpy()
+    tabla = carreras.assign(victoria=pos == 1, podio=pos <= 3).groupby(
+        ["year", "constructorId"], observed=True).agg(
+        gp=("raceId", "nunique"),
+        victorias=("victoria", "sum"),
+        podios=("podio", "sum"),
+        pos_media=("positionOrder", "mean"),
+        mejor=("positionOrder", "min"),
+    )
+    # constructor_results ya suma los puntos del sprint a los de su GP
+    cr = dfConstructorResults[["raceId", "constructorId", "points"]].merge(
+        dfRaces[["raceId", "year"]], on="raceId", how="inner")
+    cr = seleccionar(cr.sort_values("year", kind="mergesort"), desde, hasta)
+    puntos = cr.groupby(["year", "constructorId"])["points"].sum()
+    tabla["puntos"] = puntos.reindex(tabla.index).fillna(0.0)
+
+    finales = campeonato.finales().set_index(["year", campeonato.columna_id])["posicion"]
+    tabla["posicion"] = finales.reindex(tabla.index).astype("Int64")  # antes de 1958 no hubo campeonato
+    tabla = tabla.reset_index()
+    return tabla.sort_values(["year", "posicion", "puntos"], ascending=[True, True, False],
+                             na_position="last").reset_index(drop=True)
+
+# ---- Compañeros de equipo ----
+def duelos_companeros(hechos, desde=None, hasta=None, sesion=CARRERA):
+    """Por año, equipo y pareja (A < B por driverId): carreras juntos, veces delante y deltas A − B."""
+    df = _por_coche(hechos, desde, hasta, sesion)
+    I, J = parejas_por_bloque(_clave_equipo(df))   # I terminó por delante de J
+    d = df["driverId"].to_numpy(np.int64)
+    pos = df["positionOrder"].to_numpy(np.float64)
+    pts = df["points"].fillna(0).to_numpy(np.float64)
+    a_es_i = d[I] < d[J]
+    signo = np.where(a_es_i, 1.0, -1.0)
+    pares = pd.DataFrame({
+        "year": df["year"].to_numpy()[I], "constructorId": df["constructorId"].to_numpy()[I],
+        "driverA": np.minimum(d[I], d[J]), "driverB": np.maximum(d[I], d[J]),
+        "delante_A": a_es_i, "delta_pos": (pos[I] - pos[J]) * signo, "delta_pts": (pts[I] - pts[J]) * signo,
+    })
+    tabla = pares.groupby(["year", "constructorId", "driverA", "driverB"]).agg(
+        carreras=("delante_A", "size"),
+        delante_A=("delante_A", "sum"),
+        delta_pos_medio=("delta_pos", "mean"),
+        delta_puntos=("delta_pts", "sum"),
+    ).reset_index()
+    tabla.insert(6, "delante_B", tabla["carreras"] - tabla["delante_A"])
+    return tabla
+
+# ---- Coche vs piloto ----
+def coche_piloto(hechos, desde=None, hasta=None, sesion=CARRERA):
+    """Por resultado: posición = coche (media de sus compañeros en esa carrera) + piloto."""
+    df = _por_coche(hechos, desde, hasta, sesion)
+    _, g = np.unique(_clave_equipo(df), return_inverse=True)
+    pos = df["positionOrder"].to_numpy(np.float64)
+    suma, n = np.bincount(g, weights=pos), np.bincount(g)
+    n_coches = n[g]
+    con_companero = n_coches > 1
+    coche = (suma[g] - pos)[con_companero] / (n_coches[con_companero] - 1)
+    filas = df[con_companero]
+    return pd.DataFrame({
+        "year": filas["year"].to_numpy(), "raceId": filas["raceId"].to_numpy(),
+        "constructorId": filas["constructorId"].to_numpy(), "driverId": filas["driverId"].to_numpy(),
+        "pos": pos[con_companero], "coche": coche, "piloto": pos[con_companero] - coche,
+    })
+
+def resumen_coche_piloto(filas, por="driverId"):
+    """Media de posición y aportes del coche y del piloto por `por` (pos_media = coche + piloto)."""
+    return filas.groupby(por).agg(
+        carreras=("raceId", "size"),
+        pos_media=("pos", "mean"),
+        aporte_coche=("coche", "mean"),
+        aporte_piloto=("piloto", "mean"),
+    )
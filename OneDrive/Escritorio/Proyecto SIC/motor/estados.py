@@ -0,0 +1,69 @@
+# ==============================
+# TABLA DE CÓDIGOS DE ESTADO (status.csv)
+# ==============================
+# Cada statusId de Ergast se reduce a una categoría entera (int8) y a si el
+# piloto llegó a tomar la salida. La tabla se arma una vez desde status.csv y
+# la tabla de hechos guarda el código de cada resultado: los análisis de
+# fiabilidad cuentan con bincount sin tocar ningún texto.
+import re
+
+import numpy as np
+import pandas as pd
+
+CATEGORIAS = ("terminado", "doblado", "mecanica", "accidente", "otro")
+TERMINADO, DOBLADO, MECANICA, ACCIDENTE, OTRO = range(len(CATEGORIAS))
+
+ACCIDENTES = {"Accident", "Collision", "Collision damage", "Spun off", "Fatal accident", "Damage", "Debris"}
+# no imputables al coche: reglamento, salud del piloto, combustible/estrategia
+OTROS = {
+    "Disqualified", "Excluded", "Underweight", "Retired", "Not classified", "Not restarted",
+    "Withdrew", "Did not qualify", "Did not prequalify", "107% Rule",
+    "Driver unwell", "Physical", "Illness", "Injured", "Injury", "Eye injury",
+    "Safety", "Safety concerns", "Out of fuel", "Refuelling", "Fuel rig", "Stalled",
+}
+# en results.csv pero sin llegar a tomar la salida
+SIN_SALIDA = {"Did not qualify", "Did not prequalify", "107% Rule", "Withdrew"}
+DOBLADO_RE = re.compile(r"^\+\d+ Laps?$", re.IGNORECASE)
+
+def categoria_estado(texto):
+    """Categoría de un texto de status.csv (lo que no es final, vuelta, accidente u otro es mecánica)."""
+    texto = str(texto).strip()
+    if texto == "Finished":
+        return TERMINADO
+    if DOBLADO_RE.match(texto):
+        return DOBLADO
+    if texto in ACCIDENTES:
+        return ACCIDENTE
+    if texto in OTROS:
+        return OTRO
+    return MECANICA
+
+def tabla_estados(dfStatus):
+    """statusId, status, categoria y salio de cada estado."""
+    texto = dfStatus["status"].astype(str).str.strip()
+    codigo = np.array([categoria_estado(t) for t in texto], dtype=np.int8)
+    return pd.DataFrame({
+        "statusId": dfStatus["statusId"].to_numpy(np.int64), "status": texto.to_numpy(),
+        "categoria": pd.Categorical.from_codes(codigo, CATEGORIAS),
+        "salio": ~texto.isin(SIN_SALIDA).to_numpy(),
+    })
+
+def codigos_estado(dfStatus):
+    """(categoría, salio) como arrays indexados por statusId."""
+    tabla = tabla_estados(dfStatus)
+    ids = tabla["statusId"].to_numpy()
+    n = int(ids.max()) + 1 if len(ids) else 1
+    categoria = np.full(n, OTRO, dtype=np.int8)
+    salio = np.ones(n, dtype=bool)
+    categoria[ids] = tabla["categoria"].cat.codes.to_numpy(np.int8)
+    salio[ids] = tabla["salio"].to_numpy()
+    return categoria, salio
+
+def codificar(status_ids, codigos):
+    """Código de categoría y salio de cada statusId (los desconocidos son "otro")."""
+    categoria, salio = codigos
+    st = np.asarray(status_ids, dtype=np.int64)
+    conocido = (st >= 0) & (st < len(categoria))
+    i = np.where(conocido, st, 0)
+    return (np.where(conocido, categoria[i], OTRO).astype(np.int8),
+            np.where(conocido, salio[i], True))
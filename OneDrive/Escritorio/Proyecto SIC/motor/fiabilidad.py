@@ -0,0 +1,43 @@
+# ==============================
+# FIABILIDAD: ABANDONOS POR CATEGORÍA
+# ==============================
+# La tabla de hechos trae el código de categoría de cada resultado (columna
+# "estado", ver motor/estados.py) y si el piloto tomó la salida. Las tasas por
+# equipo, temporada, circuito o piloto son un solo bincount sobre
+# (id del grupo × nº de categorías + código): sin groupby de texto ni merges.
+import numpy as np
+import pandas as pd
+
+from .estados import ACCIDENTE, CATEGORIAS, DOBLADO, MECANICA, OTRO
+from .hechos import CARRERA, seleccionar
+
+DIMENSIONES = ("constructorId", "year", "circuitId", "driverId")
+
+def conteo_estados(hechos, por, desde=None, hasta=None, sesion=CARRERA):
+    """Salidas por grupo (`por`) y categoría de estado final: filas = ids, columnas = CATEGORIAS."""
+    if por not in DIMENSIONES:
+        raise ValueError(f"No se puede agrupar por {por}.")
+    h = seleccionar(hechos, desde, hasta, sesion)
+    h = h[h["salio"].to_numpy()]
+    ids = h[por].to_numpy(np.int64)
+    k = len(CATEGORIAS)
+    n = int(ids.max()) + 1 if len(ids) else 0
+    conteo = np.bincount(ids * k + h["estado"].to_numpy(np.int64), minlength=n * k).reshape(n, k)
+    presentes = np.flatnonzero(conteo.sum(axis=1))
+    tabla = pd.DataFrame(conteo[presentes], index=pd.Index(presentes, name=por), columns=list(CATEGORIAS))
+    return tabla
+
+def tasas_abandono(hechos, por, desde=None, hasta=None, min_salidas=1, sesion=CARRERA):
+    """% de salidas terminadas y de abandonos (total, mecánicos, por accidente y otros) por grupo."""
+    conteo = conteo_estados(hechos, por, desde, hasta, sesion)
+    salidas = conteo.sum(axis=1)
+    c = conteo.to_numpy()
+    tabla = pd.DataFrame({
+        "salidas": salidas,
+        "terminado_pct": c[:, :DOBLADO + 1].sum(axis=1) / salidas * 100,
+        "abandono_pct": c[:, MECANICA:].sum(axis=1) / salidas * 100,
+        "mecanica_pct": c[:, MECANICA] / salidas * 100,
+        "accidente_pct": c[:, ACCIDENTE] / salidas * 100,
+        "otro_pct": c[:, OTRO] / salidas * 100,
+    }, index=conteo.index)
+    return tabla[tabla["salidas"] >= int(min_salidas)]
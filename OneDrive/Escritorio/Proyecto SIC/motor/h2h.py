@@ -0,0 +1,207 @@
+# ==============================
+# MOTOR HEAD-TO-HEAD
+# ==============================
+# MatrizH2H: todas las parejas piloto × piloto de una temporada/era en una
+# sola pasada sobre la tabla de hechos. Para cada carrera las filas ya están
+# ordenadas por posición, así que cada pareja (i, j) con i < j dentro del
+# bloque es "i terminó por delante de j"; las parejas se generan por tamaño
+# de bloque con triu_indices y se acumulan con bincount (sin pivot_table).
+# serie_par: carreras comunes de dos pilotos con arrays ordenados.
+# Con sprints (sesion="todas") cada sesión de un GP es un bloque aparte.
+import numpy as np
+import pandas as pd
+
+from .hechos import CARRERA, clave_sesion, seleccionar
+
+def _unicos_por_carrera(df):
+    # un piloto puede figurar dos veces en carreras antiguas (coche compartido):
+    # se queda su mejor resultado, que es la primera fila del bloque
+    repetido = pd.DataFrame({"s": clave_sesion(df), "d": df["driverId"].to_numpy()}).duplicated()
+    return df[~repetido.to_numpy()]
+
+def _bloques(claves):
+    # inicio y tamaño de cada bloque de claves iguales consecutivas
+    if len(claves) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    cortes = np.flatnonzero(claves[1:] != claves[:-1]) + 1
+    inicios = np.concatenate(([0], cortes))
+    tamanos = np.diff(np.concatenate((inicios, [len(claves)])))
+    return inicios, tamanos
+
+def parejas_por_bloque(claves):
+    """Índices (i, j), i < j, de todas las parejas de filas dentro de cada bloque."""
+    inicios, tamanos = _bloques(claves)
+    I, J = [], []
+    for k in np.unique(tamanos[tamanos > 1]):
+        s = inicios[tamanos == k]
+        ti, tj = np.triu_indices(k, 1)
+        I.append((s[:, None] + ti).ravel())
+        J.append((s[:, None] + tj).ravel())
+    if not I:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(I), np.concatenate(J)
+
+class MatrizH2H:
+    """Victorias/derrotas/empates, delta de posición y de puntos para todas las parejas."""
+
+    def __init__(self, ids):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self._pos = {int(d): k for k, d in enumerate(self.ids)}
+        n = len(self.ids)
+        self.victorias = np.zeros((n, n), dtype=np.int32)   # [a, b]: a terminó delante de b
+        self.empates = np.zeros((n, n), dtype=np.int32)
+        self.comunes = np.zeros((n, n), dtype=np.int32)
+        self.suma_delta_pos = np.zeros((n, n), dtype=np.float64)  # Σ (pos_a - pos_b)
+        self.suma_delta_pts = np.zeros((n, n), dtype=np.float64)  # Σ (pts_a - pts_b)
+
+    @classmethod
+    def desde_hechos(cls, hechos, desde=None, hasta=None, solo_companeros=False, sesion=CARRERA):
+        """Matriz de la era [desde, hasta]; con solo_companeros sólo cuenta compañeros de equipo."""
+        df = seleccionar(hechos, desde, hasta, sesion)
+        m = cls(np.unique(df["driverId"].to_numpy()))
+        m.acumular(df, solo_companeros=solo_companeros)
+        return m
+
+    def _ampliar(self, nuevos_ids):
+        # agrega pilotos nuevos (p. ej. un debutante en una carrera ingerida)
+        nuevos = np.setdiff1d(np.asarray(nuevos_ids, dtype=np.int64), self.ids)
+        if nuevos.size == 0:
+            return
+        viejo = self.ids
+        ids = np.union1d(viejo, nuevos)
+        idx = np.searchsorted(ids, viejo)
+        n = len(ids)
+        for nombre in ("victorias", "empates", "comunes", "suma_delta_pos", "suma_delta_pts"):
+            antes = getattr(self, nombre)
+            nueva = np.zeros((n, n), dtype=antes.dtype)
+            nueva[np.ix_(idx, idx)] = antes
+            setattr(self, nombre, nueva)
+        self.ids = ids
+        self._pos = {int(d): k for k, d in enumerate(ids)}
+
+    def acumular(self, df, solo_companeros=False):
+        """Suma a la matriz las carreras de `df` (filas de la tabla de hechos)."""
+        bloque = ["raceId", "sesion"] if "sesion" in df.columns else ["raceId"]
+        df = _unicos_por_carrera(df.sort_values(bloque + ["positionOrder"], kind="mergesort"))
+        self._ampliar(df["driverId"].unique())
+        if solo_companeros:
+            df = df.sort_values(bloque + ["constructorId", "positionOrder"], kind="mergesort")
+            claves = clave_sesion(df) * 100_000 + df["constructorId"].to_numpy(np.int64)
+        else:
+            claves = clave_sesion(df)
+        I, J = parejas_por_bloque(claves)
+        if I.size == 0:
+            return
+        idx = np.searchsorted(self.ids, df["driverId"].to_numpy(np.int64))
+        pos = df["positionOrder"].to_numpy(np.float64)
+        pts = df["points"].fillna(0).to_numpy(np.float64)
+        a, b = idx[I], idx[J]
+        pa, pb = pos[I], pos[J]
+        n = len(self.ids)
+        ab, ba = a * n + b, b * n + a
+
+        def suma(flat, pesos=None):
+            return np.bincount(flat, weights=pesos, minlength=n * n).reshape(n, n)
+
+        uno = np.ones(len(a))
+        self.comunes += (suma(ab, uno) + suma(ba, uno)).astype(np.int32)
+        self.victorias += (suma(ab, (pa < pb).astype(float)) + suma(ba, (pb < pa).astype(float))).astype(np.int32)
+        empate = (pa == pb).astype(float)
+        self.empates += (suma(ab, empate) + suma(ba, empate)).astype(np.int32)
+        self.suma_delta_pos += suma(ab, pa - pb) - suma(ba, pa - pb)
+        self.suma_delta_pts += suma(ab, pts[I] - pts[J]) - suma(ba, pts[I] - pts[J])
+
+    # ---- consultas ----
+    def par(self, a_id, b_id):
+        """Lectura O(1) del cara a cara de a contra b."""
+        a, b = self._pos.get(int(a_id)), self._pos.get(int(b_id))
+        if a is None or b is None or self.comunes[a, b] == 0:
+            return None
+        n = int(self.comunes[a, b])
+        return {
+            "carreras": n,
+            "victorias_a": int(self.victorias[a, b]),
+            "victorias_b": int(self.victorias[b, a]),
+            "empates": int(self.empates[a, b]),
+            "delta_pos_medio": self.suma_delta_pos[a, b] / n,
+            "delta_puntos": self.suma_delta_pts[a, b],
+        }
+
+    def _largo(self, a, b):
+        n = self.comunes[a, b]
+        return pd.DataFrame({
+            "driverId_A": self.ids[a], "driverId_B": self.ids[b],
+            "carreras": n,
+            "victorias_A": self.victorias[a, b], "victorias_B": self.victorias[b, a],
+            "empates": self.empates[a, b],
+            "delta_pos_medio": self.suma_delta_pos[a, b] / n,
+            "delta_puntos": self.suma_delta_pts[a, b],
+        })
+
+    def rivales(self, a_id):
+        """Todos los rivales de un piloto (una fila por rival con carreras en común)."""
+        a = self._pos.get(int(a_id))
+        b = np.flatnonzero(self.comunes[a] > 0) if a is not None else np.empty(0, dtype=np.int64)
+        return self._largo(np.full(len(b), a if a is not None else 0), b)
+
+    def a_dataframe(self, min_carreras=1):
+        """Matriz en formato largo: una fila por pareja ordenada (A, B)."""
+        a, b = np.nonzero(self.comunes >= max(1, min_carreras))
+        return self._largo(a, b)
+
+    def exportar(self, ruta, min_carreras=1, refs=None):
+        """Escribe la matriz completa: .npz (matrices densas) o CSV en formato largo."""
+        if str(ruta).lower().endswith(".npz"):
+            np.savez_compressed(ruta, ids=self.ids, victorias=self.victorias, empates=self.empates,
+                                comunes=self.comunes, suma_delta_pos=self.suma_delta_pos,
+                                suma_delta_pts=self.suma_delta_pts)
+            return
+        df = self.a_dataframe(min_carreras)
+        if refs is not None:
+            df.insert(1, "piloto_A", df["driverId_A"].map(refs))
+            df.insert(3, "piloto_B", df["driverId_B"].map(refs))
+        df.to_csv(ruta, index=False)
+
+# ---- Serie de un par de pilotos ----
+def serie_par(hechos, a_id, b_id, desde=None, hasta=None, sesion=CARRERA):
+    """Carreras (o sesiones) comunes de A y B en orden cronológico (una fila por sesión)."""
+    # primero la vista de años y el piloto; la sesión se filtra sobre sus pocas filas
+    df = seleccionar(hechos, desde, hasta, sesion=None)
+    ids = df["driverId"].to_numpy()
+    A = _unicos_por_carrera(seleccionar(df[ids == a_id], sesion=sesion))
+    B = _unicos_por_carrera(seleccionar(df[ids == b_id], sesion=sesion))
+    _, ia, ib = np.intersect1d(clave_sesion(A), clave_sesion(B), assume_unique=True, return_indices=True)
+    orden = np.argsort(ia, kind="stable")  # las filas de A ya son cronológicas
+    ia, ib = ia[orden], ib[orden]
+    A, B = A.iloc[ia], B.iloc[ib]
+    return pd.DataFrame({
+        "raceId": A["raceId"].to_numpy(), "year": A["year"].to_numpy(),
+        "round": A["round"].to_numpy(), "name": A["name"].to_numpy(), "date": A["date"].to_numpy(),
+        "sesion": A["sesion"].to_numpy() if "sesion" in A.columns else np.full(len(A), CARRERA, dtype=np.int8),
+        "posA": A["positionOrder"].to_numpy(np.float64), "posB": B["positionOrder"].to_numpy(np.float64),
+        "gridA": A["grid_ajustado"].to_numpy(np.float64), "gridB": B["grid_ajustado"].to_numpy(np.float64),
+        "ptsA": A["points"].fillna(0).to_numpy(), "ptsB": B["points"].fillna(0).to_numpy(),
+    })
+
+def resumen_par(serie, A_name, B_name):
+    """Tabla resumen H2H de dos pilotos a partir de su serie de carreras comunes."""
+    posA, posB = serie["posA"], serie["posB"]
+    winsA = int((posA < posB).sum())
+    winsB = int((posB < posA).sum())
+    ties = int((posA == posB).sum())
+    n_gp = len(serie)
+    return pd.DataFrame({
+        "Piloto": [A_name, B_name],
+        "Victorias H2H": [winsA, winsB],
+        "Empates": [ties, ties],
+        "Carreras juntos": [n_gp, n_gp],
+        "Promedio Pos. Final": [posA.mean(), posB.mean()],
+        "Mediana Pos. Final": [posA.median(), posB.median()],
+        "Promedio Parrilla": [serie["gridA"].mean(), serie["gridB"].mean()],
+        "Puntos Totales (H2H)": [serie["ptsA"].sum(), serie["ptsB"].sum()],
+        "Mejor Resultado (mín)": [posA.min(), posB.min()],
+    })
+
+def diferencia_acumulada(serie):
+    """+1 si A terminó delante, -1 si B, 0 empate; acumulado carrera a carrera."""
+    return np.sign(serie["posB"].to_numpy() - serie["posA"].to_numpy()).astype(int).cumsum()
@@ -0,0 +1,103 @@
+# ==============================
+# TABLA DE HECHOS DE RESULTADOS
+# ==============================
+# results + sprint_results + races + drivers unidos UNA vez: cada fila es un
+# resultado de una sesión puntuable (columna "sesion": sprint o carrera) con
+# su año, ronda, fecha, circuito, piloto y las columnas derivadas (parrilla
+# ajustada, posiciones ganadas y categoría del estado final según
+# motor/estados.py). Se persiste junto a la caché de Data/ y los
+# análisis sólo filtran y agregan sobre ella, sin volver a hacer merges.
+#
+# Dentro de cada GP el sprint va antes que la carrera; seleccionar() filtra
+# por sesión (por defecto sólo la carrera, como antes de existir los sprints).
+import numpy as np
+import pandas as pd
+
+from .datos import anexar_cache, cargar_tabla, guardar_cache, huellas_fuentes, leer_cache
+from .estados import codificar, codigos_estado
+
+NOMBRE_CACHE = "hechos_resultados"
+FUENTES = ["results.csv", "sprint_results.csv", "races.csv", "drivers.csv", "status.csv"]
+GRID_PITLANE = 20  # grid == 0 (salida desde pit lane) se cuenta como 20
+SESIONES = ("sprint", "carrera")  # código = posición (orden cronológico dentro del GP)
+SPRINT, CARRERA = range(len(SESIONES))
+
+ESQUEMA_HECHOS = {
+    "resultId": "int32", "raceId": "int32", "year": "int16", "round": "int16",
+    "date": "fecha", "circuitId": "int16", "name": "category",
+    "driverId": "int32", "driverRef": "category", "constructorId": "int16",
+    "grid": "int16", "grid_ajustado": "int16", "positionOrder": "int16",
+    "posiciones_ganadas": "int16", "points": "float64", "statusId": "int16",
+    "estado": "int8", "salio": "bool", "sesion": "int8",
+}
+
+def construir_hechos(dfResults, dfRaces, dfDrivers, dfStatus, dfSprint=None):
+    """Une resultados (de carrera y de sprint) con carrera y piloto y agrega las columnas derivadas.
+
+    resultId se numera aparte en cada CSV: una fila se identifica por (resultId, sesion).
+    """
+    cols = ["resultId", "raceId", "driverId", "constructorId", "grid", "positionOrder", "points", "statusId"]
+    partes = [dfResults[cols].assign(sesion=np.int8(CARRERA))]
+    if dfSprint is not None:
+        partes.append(dfSprint[cols].assign(sesion=np.int8(SPRINT)))
+    df = pd.merge(pd.concat(partes, ignore_index=True),
+                  dfRaces[["raceId", "year", "round", "date", "circuitId", "name"]],
+                  on="raceId", how="left")
+    df = pd.merge(df, dfDrivers[["driverId", "driverRef"]], on="driverId", how="left")
+    df["grid_ajustado"] = df["grid"].replace(0, GRID_PITLANE)
+    df["posiciones_ganadas"] = df["grid_ajustado"] - df["positionOrder"]
+    df["estado"], df["salio"] = codificar(df["statusId"].to_numpy(), codigos_estado(dfStatus))
+    # orden cronológico: los filtros por año se resuelven con búsqueda binaria
+    df = df.sort_values(["year", "round", "raceId", "sesion", "positionOrder"], kind="mergesort")
+    return df[list(ESQUEMA_HECHOS)].reset_index(drop=True)
+
+def cargar_hechos(data_dir=None, dfResults=None, dfRaces=None, dfDrivers=None, dfStatus=None, dfSprint=None):
+    """Tabla de hechos desde la caché; se reconstruye sólo si cambió algún CSV fuente."""
+    df = leer_cache(NOMBRE_CACHE, FUENTES, data_dir)
+    if df is not None:
+        return df
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    hechos = construir_hechos(
+        dfResults if dfResults is not None else cargar_tabla("results", data_dir),
+        dfRaces if dfRaces is not None else cargar_tabla("races", data_dir),
+        dfDrivers if dfDrivers is not None else cargar_tabla("drivers", data_dir),
+        dfStatus if dfStatus is not None else cargar_tabla("status", data_dir),
+        dfSprint if dfSprint is not None else cargar_tabla("sprint_results", data_dir),
+    )
+    return guardar_cache(NOMBRE_CACHE, hechos, huellas, data_dir, ESQUEMA_HECHOS)
+
+def codigo_sesion(sesion):
+    """"carrera" / "sprint" / código -> código; None o "todas" -> None (todas las sesiones)."""
+    if sesion is None or sesion == "todas":
+        return None
+    if isinstance(sesion, str):
+        if sesion not in SESIONES:
+            raise ValueError(f"Sesión desconocida: {sesion}")
+        return SESIONES.index(sesion)
+    return int(sesion)
+
+def seleccionar(hechos, desde=None, hasta=None, sesion=CARRERA):
+    """Filas de los años [desde, hasta] (ambos opcionales) como una vista contigua.
+
+    En tablas con columna "sesion" se quedan sólo las filas de `sesion`
+    (None o "todas": sprint y carrera).
+    """
+    years = hechos["year"].to_numpy()
+    ini = 0 if desde is None else int(np.searchsorted(years, int(desde), side="left"))
+    fin = len(years) if hasta is None else int(np.searchsorted(years, int(hasta), side="right"))
+    vista = hechos.iloc[ini:fin]
+    codigo = codigo_sesion(sesion)
+    if codigo is None or "sesion" not in vista.columns:
+        return vista
+    return vista[vista["sesion"].to_numpy() == codigo]
+
+def clave_sesion(df):
+    """raceId·2 + sesión: el sprint y la carrera de un mismo GP son bloques distintos."""
+    clave = df["raceId"].to_numpy(np.int64) * len(SESIONES)
+    if "sesion" in df.columns:
+        clave = clave + df["sesion"].to_numpy(np.int64)
+    return clave
+
+def anexar_hechos(hechos_nuevos, huellas, data_dir=None):
+    """Agrega al final de la caché las filas de carreras posteriores a las ya guardadas."""
+    return anexar_cache(NOMBRE_CACHE, hechos_nuevos[list(ESQUEMA_HECHOS)], huellas, data_dir)
@@ -0,0 +1,368 @@
+# ==============================
+# INFORMES EN LOTE (SIN MENÚ NI VENTANAS)
+# ==============================
+# Expande una rejilla de parámetros (temporadas, Top N, parejas de pilotos,
+# circuitos) en tareas "análisis × combinación", las reparte entre procesos
+# y escribe cada tabla en CSV/Parquet y cada gráfico en PNG/SVG con el
+# backend Agg (Figure + FigureCanvasAgg: sin pyplot ni ventanas).
+#
+#   python main.py report --anios 2023 2024 --top 10 --pares hamilton:max_verstappen
+#   python main.py report --grid rejilla.json --salida informes/ --formatos csv png svg
+#   python -m motor.informe ...                     (mismos argumentos)
+#
+# rejilla.json usa las mismas claves que los argumentos, p. ej.
+#   {"anios": ["2020-2024"], "top": [10, 20], "pares": [["hamilton", "russell"]],
+#    "pares_companeros": true, "circuitos": ["monza", "silverstone"]}
+#
+# El proceso principal calienta las cachés (hechos, agregados, señales, Elo…)
+# antes de abrir el pool, así que cada proceso sólo abre columnas con
+# memory-map y objetos ya guardados. Las tareas van ordenadas por análisis y
+# en bloques, para que cada proceso reutilice su memo de resultados. Al final
+# se escribe indice.csv con los archivos, el tiempo y el error de cada tarea.
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.dates import AutoDateLocator, ConciseDateFormatter, date2num
+from matplotlib.figure import Figure
+
+from .analisis import SesionAnalisis
+from .lod import reducir_minmax
+
+ANALISIS = ("remontadores", "circuitos", "edades", "h2h", "clasificacion", "campeonato",
+            "previo", "fiabilidad", "equipos", "elo")
+FORMATOS = ("csv", "parquet", "png", "svg")
+REJILLA = {
+    "anios": [], "top": [10], "pares": [], "pares_companeros": False, "circuitos": [],
+    "analisis": list(ANALISIS), "formatos": ["csv", "png"], "min_carreras": 10,
+}
+TAMANO = (8, 5)   # pulgadas a 100 dpi
+TOP_LINEAS = 10   # máximo de líneas en los gráficos de progresión
+
+# ---- Rejilla -> tareas ----
+def _anios(valores):
+    # 2023, "2023" o "2020-2024"
+    anios = []
+    for v in valores:
+        desde, _, hasta = str(v).partition("-")
+        anios.extend(range(int(desde), int(hasta or desde) + 1))
+    return sorted(set(anios))
+
+def _pares(valores):
+    # "a:b" o [a, b]
+    return [tuple(p.split(":", 1)) if isinstance(p, str) else tuple(p) for p in valores]
+
+def _slug(texto):
+    return re.sub(r"[^\w.-]+", "_", str(texto)).strip("_")
+
+def _circuitos(sesion, nombres):
+    """circuitId de cada circuito pedido (circuitRef exacto o parte del nombre)."""
+    c = sesion.circuits
+    ids = {}
+    for nombre in nombres:
+        n = nombre.strip().lower()
+        fila = c[(c["circuitRef"].str.lower() == n) | c["name"].str.lower().str.contains(n, regex=False)]
+        if fila.empty:
+            raise ValueError(f"Circuito desconocido: {nombre}")
+        ids[nombre] = int(fila["circuitId"].iloc[0])
+    return ids
+
+def expandir(rejilla, sesion):
+    """Lista de tareas (análisis, nombre, parámetros), agrupadas por análisis."""
+    anios = _anios(rejilla["anios"])
+    periodos = [(a, a) for a in anios] or [(None, None)]
+    tops = [int(t) for t in rejilla["top"]] or [10]
+    min_c = int(rejilla["min_carreras"])
+    pedidos = set(rejilla["analisis"])
+    desconocidos = pedidos - set(ANALISIS)
+    if desconocidos:
+        raise ValueError(f"Análisis desconocidos: {', '.join(sorted(desconocidos))}")
+    etiqueta = lambda desde: "total" if desde is None else str(desde)
+    tareas = []
+    if "remontadores" in pedidos:
+        for anio in anios or [2000]:
+            for top in tops:
+                tareas.append(("remontadores", f"desde{anio}_top{top}", dict(anio_min=anio, min_gp=min_c, top=top)))
+    if "circuitos" in pedidos:
+        tareas += [("circuitos", f"top{top}", dict(top=top)) for top in tops]
+    if "edades" in pedidos:
+        tareas.append(("edades", "edades", {}))
+    if "h2h" in pedidos:
+        pares = {(a, b, desde, hasta) for a, b in _pares(rejilla["pares"]) for desde, hasta in periodos}
+        if rejilla["pares_companeros"]:
+            for anio in anios:
+                duelos = sesion.companeros(anio, anio, min_carreras=1)
+                pares.update((a, b, anio, anio) for a, b in zip(duelos["piloto_A"], duelos["piloto_B"]))
+        for a, b, desde, hasta in sorted(pares, key=lambda p: (str(p[2]), p[0], p[1])):
+            tareas.append(("h2h", f"{a}_vs_{b}_{etiqueta(desde)}", dict(a=a, b=b, desde=desde, hasta=hasta)))
+    if "clasificacion" in pedidos:
+        for desde, hasta in periodos:
+            for top in tops:
+                tareas.append(("clasificacion", f"{etiqueta(desde)}_top{top}",
+                               dict(desde=desde, hasta=hasta, min_q=min_c, top=top)))
+    if "campeonato" in pedidos:
+        for anio in anios or [int(sesion.races["year"].max())]:
+            for tipo in ("pilotos", "constructores"):
+                tareas.append(("campeonato", f"{tipo}_{anio}", dict(tipo=tipo, year=anio, top=min(max(tops), TOP_LINEAS))))
+    if "previo" in pedidos and rejilla["circuitos"]:
+        ids = _circuitos(sesion, rejilla["circuitos"])
+        races = sesion.races
+        for anio in anios or [int(races["year"].max())]:
+            for nombre, cid in ids.items():
+                gp = races[(races["year"] == anio) & (races["circuitId"] == cid)]
+                tareas += [("previo", f"{_slug(nombre)}_{anio}", dict(year=anio, ronda=int(r))) for r in gp["round"]]
+    if "fiabilidad" in pedidos:
+        for desde, hasta in periodos:
+            for top in tops:
+                tareas.append(("fiabilidad", f"equipos_{etiqueta(desde)}_top{top}",
+                               dict(desde=desde, hasta=hasta, min_s=min_c, top=top)))
+    if "equipos" in pedidos:
+        for desde, hasta in periodos:
+            tareas.append(("equipos", f"temporadas_{etiqueta(desde)}",
+                           dict(desde=desde, hasta=hasta, top=min(max(tops), TOP_LINEAS))))
+    if "elo" in pedidos:
+        for desde, _ in periodos:
+            for top in tops:
+                tareas.append(("elo", f"hasta{etiqueta(desde)}_top{top}", dict(hasta=desde, min_gp=min_c, top=top)))
+    return [(analisis, _slug(nombre), params) for analisis, nombre, params in tareas]
+
+def precalentar(sesion, pedidos):
+    """Construye (o valida) en disco las cachés que usarán los procesos."""
+    sesion.cargar()
+    if pedidos & {"clasificacion", "previo"}:
+        sesion.clasificacion
+    if "previo" in pedidos:
+        sesion.senales
+    if pedidos & {"campeonato", "equipos"}:
+        sesion.campeonato("pilotos"), sesion.campeonato("constructores")
+    if "elo" in pedidos:
+        sesion.elo("todos")
+
+# ---- Gráficos (Agg) ----
+def _figura():
+    fig = Figure(figsize=TAMANO, dpi=100)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(111)
+
+def _barras_h(titulo, nombres, valores, xlabel):
+    fig, ax = _figura()
+    valores = np.asarray(valores, dtype=np.float64)[::-1]
+    ax.barh(np.arange(len(valores)), valores)
+    ax.set_yticks(np.arange(len(valores)), labels=[str(n) for n in nombres][::-1])
+    ax.set_title(titulo)
+    ax.set_xlabel(xlabel)
+    ax.grid(axis="x", linestyle="--", alpha=0.6)
+    fig.tight_layout()
+    return fig
+
+def _lineas(titulo, datos, xlabel, ylabel):
+    # una línea por columna de `datos` (índice = eje x)
+    fig, ax = _figura()
+    for col in datos.columns:
+        ax.plot(datos.index, datos[col].to_numpy(), marker="o", markersize=3, label=str(col))
+    ax.set_title(titulo)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(fontsize=8)
+    ax.grid(True, linestyle="--", alpha=0.6)
+    fig.tight_layout()
+    return fig
+
+# ---- Generadores: sesión + parámetros -> (tabla, figura) ----
+def _remontadores(sesion, anio_min, min_gp, top):
+    tabla = sesion.remontadores(anio_min, min_gp)
+    t = tabla.head(top)
+    return tabla, _barras_h(f"Top {len(t)} — Promedio de posiciones ganadas (≥{anio_min})",
+                            t["driver"], t["promedio_pos_ganadas"], "Posiciones ganadas/perdidas")
+
+def _circuitos_top(sesion, top):
+    conteo = sesion.circuitos(top)
+    tabla = conteo.reset_index()
+    tabla.columns = ["Circuito", "Grandes Premios"]
+    return tabla, _barras_h(f"Top {len(tabla)} circuitos con más carreras", tabla["Circuito"],
+                            tabla["Grandes Premios"], "Número de Grandes Premios")
+
+def _edades(sesion):
+    edades = sesion.edades()
+    fig, ax = _figura()
+    ax.hist(edades.to_numpy(), bins=30)
+    ax.axvline(edades.mean(), linestyle="--", color="gray", label=f"Promedio: {edades.mean():.1f}")
+    ax.set_title("Distribución de edades de pilotos")
+    ax.set_xlabel("Edad (años)")
+    ax.set_ylabel("Número de pilotos")
+    ax.legend()
+    fig.tight_layout()
+    return edades.describe().to_frame().T, fig
+
+def _h2h(sesion, a, b, desde, hasta):
+    res = sesion.h2h(a, b, desde, hasta)
+    if res is None:
+        raise ValueError("No hay carreras comunes con resultados válidos.")
+    (_, _, A_ref), (_, _, B_ref) = res["A"], res["B"]
+    winsA, winsB = res["victorias"]
+    fig, ax = _figura()
+    # diferencia acumulada sobre fechas, reducida al ancho del gráfico en píxeles
+    x, y = reducir_minmax(date2num(res["fechas"]), res["acumulado"].astype(np.float64), fig.bbox.width)
+    ax.plot(x, y, marker="o" if len(x) <= fig.bbox.width / 8 else "None", markersize=3)
+    localizador = AutoDateLocator()
+    ax.xaxis.set_major_locator(localizador)
+    ax.xaxis.set_major_formatter(ConciseDateFormatter(localizador))
+    ax.axhline(0, linestyle="--", color="gray")
+    ax.set_title(f"{A_ref} {winsA} – {winsB} {B_ref}: diferencia acumulada")
+    ax.set_xlabel("Fecha (sólo carreras comunes)")
+    ax.set_ylabel(f"Acumulado a favor de {A_ref}")
+    ax.grid(True, linestyle="--", alpha=0.6)
+    fig.tight_layout()
+    return res["resumen"], fig
+
+def _clasificacion(sesion, desde, hasta, min_q, top):
+    tabla = sesion.clasificacion_pilotos(desde, hasta, min_q).round(3)
+    t = tabla.sort_values("pos_media_clasif").head(top)
+    return tabla, _barras_h("Posición media de clasificación", t["driver"], t["pos_media_clasif"], "Posición media")
+
+def _campeonato(sesion, tipo, year, top):
+    puntos, _ = sesion.campeonato_progresion(tipo, year, top)
+    return sesion.campeonato_tabla(tipo, year), _lineas(f"Campeonato de {tipo} {year}", puntos, "Ronda", "Puntos")
+
+def _previo(sesion, year, ronda):
+    (_, gp), tabla = sesion.previo_gp(year, ronda)
+    tabla = tabla.round(2)
+    return tabla, _barras_h(f"{gp} {year}: forma reciente", tabla["piloto"], tabla["forma_pos_media"],
+                            "Posición media (últimas 5)")
+
+def _fiabilidad(sesion, desde, hasta, min_s, top):
+    tabla = sesion.fiabilidad("equipos", desde, hasta, min_s).round(2)
+    t = tabla.head(top)
+    return tabla, _barras_h("Abandonos por equipo", t["nombre"], t["abandono_pct"], "% de las salidas")
+
+def _equipos(sesion, desde, hasta, top):
+    tabla = sesion.equipos_temporadas(desde, hasta).round(2)
+    if tabla["year"].nunique() == 1:
+        t = tabla.sort_values("puntos", ascending=False).head(top)
+        return tabla, _barras_h(f"Puntos por equipo {desde}", t["equipo"], t["puntos"], "Puntos")
+    mejores = tabla.groupby("equipo")["puntos"].sum().nlargest(top).index
+    datos = tabla[tabla["equipo"].isin(mejores)].pivot_table(index="year", columns="equipo", values="puntos")
+    return tabla, _lineas("Equipos con más puntos", datos, "Temporada", "Puntos")
+
+def _elo(sesion, hasta, min_gp, top):
+    tabla = sesion.elo_clasificacion("todos", hasta, min_gp, "pico").round(1)
+    t = tabla.head(top)
+    return tabla, _barras_h("Rating Elo máximo" + (f" hasta {hasta}" if hasta else ""), t["piloto"], t["pico"], "Rating")
+
+GENERADORES = {
+    "remontadores": _remontadores, "circuitos": _circuitos_top, "edades": _edades, "h2h": _h2h,
+    "clasificacion": _clasificacion, "campeonato": _campeonato, "previo": _previo,
+    "fiabilidad": _fiabilidad, "equipos": _equipos, "elo": _elo,
+}
+
+# ---- Ejecución (en cada proceso) ----
+_SESION = None
+
+def _iniciar(data_dir):
+    global _SESION
+    _SESION = SesionAnalisis(data_dir)
+
+def _ejecutar(tarea, salida, formatos):
+    analisis, nombre, params = tarea
+    t0 = time.perf_counter()
+    fila = dict(analisis=analisis, nombre=nombre, filas=0, archivos="", ms=0.0, error="")
+    try:
+        tabla, fig = GENERADORES[analisis](_SESION, **params)
+        base = os.path.join(salida, analisis, nombre)
+        archivos = []
+        if "csv" in formatos:
+            tabla.to_csv(base + ".csv", index=False)
+            archivos.append(base + ".csv")
+        if "parquet" in formatos:
+            tabla.to_parquet(base + ".parquet", index=False)
+            archivos.append(base + ".parquet")
+        for ext in ("png", "svg"):
+            if ext in formatos:
+                fig.savefig(f"{base}.{ext}")
+                archivos.append(f"{base}.{ext}")
+        fila.update(filas=len(tabla), archivos=";".join(os.path.relpath(a, salida) for a in archivos))
+    except Exception as e:
+        fila["error"] = str(e)
+    fila["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return fila
+
+def generar(rejilla, salida, procesos=None, data_dir=None, sesion=None):
+    """Corre todas las tareas de la rejilla y escribe salida/indice.csv; devuelve ese índice."""
+    rejilla = {**REJILLA, **{k: v for k, v in rejilla.items() if v is not None}}
+    formatos = set(rejilla["formatos"])
+    if formatos - set(FORMATOS):
+        raise ValueError(f"Formatos desconocidos: {', '.join(sorted(formatos - set(FORMATOS)))}")
+    if "parquet" in formatos and not (importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet")):
+        raise ValueError("Para escribir Parquet hace falta pyarrow o fastparquet.")
+    sesion = sesion or SesionAnalisis(data_dir)
+    tareas = expandir(rejilla, sesion)
+    precalentar(sesion, {t[0] for t in tareas})
+    for analisis in {t[0] for t in tareas}:
+        os.makedirs(os.path.join(salida, analisis), exist_ok=True)
+
+    ejecutar = partial(_ejecutar, salida=salida, formatos=formatos)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tareas) <= 1:
+        global _SESION
+        _SESION = sesion
+        filas = [ejecutar(t) for t in tareas]
+    else:
+        bloque = max(1, len(tareas) // (procesos * 4))
+        with ProcessPoolExecutor(procesos, initializer=_iniciar, initargs=(data_dir,)) as pool:
+            filas = list(pool.map(ejecutar, tareas, chunksize=bloque))
+    indice = pd.DataFrame(filas, columns=["analisis", "nombre", "filas", "archivos", "ms", "error"])
+    indice.to_csv(os.path.join(salida, "indice.csv"), index=False)
+    return indice
+
+# ---- Línea de comandos ----
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py report", description="Informes en lote sin ventanas")
+    parser.add_argument("--grid", help="rejilla de parámetros en JSON (los argumentos la sobrescriben)")
+    parser.add_argument("--salida", default="informes", help="carpeta de salida")
+    parser.add_argument("--anios", nargs="+", help="temporadas (2023) o rangos (2020-2024)")
+    parser.add_argument("--top", type=int, nargs="+", help="tamaños de los Top N")
+    parser.add_argument("--pares", nargs="+", help="parejas H2H piloto:piloto")
+    parser.add_argument("--pares-companeros", action="store_true", default=None,
+                        help="H2H de todas las parejas de compañeros de cada temporada")
+    parser.add_argument("--circuitos", nargs="+", help="circuitos (circuitRef o nombre) para el previo del GP")
+    parser.add_argument("--analisis", nargs="+", choices=ANALISIS)
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS)
+    parser.add_argument("--min-carreras", type=int, help="mínimo de carreras/clasificaciones en los rankings")
+    parser.add_argument("--procesos", type=int, help="procesos en paralelo (por defecto, nº de núcleos)")
+    parser.add_argument("--datos", help="carpeta Data/ alternativa")
+    args = parser.parse_args(argv)
+
+    rejilla = {}
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            rejilla = json.load(f)
+    for clave in REJILLA:
+        valor = getattr(args, clave, None)
+        if valor is not None:
+            rejilla[clave] = valor
+
+    t0 = time.perf_counter()
+    try:
+        indice = generar(rejilla, args.salida, args.procesos, args.datos)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"[report] Error: {e}")
+        return 1
+    errores = indice[indice["error"] != ""]
+    archivos = int(indice["archivos"].str.count(";").add(1).where(indice["archivos"] != "", 0).sum())
+    print(f"{len(indice)} tareas, {archivos} archivos en {args.salida} "
+          f"({time.perf_counter() - t0:.1f} s, {len(errores)} con error)")
+    for fila in errores.itertuples():
+        print(f"  {fila.analisis}/{fila.nombre}: {fila.error}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# ==============================
+# INGESTA INCREMENTAL DE UN FIN DE SEMANA DE GP
+# ==============================
+# Agrega filas nuevas de races / results / sprint_results / qualifying /
+# pit_stops / driver_standings SIN recalcular la historia:
+#   1) valida columnas, claves primarias y referencias (todo antes de escribir)
+#   2) anexa las filas al CSV y al final de la caché columnar de cada tabla
+#   3) anexa a la tabla de hechos sólo las filas de la carrera nueva
+#   4) suma la carrera a los agregados (remontadores, circuitos, nº de GP, H2H)
+#      a los ratings Elo y al almacén de señales del previo del GP guardados
+# Si una caché no estaba al día o la carrera no es posterior a las guardadas,
+# esa caché se deja vencida y se reconstruye sola en la próxima carga.
+#
+# Uso:  python -m motor.ingesta carpeta_con_csv_nuevos/
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from . import agregados as agg
+from . import elo
+from . import hechos as hch
+from . import senales as sen
+from .datos import (DATA_DIR, NULO_ERGAST, anexar_cache, cache_vigente, cargar_tabla,
+                    guardar_objeto, huellas_fuentes, leer_objeto)
+
+# orden de aplicación (races primero: las demás la referencian)
+TABLAS = ("races", "results", "sprint_results", "qualifying", "pit_stops", "driver_standings")
+
+CLAVES = {
+    "races": ["raceId"],
+    "results": ["resultId"],
+    "sprint_results": ["resultId"],
+    "qualifying": ["qualifyId"],
+    "pit_stops": ["raceId", "driverId", "stop"],
+    "driver_standings": ["driverStandingsId"],
+}
+
+# columna -> tabla referenciada (misma columna como clave)
+REFERENCIAS = {
+    "races": {"circuitId": "circuits"},
+    "results": {"raceId": "races", "driverId": "drivers", "constructorId": "constructors", "statusId": "status"},
+    "sprint_results": {"raceId": "races", "driverId": "drivers", "constructorId": "constructors", "statusId": "status"},
+    "qualifying": {"raceId": "races", "driverId": "drivers", "constructorId": "constructors"},
+    "pit_stops": {"raceId": "races", "driverId": "drivers"},
+    "driver_standings": {"raceId": "races", "driverId": "drivers"},
+}
+
+class ErrorIngesta(ValueError):
+    pass
+
+def _columnas_csv(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        return [c.strip().strip('"') for c in f.readline().strip().split(",")]
+
+def _claves_repetidas(nuevas, existentes, columnas):
+    idx_nuevo = pd.MultiIndex.from_frame(nuevas[columnas].astype("int64"))
+    idx_viejo = pd.MultiIndex.from_frame(existentes[columnas].astype("int64"))
+    return nuevas[idx_nuevo.isin(idx_viejo) | idx_nuevo.duplicated()]
+
+def validar(nuevas, data_dir=None):
+    """Comprueba columnas, claves y referencias; devuelve las tablas con columnas en orden del CSV."""
+    data_dir = data_dir or DATA_DIR
+    desconocidas = set(nuevas) - set(TABLAS)
+    if desconocidas:
+        raise ErrorIngesta(f"Tablas no admitidas para ingesta: {sorted(desconocidas)}")
+    limpias = {}
+    for tabla in TABLAS:
+        df = nuevas.get(tabla)
+        if df is None or len(df) == 0:
+            continue
+        esperadas = _columnas_csv(os.path.join(data_dir, tabla + ".csv"))
+        faltan = [c for c in esperadas if c not in df.columns]
+        sobran = [c for c in df.columns if c not in esperadas]
+        if faltan or sobran:
+            raise ErrorIngesta(f"{tabla}: columnas incorrectas (faltan {faltan}, sobran {sobran})")
+        df = df[esperadas].reset_index(drop=True)
+        for c in CLAVES[tabla]:
+            if df[c].isna().any():
+                raise ErrorIngesta(f"{tabla}: la clave '{c}' tiene valores vacíos")
+        rep = _claves_repetidas(df, cargar_tabla(tabla, data_dir), CLAVES[tabla])
+        if len(rep):
+            raise ErrorIngesta(f"{tabla}: claves ya existentes o repetidas {rep[CLAVES[tabla]].head(5).values.tolist()}")
+        limpias[tabla] = df
+
+    for tabla, df in limpias.items():
+        for col, ref in REFERENCIAS[tabla].items():
+            validos = set(cargar_tabla(ref, data_dir)[col].astype("int64"))
+            if ref in limpias:
+                validos |= set(limpias[ref][col].astype("int64"))
+            malos = sorted(set(df[col].astype("int64")) - validos)
+            if malos:
+                raise ErrorIngesta(f"{tabla}: {col} sin registro en {ref}.csv: {malos[:5]}")
+    return limpias
+
+def _formato_ergast(df):
+    """Copia lista para el CSV: los valores enteros de columnas float (por nulos o por
+    decimales en otras filas) se escriben sin '.0', como Ergast ('22', '9' junto a '12.5')."""
+    df = df.copy()
+    for c in df.columns:
+        if pd.api.types.is_float_dtype(df[c]):
+            v = df[c].to_numpy(np.float64)
+            entero = np.isfinite(v) & (v == np.trunc(v))
+            texto = df[c].astype(object)
+            texto[entero] = v[entero].astype(np.int64)
+            df[c] = texto
+    return df
+
+def _anexar_csv(ruta, df):
+    with open(ruta, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        falta_salto = f.read(1) != b"\n"
+    with open(ruta, "a", encoding="utf-8", newline="") as f:
+        if falta_salto:
+            f.write("\n")
+        _formato_ergast(df).to_csv(f, header=False, index=False, na_rep=NULO_ERGAST, lineterminator="\n")
+
+def ingerir(nuevas, data_dir=None):
+    """Agrega las filas nuevas al CSV, a las cachés y a los agregados. Devuelve un resumen."""
+    data_dir = data_dir or DATA_DIR
+    limpias = validar(nuevas, data_dir)
+    if not limpias:
+        return {"filas": {}, "cachés": {}}
+
+    # estado ANTES de tocar los CSV: qué cachés se pueden actualizar en su lugar
+    vigentes = {t: cache_vigente(t, [t + ".csv"], data_dir) for t in limpias}
+    hechos_vigente = cache_vigente(hch.NOMBRE_CACHE, hch.FUENTES, data_dir)
+    ag = leer_objeto(agg.NOMBRE_CACHE, agg.FUENTES, data_dir)
+    ratings = {modo: leer_objeto(f"elo_{modo}", elo.FUENTES, data_dir) for modo in elo.MODOS}
+    almacen = leer_objeto(sen.NOMBRE_CACHE, sen.FUENTES, data_dir)
+    races_previas = cargar_tabla("races", data_dir)
+
+    # la tabla de hechos está ordenada por (año, ronda, sesión): sólo se puede
+    # anexar si los GP con resultados nuevos (carrera o sprint) son posteriores
+    # a todos los guardados
+    results, sprints = limpias.get("results"), limpias.get("sprint_results")
+    races_todas = pd.concat([races_previas, limpias["races"]], ignore_index=True) if "races" in limpias else races_previas
+    en_orden = True
+    if results is not None or sprints is not None:
+        orden = races_todas["year"].astype("int64") * 100 + races_todas["round"].astype("int64")
+        previas = pd.concat([cargar_tabla("results", data_dir)["raceId"],
+                             cargar_tabla("sprint_results", data_dir)["raceId"]])
+        con_resultados = races_todas["raceId"].isin(previas)
+        ultima = orden[con_resultados].max() if con_resultados.any() else -1
+        nuevas = pd.concat([df["raceId"] for df in (results, sprints) if df is not None])
+        nuevas_carreras = races_todas["raceId"].isin(nuevas)
+        en_orden = bool(orden[nuevas_carreras].min() > ultima)
+
+    resumen = {"filas": {}, "cachés": {}}
+    for tabla, df in limpias.items():
+        archivo = tabla + ".csv"
+        _anexar_csv(os.path.join(data_dir, archivo), df)
+        ok = vigentes[tabla] and anexar_cache(tabla, df, huellas_fuentes([archivo], data_dir), data_dir)
+        resumen["filas"][tabla] = len(df)
+        resumen["cachés"][tabla] = "anexada" if ok else "se reconstruirá"
+
+    # filas nuevas de la tabla de hechos (sólo la carrera ingerida); aunque no
+    # haya resultados se anexan 0 filas para que la caché registre las huellas
+    if results is None:
+        results = cargar_tabla("results", data_dir).iloc[0:0]
+    nuevos_hechos = hch.construir_hechos(results, cargar_tabla("races", data_dir),
+                                         cargar_tabla("drivers", data_dir), cargar_tabla("status", data_dir),
+                                         sprints)
+    ok = hechos_vigente and en_orden and hch.anexar_hechos(
+        nuevos_hechos, huellas_fuentes(hch.FUENTES, data_dir), data_dir)
+    resumen["cachés"][hch.NOMBRE_CACHE] = "anexada" if ok else "se reconstruirá"
+
+    if ag is not None:
+        ag.anexar(nuevos_hechos, limpias.get("races", races_previas.iloc[0:0]))
+        guardar_objeto(agg.NOMBRE_CACHE, ag, huellas_fuentes(agg.FUENTES, data_dir), data_dir)
+        resumen["cachés"][agg.NOMBRE_CACHE] = "actualizada"
+    else:
+        resumen["cachés"][agg.NOMBRE_CACHE] = "se reconstruirá"
+
+    # el Elo sigue desde su último estado; una carrera fuera de orden obliga a recalcularlo
+    for modo, motor in ratings.items():
+        nombre = f"elo_{modo}"
+        if motor is not None and en_orden and motor.anexar(nuevos_hechos):
+            guardar_objeto(nombre, motor, huellas_fuentes(elo.FUENTES, data_dir), data_dir)
+            resumen["cachés"][nombre] = "actualizada"
+        else:
+            resumen["cachés"][nombre] = "se reconstruirá"
+
+    # señales: sólo las filas de la carrera nueva, con su clasificación (puede
+    # haberse ingerido antes). Una clasificación de una carrera ya anexada
+    # cambiaría señales guardadas: entonces se recalcula todo.
+    qualifying = limpias.get("qualifying")
+    tardia = qualifying is not None and almacen is not None and qualifying["raceId"].isin(list(almacen.carreras)).any()
+    if almacen is not None and en_orden and not tardia:
+        q = cargar_tabla("qualifying", data_dir)
+        q = q[q["raceId"].isin(nuevos_hechos["raceId"])].rename(columns={"position": "pos_clasif"})
+        almacen.anexar(sen.AlmacenSenales.lote(nuevos_hechos, q))
+        guardar_objeto(sen.NOMBRE_CACHE, almacen, huellas_fuentes(sen.FUENTES, data_dir), data_dir)
+        resumen["cachés"][sen.NOMBRE_CACHE] = "actualizada"
+    else:
+        resumen["cachés"][sen.NOMBRE_CACHE] = "se reconstruirá"
+    return resumen
+
+def ingerir_carpeta(carpeta, data_dir=None):
+    """Lee <carpeta>/<tabla>.csv (las que existan) y las ingiere."""
+    nuevas = {}
+    for tabla in TABLAS:
+        ruta = os.path.join(carpeta, tabla + ".csv")
+        if os.path.exists(ruta):
+            nuevas[tabla] = pd.read_csv(ruta, na_values=[NULO_ERGAST, ""], keep_default_na=False)
+    if not nuevas:
+        raise ErrorIngesta(f"No hay CSV de {', '.join(TABLAS)} en {carpeta}")
+    return ingerir(nuevas, data_dir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingesta incremental de un GP nuevo")
+    parser.add_argument("carpeta", help="carpeta con races.csv, results.csv, ... del fin de semana")
+    parser.add_argument("--data", default=DATA_DIR, help="carpeta Data/ destino")
+    args = parser.parse_args()
+    try:
+        res = ingerir_carpeta(args.carpeta, args.data)
+    except (ErrorIngesta, FileNotFoundError) as e:
+        print(f"Error de ingesta: {e}")
+        sys.exit(1)
+    for tabla, n in res["filas"].items():
+        print(f"{tabla}: {n} filas nuevas")
+    for nombre, estado in res["cachés"].items():
+        print(f"  caché {nombre}: {estado}")
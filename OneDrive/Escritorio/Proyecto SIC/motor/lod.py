@@ -0,0 +1,94 @@
+# ==============================
+# SERIES LARGAS: REDUCCIÓN MIN/MAX POR PÍXEL
+# ==============================
+# Una línea con miles de puntos se ve igual si, por cada columna de píxeles,
+# se dibujan sólo el primer, el mínimo, el máximo y el último punto: el
+# trazado deja de depender de la longitud de la serie. SerieLOD conecta esa
+# reducción a unos ejes de matplotlib (consola o interfaz) y la repite sobre
+# el tramo visible cada vez que cambian los límites del eje x (zoom,
+# desplazamiento o rueda del ratón).
+import numpy as np
+
+PIXELES_POR_MARCADOR = 8   # con menos separación entre puntos no se dibujan marcadores
+ZOOM_RUEDA = 0.8           # fracción del tramo visible que queda tras un paso de rueda
+
+def reducir_minmax(x, y, cubetas, x0=None, x1=None):
+    """Puntos del tramo [x0, x1] (más uno a cada lado, para que la línea llegue
+    al borde) reducidos a primero, mínimo, máximo y último de cada cubeta.
+    `x` debe estar ordenado de menor a mayor."""
+    i0 = 0 if x0 is None else max(int(np.searchsorted(x, x0, "left")) - 1, 0)
+    i1 = len(x) if x1 is None else min(int(np.searchsorted(x, x1, "right")) + 1, len(x))
+    xs, ys = x[i0:i1], y[i0:i1]
+    cubetas = max(int(cubetas), 1)
+    if len(xs) <= 4 * cubetas or xs[-1] == xs[0]:
+        return xs, ys
+    b = np.minimum(((xs - xs[0]) / (xs[-1] - xs[0]) * cubetas).astype(np.int64), cubetas - 1)
+    inicio = np.flatnonzero(np.concatenate(([True], b[1:] != b[:-1])))
+    fin = np.concatenate((inicio[1:], [len(b)])) - 1
+    orden = np.lexsort((ys, b))   # por cubeta y, dentro, por valor
+    elegidos = np.unique(np.concatenate((inicio, fin, orden[inicio], orden[fin])))
+    return xs[elegidos], ys[elegidos]
+
+class SerieLOD:
+    """Line2D que muestra `reducir_minmax` del tramo visible (una cubeta por píxel
+    de ancho de los ejes). Las fechas (datetime64) se pasan a eje de fechas."""
+
+    def __init__(self, ax, linea, x, y, marcador="o"):
+        self.ax, self.linea, self.marcador = ax, linea, marcador
+        self._cargando = False
+        self._ids = [ax.callbacks.connect("xlim_changed", lambda _: self.actualizar()),
+                     ax.figure.canvas.mpl_connect("resize_event", lambda _: self.actualizar()),
+                     ax.figure.canvas.mpl_connect("scroll_event", self._rueda)]
+        self.cargar(x, y)
+
+    def cargar(self, x, y):
+        """Serie completa nueva: se dibuja entera (reducida) y se reajustan los límites."""
+        x = np.asarray(x)
+        if np.issubdtype(x.dtype, np.datetime64):
+            from matplotlib.dates import AutoDateLocator, ConciseDateFormatter, date2num
+            x = date2num(x)
+            if not isinstance(self.ax.xaxis.get_major_formatter(), ConciseDateFormatter):
+                localizador = AutoDateLocator()
+                self.ax.xaxis.set_major_locator(localizador)
+                self.ax.xaxis.set_major_formatter(ConciseDateFormatter(localizador))
+        self.x, self.y = x.astype(np.float64), np.asarray(y, dtype=np.float64)
+        # los límites se ajustan a la serie entera; mientras tanto xlim_changed no remuestrea
+        self._cargando = True
+        try:
+            extremos = (self.x[0], self.x[-1]) if len(self.x) else (0.0, 1.0)
+            self._dibujar(*reducir_minmax(self.x, self.y, self._cubetas()), *extremos)
+            self.ax.relim()
+            self.ax.autoscale_view()
+        finally:
+            self._cargando = False
+        self.actualizar()
+
+    def actualizar(self):
+        if self._cargando:
+            return
+        x0, x1 = sorted(self.ax.get_xlim())
+        self._dibujar(*reducir_minmax(self.x, self.y, self._cubetas(), x0, x1), x0, x1)
+
+    def desconectar(self):
+        self.ax.callbacks.disconnect(self._ids[0])
+        for cid in self._ids[1:]:
+            self.ax.figure.canvas.mpl_disconnect(cid)
+
+    def _cubetas(self):
+        return max(int(self.ax.bbox.width), 1)
+
+    def _dibujar(self, xs, ys, x0, x1):
+        self.linea.set_data(xs, ys)
+        visibles = np.count_nonzero((xs >= x0) & (xs <= x1))
+        separados = visibles * PIXELES_POR_MARCADOR <= self._cubetas()
+        self.linea.set_marker(self.marcador if separados else "None")
+
+    def _rueda(self, evento):
+        # zoom del eje x alrededor del cursor (arriba = acercar)
+        if evento.inaxes is not self.ax or evento.xdata is None:
+            return
+        factor = ZOOM_RUEDA if evento.button == "up" else 1 / ZOOM_RUEDA
+        x0, x1 = self.ax.get_xlim()
+        c = evento.xdata
+        self.ax.set_xlim(c - (c - x0) * factor, c + (x1 - c) * factor)
+        self.ax.figure.canvas.draw_idle()
@@ -0,0 +1,107 @@
+# ==============================
+# MEMO DE RESULTADOS DE ANÁLISIS (LRU)
+# ==============================
+# Repetir un análisis con los mismos parámetros (o volver a uno anterior)
+# devuelve el resultado guardado al instante. La clave es
+# (análisis, parámetros normalizados, versión de los datos), así que una
+# ingesta nueva invalida todo sin borrar nada a mano. La memoria se acota
+# por bytes estimados (DataFrames, arrays y figuras) con expulsión LRU.
+import sys
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+MAX_BYTES = 64 * 1024 * 1024
+
+def normalizar_param(valor):
+    """Parámetros equivalentes -> misma clave ('2000', 2000 y 2000.0 son iguales; '' es None)."""
+    if isinstance(valor, str):
+        valor = valor.strip()
+        if valor == "":
+            return None
+        try:
+            return int(valor)
+        except ValueError:
+            return valor.lower()
+    if isinstance(valor, (bool, np.bool_)):
+        return bool(valor)
+    if isinstance(valor, (int, np.integer)):
+        return int(valor)
+    if isinstance(valor, (float, np.floating)):
+        return int(valor) if float(valor).is_integer() else float(valor)
+    return valor
+
+def tamano(obj):
+    """Bytes aproximados de un resultado (recorre tuplas, listas y dicts)."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(deep=True).sum() if isinstance(obj, pd.DataFrame)
+                   else obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(tamano(o) for o in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(tamano(k) + tamano(v) for k, v in obj.items())
+    bbox = getattr(obj, "bbox", None)
+    if bbox is not None and hasattr(obj, "canvas"):
+        # figura de matplotlib: su buffer RGBA renderizado domina el tamaño
+        return int(bbox.width * bbox.height * 4)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + tamano(vars(obj))  # p. ej. MatrizH2H
+    return sys.getsizeof(obj)
+
+class MemoLRU:
+    def __init__(self, max_bytes=MAX_BYTES, version=None):
+        self.max_bytes = max_bytes
+        self.version = version
+        self.bytes = 0
+        self.aciertos = self.fallos = 0
+        self._datos = OrderedDict()   # clave -> (valor, bytes)
+        self._lock = Lock()           # la interfaz lo usa desde hilos del pool
+
+    def clave(self, nombre, params):
+        return (nombre, tuple(sorted((k, normalizar_param(v)) for k, v in params.items())), self.version)
+
+    def obtener(self, clave):
+        with self._lock:
+            item = self._datos.get(clave)
+            if item is None:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return item[0]
+
+    def guardar(self, clave, valor):
+        n = tamano(valor)
+        with self._lock:
+            if clave in self._datos:
+                self.bytes -= self._datos.pop(clave)[1]
+            if n > self.max_bytes:
+                return  # no entra ni vaciando el memo
+            self._datos[clave] = (valor, n)
+            self.bytes += n
+            while self.bytes > self.max_bytes:
+                _, (_, m) = self._datos.popitem(last=False)
+                self.bytes -= m
+
+    def memo(self, nombre, params, calcular):
+        """Resultado de calcular() para (nombre, params); sólo se calcula la primera vez."""
+        clave = self.clave(nombre, params)
+        valor = self.obtener(clave)
+        if valor is None:
+            valor = calcular()
+            self.guardar(clave, valor)
+        return valor
+
+    def cambiar_version(self, version):
+        # las entradas de la versión anterior ya no se piden: se liberan
+        with self._lock:
+            self.version = version
+            self._datos.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._datos)
@@ -0,0 +1,172 @@
+# ==============================
+# PARADAS EN BOXES
+# ==============================
+# pit_stops + races + results unidos UNA vez y ordenados por
+# (año, ronda, carrera, equipo, piloto, parada): las paradas de cada carrera,
+# y dentro de ella las de cada equipo, quedan en filas contiguas. Se persiste
+# como caché columnar; un rango de temporadas es una vista por búsqueda
+# binaria y cada consulta es un groupby sobre esa vista.
+#
+# Paradas "normales": las que duran como mucho el doble de la mediana de su
+# carrera (se descartan banderas rojas, reparaciones y penalizaciones).
+#
+# Undercuts: los pares candidatos (misma parada nº, hasta MAX_VENTANA vueltas
+# y MAX_DIF_GRID puestos de parrilla) se construyen UNA vez, carrera a carrera
+# con los inicios de cada carrera, y se guardan como otra caché en el mismo
+# orden; una consulta es la vista del rango de años y una máscara.
+import numpy as np
+import pandas as pd
+
+from .datos import cargar_tabla, guardar_cache, huellas_fuentes, leer_cache
+from .hechos import seleccionar
+
+NOMBRE_CACHE = "hechos_paradas"
+FUENTES = ["pit_stops.csv", "races.csv", "results.csv"]
+FACTOR_ANOMALA = 2.0
+MAX_PARADAS_DISTRIBUCION = 4  # 4 = "4 o más"
+NOMBRE_CACHE_UNDERCUTS = "hechos_undercuts"
+MAX_VENTANA = 5               # vueltas máximas entre las dos paradas de un candidato
+MAX_DIF_GRID = 5              # puestos de parrilla máximos entre atacante y rival
+
+ESQUEMA_PARADAS = {
+    "raceId": "int32", "year": "int16", "round": "int16", "circuitId": "int16",
+    "constructorId": "int16", "driverId": "int32", "stop": "int16", "lap": "int16",
+    "ms": "int32", "normal": "bool", "grid": "int16", "positionOrder": "int16",
+}
+
+ESQUEMA_UNDERCUTS = {
+    "raceId": "int32", "year": "int16", "round": "int16", "circuitId": "int16", "stop": "int16",
+    "driverId": "int32", "constructorId": "int16", "lap": "int16", "grid": "int16", "positionOrder": "int16",
+    "driverId_rival": "int32", "constructorId_rival": "int16", "lap_rival": "int16", "grid_rival": "int16",
+    "positionOrder_rival": "int16", "antes": "int8", "dif_grid": "int8", "exito": "bool",
+}
+
+# ---- Construcción ----
+def construir_paradas(dfPitStops, dfRaces, dfResults):
+    """Una fila por parada, con carrera, equipo, parrilla y resultado del piloto."""
+    df = pd.DataFrame({
+        "raceId": dfPitStops["raceId"].to_numpy(), "driverId": dfPitStops["driverId"].to_numpy(),
+        "stop": dfPitStops["stop"].to_numpy(), "lap": dfPitStops["lap"].to_numpy(),
+        "ms": dfPitStops["milliseconds"].to_numpy(),
+    })
+    df = df.merge(dfRaces[["raceId", "year", "round", "circuitId"]], on="raceId", how="inner")
+    resultado = dfResults[["raceId", "driverId", "constructorId", "grid", "positionOrder"]]
+    df = df.merge(resultado.drop_duplicates(["raceId", "driverId"]), on=["raceId", "driverId"], how="inner")
+    mediana = df.groupby("raceId")["ms"].transform("median")
+    df["normal"] = (df["ms"] > 0) & (df["ms"] <= FACTOR_ANOMALA * mediana)
+    df = df.sort_values(["year", "round", "raceId", "constructorId", "driverId", "stop"], kind="mergesort")
+    return df[list(ESQUEMA_PARADAS)].reset_index(drop=True)
+
+def cargar_paradas(data_dir=None, dfRaces=None, dfResults=None):
+    """Tabla de paradas desde la caché; se reconstruye sólo si cambió algún CSV fuente."""
+    df = leer_cache(NOMBRE_CACHE, FUENTES, data_dir)
+    if df is not None:
+        return df
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    paradas = construir_paradas(
+        cargar_tabla("pit_stops", data_dir),
+        dfRaces if dfRaces is not None else cargar_tabla("races", data_dir),
+        dfResults if dfResults is not None else cargar_tabla("results", data_dir),
+    )
+    return guardar_cache(NOMBRE_CACHE, paradas, huellas, data_dir, ESQUEMA_PARADAS)
+
+def construir_undercuts(paradas):
+    """Pares (atacante, rival) de cada carrera: misma parada nº, el atacante para de 1 a
+    MAX_VENTANA vueltas antes y salió de 1 a MAX_DIF_GRID puestos detrás."""
+    p = paradas[paradas["normal"].to_numpy() & (paradas["grid"].to_numpy() > 0)].reset_index(drop=True)
+    _, inicios = inicios_carrera(p)
+    stop, lap, grid = (p[c].to_numpy(np.int64) for c in ("stop", "lap", "grid"))
+    atacantes, rivales = [], []
+    for i0, i1 in zip(inicios[:-1], inicios[1:]):
+        s, l, g = stop[i0:i1], lap[i0:i1], grid[i0:i1]
+        antes = l[None, :] - l[:, None]
+        detras = g[:, None] - g[None, :]
+        ok = ((s[:, None] == s[None, :]) & (antes >= 1) & (antes <= MAX_VENTANA)
+              & (detras >= 1) & (detras <= MAX_DIF_GRID))
+        a, b = np.nonzero(ok)
+        atacantes.append(a + i0)
+        rivales.append(b + i0)
+    a = np.concatenate(atacantes) if atacantes else np.empty(0, dtype=np.int64)
+    b = np.concatenate(rivales) if rivales else np.empty(0, dtype=np.int64)
+    cols = ["raceId", "year", "round", "circuitId", "stop", "driverId", "constructorId", "lap",
+            "grid", "positionOrder"]
+    df = pd.DataFrame({c: p[c].to_numpy()[a] for c in cols})
+    for c in ("driverId", "constructorId", "lap", "grid", "positionOrder"):
+        df[c + "_rival"] = p[c].to_numpy()[b]
+    df["antes"] = lap[b] - lap[a]
+    df["dif_grid"] = grid[a] - grid[b]
+    df["exito"] = df["positionOrder"].to_numpy() < df["positionOrder_rival"].to_numpy()
+    return df[list(ESQUEMA_UNDERCUTS)]
+
+def cargar_undercuts(paradas, data_dir=None):
+    """Pares candidatos de undercut desde la caché; se reconstruyen con la de paradas."""
+    df = leer_cache(NOMBRE_CACHE_UNDERCUTS, FUENTES, data_dir)
+    if df is not None:
+        return df
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    return guardar_cache(NOMBRE_CACHE_UNDERCUTS, construir_undercuts(paradas), huellas, data_dir,
+                         ESQUEMA_UNDERCUTS)
+
+def inicios_carrera(paradas):
+    """(raceIds, inicio de cada carrera): las filas de raceIds[k] van de inicios[k] a inicios[k+1]."""
+    rid = paradas["raceId"].to_numpy()
+    if len(rid) == 0:
+        return rid[:0], np.zeros(1, dtype=np.int64)
+    cortes = np.flatnonzero(rid[1:] != rid[:-1]) + 1
+    inicios = np.concatenate(([0], cortes, [len(rid)]))
+    return rid[inicios[:-1]], inicios
+
+# ---- Consultas ----
+def distribucion_paradas(paradas, hechos, desde=None, hasta=None):
+    """% de pilotos con 0, 1, 2, 3 y 4+ paradas por temporada (sólo carreras con datos de boxes)."""
+    p = seleccionar(paradas, desde, hasta)
+    carreras, _ = inicios_carrera(p)
+    h = seleccionar(hechos, desde, hasta)
+    h = h[np.isin(h["raceId"].to_numpy(), carreras)]
+    # paradas por (carrera, piloto); quien no figura en pit_stops no paró
+    clave_p = p["raceId"].to_numpy(np.int64) * 1_000_000 + p["driverId"].to_numpy(np.int64)
+    clave_h = h["raceId"].to_numpy(np.int64) * 1_000_000 + h["driverId"].to_numpy(np.int64)
+    conteo = pd.Series(clave_p).value_counts()
+    n_paradas = conteo.reindex(clave_h, fill_value=0).to_numpy()
+    tabla = pd.crosstab(h["year"].to_numpy(), np.minimum(n_paradas, MAX_PARADAS_DISTRIBUCION),
+                        normalize="index") * 100
+    tabla = tabla.reindex(columns=range(MAX_PARADAS_DISTRIBUCION + 1), fill_value=0.0)
+    tabla.columns = [str(c) for c in range(MAX_PARADAS_DISTRIBUCION)] + [f"{MAX_PARADAS_DISTRIBUCION}+"]
+    tabla.insert(0, "paradas_medias", pd.Series(n_paradas).groupby(h["year"].to_numpy()).mean())
+    tabla.index.name = "year"
+    return tabla
+
+def mediana_equipos(paradas, desde=None, hasta=None):
+    """Mediana y nº de paradas normales por (temporada, equipo)."""
+    p = seleccionar(paradas, desde, hasta)
+    p = p[p["normal"].to_numpy()]
+    g = p.groupby(["year", "constructorId"])["ms"]
+    return pd.DataFrame({"paradas": g.size(), "mediana_ms": g.median()}).reset_index()
+
+def perdida_circuitos(paradas, desde=None, hasta=None):
+    """Tiempo en boxes por circuito (mediana y cuartiles de las paradas normales, en ms).
+
+    pit_stops mide desde la entrada hasta la salida del pit lane: es la
+    estimación de la pérdida por parar en ese circuito.
+    """
+    p = seleccionar(paradas, desde, hasta)
+    p = p[p["normal"].to_numpy()]
+    g = p.groupby("circuitId")["ms"]
+    return pd.DataFrame({
+        "paradas": g.size(), "temporadas": p.groupby("circuitId")["year"].nunique(),
+        "mediana_ms": g.median(), "p25_ms": g.quantile(0.25), "p75_ms": g.quantile(0.75),
+    })
+
+def undercuts(candidatos, desde=None, hasta=None, ventana=3, max_dif_grid=3):
+    """Intentos de undercut: A para 1..`ventana` vueltas antes que B (misma parada nº)
+    habiendo salido detrás de B, a ≤ `max_dif_grid` puestos; exito = A terminó delante.
+    `candidatos` es la tabla de cargar_undercuts.
+
+    Sin vueltas por vuelta en Data/, el orden antes de las paradas se aproxima con la
+    parrilla de salida.
+    """
+    if ventana > MAX_VENTANA or max_dif_grid > MAX_DIF_GRID:
+        raise ValueError(f"Undercuts: como mucho {MAX_VENTANA} vueltas y {MAX_DIF_GRID} puestos de parrilla.")
+    c = seleccionar(candidatos, desde, hasta)
+    ok = (c["antes"].to_numpy() <= ventana) & (c["dif_grid"].to_numpy() <= max_dif_grid)
+    return c[ok].reset_index(drop=True)
@@ -0,0 +1,136 @@
+# ==============================
+# ÍNDICE DE PILOTOS (resolución y búsqueda)
+# ==============================
+# Se construye UNA vez a partir de drivers (+ nº de carreras) y lo comparten
+# la consola y la interfaz. La búsqueda exacta usa diccionarios (driverRef,
+# código, nombre completo, apellido) y la aproximada un índice de trigramas
+# más uno de prefijos, con candidatos ordenados por relevancia y nº de GP.
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Niveles de coincidencia (menor = mejor)
+EXACTO_REF, EXACTO_CODIGO, EXACTO_NOMBRE, EXACTO_APELLIDO, PREFIJO, SUBCADENA = range(6)
+
+def normalizar(texto):
+    """Minúsculas y sin acentos: 'Räikkönen' -> 'raikkonen'."""
+    texto = unicodedata.normalize("NFKD", str(texto).strip().lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+class IndicePilotos:
+    def __init__(self, dfDrivers, starts=None):
+        d = dfDrivers.reset_index(drop=True)
+        self.ids = d["driverId"].to_numpy(dtype=np.int64)
+        self.refs = d["driverRef"].astype(str).to_numpy(dtype=object)
+        self.forenames = d["forename"].astype(str).to_numpy(dtype=object)
+        self.surnames = d["surname"].astype(str).to_numpy(dtype=object)
+        self.nombres = self.forenames + " " + self.surnames
+        codes = d["code"].astype(object).where(d["code"].notna(), "").astype(str).str.strip()
+        self.codes = codes.to_numpy(dtype=object)
+        if starts is None:
+            self.starts = np.zeros(len(d), dtype=np.int64)
+        else:
+            self.starts = pd.Series(self.ids).map(starts).fillna(0).astype(np.int64).to_numpy()
+        self.display = (pd.Series(self.refs) + " — " + pd.Series(self.nombres)
+                        + np.where(codes.to_numpy() != "", " (" + codes + ")", "")).to_numpy(dtype=object)
+        self._fila_por_id = {int(i): k for k, i in enumerate(self.ids)}
+
+        # diccionarios exactos: clave normalizada -> filas
+        self._exactos = [defaultdict(list) for _ in range(4)]
+        for k in range(len(d)):
+            claves = (self.refs[k], self.codes[k], self.nombres[k], self.surnames[k])
+            for nivel, clave in enumerate(claves):
+                clave = normalizar(clave)
+                if clave:
+                    self._exactos[nivel][clave].append(k)
+
+        # trigramas sobre "nombre completo + driverRef" y prefijos por palabra
+        self._textos = [normalizar(f"{n} {r}") for n, r in zip(self.nombres, self.refs)]
+        self._tri = defaultdict(set)
+        prefijos = []
+        for k, texto in enumerate(self._textos):
+            for t in _trigramas(texto):
+                self._tri[t].add(k)
+            for palabra in set(texto.replace("_", " ").split()) | {normalizar(self.codes[k])}:
+                if palabra:
+                    prefijos.append((palabra, k))
+        prefijos.sort()
+        self._pref_claves = [p for p, _ in prefijos]
+        self._pref_filas = [k for _, k in prefijos]
+
+    # ---- búsqueda ----
+    def _por_prefijo(self, q):
+        filas = set()
+        i = bisect_left(self._pref_claves, q)
+        while i < len(self._pref_claves) and self._pref_claves[i].startswith(q):
+            filas.add(self._pref_filas[i])
+            i += 1
+        return filas
+
+    def _por_subcadena(self, q):
+        if len(q) < 3:
+            return set()
+        tris = sorted(_trigramas(q), key=lambda t: len(self._tri.get(t, ())))
+        filas = set(self._tri.get(tris[0], ()))
+        for t in tris[1:]:
+            if not filas:
+                break
+            filas &= self._tri.get(t, set())
+        return {k for k in filas if q in self._textos[k]}
+
+    def candidatos(self, query, limite=10):
+        """Filas candidatas ordenadas por (nivel de coincidencia, nº de GP desc)."""
+        q = normalizar(query)
+        if not q:
+            return []
+        nivel_por_fila = {}
+        for nivel, dic in enumerate(self._exactos):
+            for k in dic.get(q, ()):
+                nivel_por_fila.setdefault(k, nivel)
+        for k in self._por_prefijo(q):
+            nivel_por_fila.setdefault(k, PREFIJO)
+        for k in self._por_subcadena(q):
+            nivel_por_fila.setdefault(k, SUBCADENA)
+        orden = sorted(nivel_por_fila, key=lambda k: (nivel_por_fila[k], -self.starts[k], self.ids[k]))
+        return orden[:limite] if limite else orden
+
+    def buscar(self, query, limite=10):
+        """Candidatos como DataFrame (driverId, driverRef, nombre, code, starts, display)."""
+        filas = self.candidatos(query, limite)
+        return pd.DataFrame({
+            "driverId": self.ids[filas], "driverRef": self.refs[filas], "nombre": self.nombres[filas],
+            "code": self.codes[filas], "starts": self.starts[filas], "display": self.display[filas],
+        })
+
+    def resolver(self, query):
+        """(driverId, 'Nombre Apellido', driverRef) del mejor candidato."""
+        filas = self.candidatos(query, limite=1)
+        if not filas:
+            raise ValueError(f"No se encontró el piloto '{query}'. Usa driverRef, código o nombre completo.")
+        k = filas[0]
+        return int(self.ids[k]), self.nombres[k], self.refs[k]
+
+    def sugerir(self, texto, limite=20):
+        """Textos 'display' para autocompletar (todos los pilotos por nº de GP si está vacío)."""
+        if not normalizar(texto):
+            return list(self.display[np.argsort(-self.starts, kind="stable")][:limite])
+        return list(self.display[self.candidatos(texto, limite)])
+
+    def nombre(self, driver_id):
+        k = self._fila_por_id[int(driver_id)]
+        return self.nombres[k], self.refs[k]
+
+    def catalogo(self):
+        """Catálogo de pilotos ordenado por nº de carreras (para listas y combos)."""
+        cat = pd.DataFrame({
+            "driverId": self.ids, "driverRef": self.refs,
+            "forename": self.forenames, "surname": self.surnames,
+            "code": self.codes, "starts": self.starts, "display": self.display,
+        })
+        return cat.sort_values("starts", ascending=False)
@@ -0,0 +1,226 @@
+# ==============================
+# PREVIO DEL GP: SEÑALES POR PILOTO
+# ==============================
+# Almacén de variables que se actualiza carrera a carrera: para cada
+# (carrera, piloto) guarda lo que se sabía ANTES de esa carrera.
+#   - forma: posición, puntos, posiciones ganadas y % de abandonos en las
+#     últimas VENTANA carreras
+#   - clasificación: posición media de salida en las últimas VENTANA y su
+#     tendencia frente a las VENTANA anteriores (negativa = mejorando)
+#   - historial en el circuito: carreras, posición media y mejor resultado
+#   - abandonos en toda la carrera deportiva (categoría del statusId según
+#     motor/estados.py; sólo cuentan las carreras en que tomó la salida)
+#   - H2H con el compañero de esa carrera: veces por delante / carreras juntos
+#
+# anexar() recibe sólo carreras nuevas: las ventanas se completan con la cola
+# (últimas 2·VENTANA filas de cada piloto) y los acumulados parten de los
+# totales guardados, así que nunca se vuelve a recorrer results.csv. El previo
+# de una carrera ya disputada es una rebanada de la tabla `senales`; el de la
+# próxima (inscritos sin resultados todavía) se calcula con el estado actual,
+# que es el de la última carrera anexada.
+import numpy as np
+import pandas as pd
+
+from .datos import guardar_objeto, huellas_fuentes, leer_objeto
+from .estados import DOBLADO
+from .hechos import CARRERA, FUENTES as FUENTES_HECHOS
+
+NOMBRE_CACHE = "senales"
+FUENTES = FUENTES_HECHOS + ["qualifying.csv"]
+VENTANA = 5
+
+COLUMNAS_COLA = ["driverId", "pos", "puntos", "ganadas", "abandono", "clasif"]
+
+# ---- Sumas sobre filas anteriores ----
+def _previas(claves, valores, ventana=None):
+    """Suma y nº de valores no nulos de las filas ANTERIORES con la misma clave
+    (las últimas `ventana`, o todas). Las filas deben estar en orden cronológico."""
+    n = len(claves)
+    orden = np.argsort(claves, kind="stable")
+    k = claves[orden]
+    v = np.asarray(valores, dtype=np.float64)[orden]
+    hay = ~np.isnan(v)
+    C = np.concatenate(([0.0], np.cumsum(np.where(hay, v, 0.0))))
+    N = np.concatenate(([0], np.cumsum(hay)))
+    i = np.arange(n)
+    nuevo_grupo = np.ones(n, dtype=bool)
+    nuevo_grupo[1:] = k[1:] != k[:-1]
+    inicio = np.flatnonzero(nuevo_grupo)[np.cumsum(nuevo_grupo) - 1] if n else i
+    desde = inicio if ventana is None else np.maximum(inicio, i - ventana)
+    suma, cuenta = np.empty(n), np.empty(n, dtype=np.int64)
+    suma[orden] = C[i] - C[desde]
+    cuenta[orden] = N[i] - N[desde]
+    return suma, cuenta
+
+def _media(suma, cuenta):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(cuenta > 0, suma / np.maximum(cuenta, 1), np.nan)
+
+def _base(totales, claves, columna):
+    # total guardado de cada clave (0 si la clave es nueva)
+    return totales[columna].reindex(claves).fillna(0).to_numpy()
+
+class AlmacenSenales:
+    def __init__(self, ventana=VENTANA):
+        self.ventana = ventana
+        self.senales = pd.DataFrame()
+        self.cola = pd.DataFrame({c: pd.Series(dtype=np.float64) for c in COLUMNAS_COLA})
+        self.por_piloto = pd.DataFrame(columns=["carreras", "abandonos"], dtype=np.float64)
+        self.por_circuito = pd.DataFrame(columns=["carreras", "suma_pos", "mejor"], dtype=np.float64)
+        self.por_pareja = pd.DataFrame(columns=["delante", "juntos"], dtype=np.float64)
+        self.carreras = set()                                          # raceId ya anexados
+
+    # ---- Lote: una fila por (carrera, piloto) ----
+    @staticmethod
+    def lote(hechos, clasif):
+        """Filas de resultados en orden cronológico con lo necesario para las señales."""
+        df = hechos[hechos["sesion"].to_numpy() == CARRERA].drop_duplicates(["raceId", "driverId"], keep="first")
+        abandono = np.where(df["salio"].to_numpy(), df["estado"].to_numpy() > DOBLADO, np.nan)
+        lote = pd.DataFrame({
+            "raceId": df["raceId"].to_numpy(), "year": df["year"].to_numpy(), "round": df["round"].to_numpy(),
+            "circuitId": df["circuitId"].to_numpy(), "driverId": df["driverId"].to_numpy(),
+            "constructorId": df["constructorId"].to_numpy(),
+            "pos": df["positionOrder"].to_numpy(np.float64), "puntos": df["points"].to_numpy(np.float64),
+            "ganadas": df["posiciones_ganadas"].to_numpy(np.float64),
+            "abandono": abandono,
+        })
+        q = clasif[["raceId", "driverId", "pos_clasif"]].drop_duplicates(["raceId", "driverId"])
+        lote = lote.merge(q, on=["raceId", "driverId"], how="left").rename(columns={"pos_clasif": "clasif"})
+        lote["clasif"] = lote["clasif"].astype(np.float64)
+        return lote
+
+    # ---- Cálculo (sin tocar el estado) ----
+    def calcular(self, lote):
+        """Señales de cada fila del lote a partir del estado y de las filas anteriores del lote."""
+        N = self.ventana
+        n_cola = len(self.cola)
+        todo = pd.concat([self.cola[COLUMNAS_COLA], lote[COLUMNAS_COLA]], ignore_index=True)
+        piloto = todo["driverId"].to_numpy(np.int64)
+        nuevas = slice(n_cola, None)
+
+        def ventana(col, filas=N):
+            s, c = _previas(piloto, todo[col].to_numpy(), filas)
+            return s[nuevas], c[nuevas]
+
+        _, n_forma = ventana("pos")
+        out = pd.DataFrame({c: lote[c].to_numpy() for c in ["raceId", "year", "round", "circuitId",
+                                                               "driverId", "constructorId"]})
+        out["forma_carreras"] = n_forma
+        for col, nombre in (("pos", "forma_pos_media"), ("puntos", "forma_puntos_media"),
+                            ("ganadas", "forma_ganadas_media")):
+            out[nombre] = _media(*ventana(col))
+        out["forma_abandonos_pct"] = _media(*ventana("abandono")) * 100
+        s1, c1 = ventana("clasif")
+        s2, c2 = ventana("clasif", 2 * N)
+        out["clasif_media"] = _media(s1, c1)
+        out["clasif_tendencia"] = out["clasif_media"] - _media(s2 - s1, c2 - c1)
+
+        # acumulados: totales guardados + filas anteriores del propio lote
+        d = lote["driverId"].to_numpy(np.int64)
+        ab, n_ab = _previas(d, lote["abandono"].to_numpy())
+        total = n_ab + _base(self.por_piloto, d, "carreras")
+        out["carreras_total"] = total.astype(np.int64)
+        out["abandonos_pct"] = _media(ab + _base(self.por_piloto, d, "abandonos"), total) * 100
+
+        kc = d * 2**16 + lote["circuitId"].to_numpy(np.int64)
+        sp, nc = _previas(kc, lote["pos"].to_numpy())
+        nc = nc + _base(self.por_circuito, kc, "carreras")
+        out["circuito_carreras"] = nc.astype(np.int64)
+        out["circuito_pos_media"] = _media(sp + _base(self.por_circuito, kc, "suma_pos"), nc)
+        previa = pd.Series(lote["pos"].to_numpy()).groupby(kc).cummin().groupby(kc).shift(1).to_numpy()
+        guardada = self.por_circuito["mejor"].reindex(kc).to_numpy(np.float64)
+        out["circuito_mejor"] = np.fmin(previa, guardada)
+
+        pareja = self._companeros(lote)
+        kp = pareja["clave"].to_numpy(np.int64)
+        dl, nj = _previas(kp, pareja["delante"].to_numpy())
+        pareja["h2h_delante"] = (dl + _base(self.por_pareja, kp, "delante")).astype(np.int64)
+        pareja["h2h_juntos"] = (nj + _base(self.por_pareja, kp, "juntos")).astype(np.int64)
+        out = out.merge(pareja[["raceId", "driverId", "companeroId", "h2h_delante", "h2h_juntos"]],
+                        on=["raceId", "driverId"], how="left")
+        out["companeroId"] = out["companeroId"].fillna(0).astype(np.int64)
+        for c in ("h2h_delante", "h2h_juntos"):
+            out[c] = out[c].fillna(0).astype(np.int64)
+        return out, pareja
+
+    @staticmethod
+    def _companeros(lote):
+        # el otro coche del equipo en cada carrera (el primero si hubo varios)
+        cols = ["raceId", "constructorId", "driverId", "pos"]
+        pares = lote[cols].merge(lote[cols], on=["raceId", "constructorId"], suffixes=("", "_c"))
+        pares = pares[pares["driverId"] != pares["driverId_c"]].drop_duplicates(["raceId", "driverId"])
+        delante = (pares["pos"] < pares["pos_c"]).astype(np.float64).where(pares["pos_c"].notna()
+                                                                          & pares["pos"].notna())
+        return pd.DataFrame({
+            "raceId": pares["raceId"].to_numpy(), "driverId": pares["driverId"].to_numpy(),
+            "companeroId": pares["driverId_c"].to_numpy(),
+            "clave": pares["driverId"].to_numpy(np.int64) * 2**32 + pares["driverId_c"].to_numpy(np.int64),
+            "delante": delante.to_numpy(),
+        })
+
+    # ---- Actualización ----
+    def anexar(self, lote):
+        """Calcula las señales de las carreras nuevas del lote y las suma al estado."""
+        lote = lote[~lote["raceId"].isin(self.carreras)].reset_index(drop=True)
+        if len(lote) == 0:
+            return
+        senales, pareja = self.calcular(lote)
+        self.senales = pd.concat([self.senales, senales], ignore_index=True) if len(self.senales) else senales
+        self.carreras.update(int(r) for r in np.unique(lote["raceId"].to_numpy()))
+
+        N = self.ventana
+        todo = pd.concat([self.cola[COLUMNAS_COLA], lote[COLUMNAS_COLA]], ignore_index=True)
+        self.cola = todo.groupby("driverId", sort=False).tail(2 * N).reset_index(drop=True)
+
+        d = lote["driverId"].to_numpy(np.int64)
+        g = lote.assign(n=lote["abandono"].notna().astype(np.float64)).groupby(d)
+        self.por_piloto = self.por_piloto.add(
+            pd.DataFrame({"carreras": g["n"].sum(), "abandonos": g["abandono"].sum()}), fill_value=0)
+        kc = d * 2**16 + lote["circuitId"].to_numpy(np.int64)
+        g = lote.assign(n=lote["pos"].notna().astype(np.float64)).groupby(kc)
+        anterior = self.por_circuito["mejor"]
+        circuito = self.por_circuito[["carreras", "suma_pos"]].add(
+            pd.DataFrame({"carreras": g["n"].sum(), "suma_pos": g["pos"].sum()}), fill_value=0)
+        circuito["mejor"] = np.fmin(anterior.reindex(circuito.index).to_numpy(np.float64),
+                                    g["pos"].min().reindex(circuito.index).to_numpy(np.float64))
+        self.por_circuito = circuito
+        g = pareja.assign(n=pareja["delante"].notna().astype(np.float64)).groupby("clave")
+        self.por_pareja = self.por_pareja.add(
+            pd.DataFrame({"delante": g["delante"].sum(), "juntos": g["n"].sum()}), fill_value=0)
+
+    # ---- Consulta ----
+    def ultima(self):
+        """(año, ronda) de la última carrera anexada, o None si el almacén está vacío."""
+        if len(self.senales) == 0:
+            return None
+        orden = self.senales["year"].to_numpy(np.int64) * 100 + self.senales["round"].to_numpy(np.int64)
+        k = int(np.argmax(orden))
+        return int(self.senales["year"].iloc[k]), int(self.senales["round"].iloc[k])
+
+    def previo(self, race_id, inscritos=None):
+        """Señales de los pilotos de la carrera `race_id`. Si aún no tiene resultados se
+        calculan para `inscritos` (raceId, year, round, circuitId, driverId, constructorId)."""
+        if int(race_id) in self.carreras or inscritos is None or len(inscritos) == 0:
+            df = self.senales
+            return df[df["raceId"].to_numpy() == int(race_id)].reset_index(drop=True)
+        ultima = self.ultima()
+        fila = inscritos.iloc[0]
+        if ultima is not None and (int(fila["year"]), int(fila["round"])) <= ultima:
+            raise ValueError("Esa carrera no tiene resultados y es anterior a la última guardada.")
+        # sin resultados todavía: una fila por inscrito con las variables de la carrera vacías
+        lote = inscritos[["raceId", "year", "round", "circuitId", "driverId", "constructorId"]]
+        lote = lote.drop_duplicates("driverId").reset_index(drop=True)
+        for c in ("pos", "puntos", "ganadas", "abandono", "clasif"):
+            lote[c] = np.nan
+        return self.calcular(lote)[0]
+
+def cargar_senales(hechos, clasif, data_dir=None):
+    """Almacén de señales desde la caché; si algún CSV cambió se recalcula y se guarda."""
+    almacen = leer_objeto(NOMBRE_CACHE, FUENTES, data_dir)
+    if almacen is not None:
+        return almacen
+    huellas = huellas_fuentes(FUENTES, data_dir)
+    almacen = AlmacenSenales()
+    almacen.anexar(AlmacenSenales.lote(hechos, clasif))
+    guardar_objeto(NOMBRE_CACHE, almacen, huellas, data_dir)
+    return almacen
@@ -0,0 +1,461 @@
+# ==============================
+# SERVICIO HTTP/JSON DE CONSULTAS
+# ==============================
+# Un solo proceso asyncio (sólo biblioteca estándar para el HTTP) sirve los
+# análisis a los widgets de la web:
+#
+#   GET /remontadores?anio_min=2000&min_gp=50&sesion=carrera&top=15
+#   GET /circuitos?top=15
+#   GET /edades
+#   GET /h2h?a=hamilton&b=rosberg&desde=2013&hasta=2016&sesion=carrera
+#   GET /pilotos?q=hamil&limite=10
+#   GET /salud                     (versión de los datos y estado de las cachés)
+#
+#   python main.py serve --puerto 8000
+#   python -m motor.servicio ...   (mismos argumentos)
+#
+# La sesión (tablas, hechos, agregados e índice de pilotos) se carga una vez
+# y la comparten todas las peticiones. Cada respuesta se guarda ya codificada
+# (y comprimida con gzip) en un MemoLRU cuya clave lleva la versión de Data/;
+# el ETag sale de esa misma clave, así que un If-None-Match válido se
+# contesta con 304 sin calcular ni serializar nada. Una ingesta nueva cambia
+# la versión: se abre otra sesión y las respuestas y ETags anteriores dejan
+# de valer. Los cálculos van a un pool de hilos (el bucle sigue atendiendo)
+# y peticiones iguales simultáneas comparten un único cálculo. Las tablas
+# grandes se envían por trozos (Transfer-Encoding: chunked) a medida que se
+# codifican.
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .analisis import OPCIONES_SESION, SesionAnalisis
+from .datos import version_datos
+from .hechos import SPRINT
+from .memo import MemoLRU
+
+MAX_BYTES_RESPUESTAS = 64 * 1024 * 1024
+MAX_RESPUESTA_CACHE = 8 * 1024 * 1024   # respuestas mayores se sirven pero no se guardan
+MIN_GZIP = 1024                         # por debajo, comprimir no compensa
+FILAS_POR_TROZO = 250                   # filas de una tabla por trozo JSON
+FILAS_STREAM = 500                      # con más filas la respuesta va por trozos
+REVISION_S = 5.0                        # cada cuánto se mira si cambió Data/
+INACTIVIDAD_S = 15.0                    # keep-alive: cierre tras este tiempo sin peticiones
+MAX_CABECERAS = 100
+MAX_LINEA = 8 * 1024                    # línea de petición o de cabecera (límite del StreamReader)
+MAX_CUERPO = 64 * 1024                  # cuerpos mayores (no se usan) se rechazan con 413
+LIMITE_PILOTOS = 100
+ESTADOS = {200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 413: "Content Too Large",
+           414: "URI Too Long", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+class ErrorConsulta(Exception):
+    """Error de la petición (parámetros o recurso): se contesta con `estado` y un JSON."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+# ---- Parámetros ----
+def _entero(params, nombre, defecto=None, minimo=None, maximo=None):
+    valor = params.get(nombre, "").strip()
+    if valor == "":
+        return defecto
+    try:
+        n = int(valor)
+    except ValueError:
+        raise ErrorConsulta(400, f"'{nombre}' debe ser un entero") from None
+    if (minimo is not None and n < minimo) or (maximo is not None and n > maximo):
+        raise ErrorConsulta(400, f"'{nombre}' fuera de rango")
+    return n
+
+def _sesion(params):
+    sesion = params.get("sesion", "carrera").strip().lower() or "carrera"
+    if sesion not in OPCIONES_SESION:
+        raise ErrorConsulta(400, f"'sesion' debe ser {', '.join(OPCIONES_SESION)}")
+    return sesion
+
+def _texto(params, nombre):
+    valor = params.get(nombre, "").strip()
+    if not valor:
+        raise ErrorConsulta(400, f"Falta el parámetro '{nombre}'")
+    return valor
+
+# ---- Rutas: parámetros normalizados y cálculo sobre la sesión ----
+def _remontadores(sesion, p):
+    tabla = sesion.remontadores(p["anio_min"], p["min_gp"], p["sesion"])
+    return {"parametros": p, "filas": tabla if p["top"] is None else tabla.head(p["top"])}
+
+def _circuitos(sesion, p):
+    conteo = sesion.circuitos(p["top"])
+    return {"parametros": p, "filas": pd.DataFrame({"circuito": conteo.index, "carreras": conteo.to_numpy()})}
+
+def _edades(sesion, p):
+    edades = sesion.edades()
+    conteo = edades.value_counts().sort_index()
+    return {
+        "pilotos": len(edades), "media": float(edades.mean()), "mediana": float(edades.median()),
+        "min": int(edades.min()), "max": int(edades.max()),
+        "histograma": pd.DataFrame({"edad": conteo.index, "pilotos": conteo.to_numpy()}),
+    }
+
+def _h2h(sesion, p):
+    try:
+        res = sesion.h2h(p["a"], p["b"], p["desde"], p["hasta"], p["sesion"])
+    except ValueError as e:
+        raise ErrorConsulta(404, str(e)) from None
+    if res is None:
+        raise ErrorConsulta(404, "Los pilotos no tienen carreras en común en ese periodo")
+    serie = res["serie"]
+    filas = pd.DataFrame({
+        "raceId": serie["raceId"].to_numpy(), "year": serie["year"].to_numpy(),
+        "round": serie["round"].to_numpy(), "name": serie["name"].to_numpy(),
+        "date": serie["date"].to_numpy(),
+        "sesion": np.where(serie["sesion"].to_numpy() == SPRINT, "sprint", "carrera"),
+        "posA": serie["posA"].to_numpy(), "posB": serie["posB"].to_numpy(),
+        "ptsA": serie["ptsA"].to_numpy(), "ptsB": serie["ptsB"].to_numpy(),
+        "acumulado": res["acumulado"],
+    })
+    piloto = lambda t: {"driverId": t[0], "nombre": t[1], "driverRef": t[2]}
+    return {"parametros": p, "A": piloto(res["A"]), "B": piloto(res["B"]),
+            "victorias": list(res["victorias"]), "resumen": res["resumen"], "serie": filas}
+
+def _pilotos(sesion, p):
+    if p["q"] is None:
+        filas = sesion.indice.catalogo().head(p["limite"])
+    else:
+        filas = sesion.indice.buscar(p["q"], p["limite"])
+    return {"parametros": p, "filas": filas}
+
+RUTAS = {
+    "/remontadores": (lambda q: {"anio_min": _entero(q, "anio_min", 2000, 1950, 2100),
+                                 "min_gp": _entero(q, "min_gp", 50, 0),
+                                 "sesion": _sesion(q), "top": _entero(q, "top", None, 1)},
+                      _remontadores),
+    "/circuitos": (lambda q: {"top": _entero(q, "top", None, 1)}, _circuitos),
+    "/edades": (lambda q: {}, _edades),
+    "/h2h": (lambda q: {"a": _texto(q, "a"), "b": _texto(q, "b"),
+                        "desde": _entero(q, "desde", None, 1950, 2100),
+                        "hasta": _entero(q, "hasta", None, 1950, 2100), "sesion": _sesion(q)},
+             _h2h),
+    "/pilotos": (lambda q: {"q": q.get("q", "").strip() or None,
+                            "limite": _entero(q, "limite", 10, 1, LIMITE_PILOTOS)},
+                 _pilotos),
+}
+
+# ---- JSON por trozos ----
+def _valor_json(o):
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return None if math.isnan(o) else float(o)
+    if isinstance(o, np.bool_):
+        return bool(o)
+    if isinstance(o, np.ndarray):
+        return [None if isinstance(v, float) and math.isnan(v) else v for v in o.tolist()]
+    if isinstance(o, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(o).isoformat()
+    raise TypeError(f"No se puede pasar a JSON: {type(o).__name__}")
+
+def _json(o):
+    return json.dumps(o, default=_valor_json, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+def filas_tabla(obj):
+    """Filas de la mayor tabla de una respuesta (para decidir si va por trozos)."""
+    if isinstance(obj, pd.DataFrame):
+        return len(obj)
+    if isinstance(obj, dict):
+        return max((filas_tabla(v) for v in obj.values()), default=0)
+    return 0
+
+def trozos_json(obj):
+    """Bytes del JSON de `obj`; los DataFrame salen como lista de objetos, de FILAS_POR_TROZO en FILAS_POR_TROZO."""
+    if isinstance(obj, pd.DataFrame):
+        yield b"["
+        for i in range(0, len(obj), FILAS_POR_TROZO):
+            parte = obj.iloc[i:i + FILAS_POR_TROZO].to_json(
+                orient="records", date_format="iso", force_ascii=False, double_precision=10)
+            yield (b"," if i else b"") + parte[1:-1].encode()
+        yield b"]"
+    elif isinstance(obj, dict):
+        yield b"{"
+        for n, (clave, valor) in enumerate(obj.items()):
+            yield (b"," if n else b"") + _json(str(clave)) + b":"
+            yield from trozos_json(valor)
+        yield b"}"
+    else:
+        if isinstance(obj, (float, np.floating)) and math.isnan(obj):
+            obj = None
+        yield _json(obj)
+
+# ---- Servicio ----
+class Servicio:
+    def __init__(self, data_dir=None, hilos=4, origen="*", max_bytes=MAX_BYTES_RESPUESTAS):
+        self.data_dir = data_dir
+        self.origen = origen
+        self.version = version_datos(data_dir)
+        self.sesion = SesionAnalisis(data_dir)
+        self.respuestas = MemoLRU(max_bytes, version=self.version)
+        self._pool = ThreadPoolExecutor(hilos, thread_name_prefix="consulta")
+        self._en_curso = {}    # clave -> Future del cálculo (peticiones iguales simultáneas)
+        self.peticiones = 0
+        self.inicio = time.time()
+
+    # ---- versión de los datos ----
+    async def precalentar(self):
+        """Tablas, hechos, agregados e índice de pilotos antes de aceptar conexiones."""
+        await asyncio.get_running_loop().run_in_executor(self._pool, self.sesion.cargar)
+
+    async def vigilar(self):
+        # otra ingesta -> nueva sesión (se carga aparte) y fuera respuestas y ETags viejos
+        bucle = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(REVISION_S)
+            version = await bucle.run_in_executor(self._pool, version_datos, self.data_dir)
+            if version == self.version:
+                continue
+            nueva = SesionAnalisis(self.data_dir)
+            await bucle.run_in_executor(self._pool, nueva.cargar)
+            self.sesion, self.version = nueva, version
+            self.respuestas.cambiar_version(version)
+            print(f"[serve] Datos nuevos: versión {version}")
+
+    def etag(self, clave):
+        return f'"{self.version}-{hashlib.sha1(repr(clave).encode()).hexdigest()[:12]}"'
+
+    def _salud(self):
+        return {
+            "version": self.version, "rutas": sorted(RUTAS), "peticiones": self.peticiones,
+            "activo_s": round(time.time() - self.inicio, 1),
+            "respuestas": {"entradas": len(self.respuestas), "bytes": self.respuestas.bytes,
+                           "aciertos": self.respuestas.aciertos, "fallos": self.respuestas.fallos},
+            "memo": {"entradas": len(self.sesion.memo), "bytes": self.sesion.memo.bytes},
+        }
+
+    async def _calcular(self, clave, ruta, params):
+        # la primera petición calcula; las iguales que lleguen mientras tanto esperan el mismo Future
+        futuro = self._en_curso.get(clave)
+        if futuro is None:
+            sesion = self.sesion
+            futuro = asyncio.get_running_loop().run_in_executor(self._pool, RUTAS[ruta][1], sesion, params)
+            self._en_curso[clave] = futuro
+            futuro.add_done_callback(lambda _: self._en_curso.pop(clave, None))
+        return await asyncio.shield(futuro)
+
+    # ---- HTTP ----
+    async def atender(self, reader, writer):
+        try:
+            while await self._peticion(reader, writer):
+                pass
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _linea(reader):
+        # None si pasa de MAX_LINEA: readline() convierte el LimitOverrunError en ValueError
+        try:
+            return await reader.readline()
+        except ValueError:
+            return None
+
+    async def _peticion(self, reader, writer):
+        """Lee y contesta una petición; False si hay que cerrar la conexión."""
+        linea = await asyncio.wait_for(self._linea(reader), INACTIVIDAD_S)
+        if linea is None:
+            await self._enviar(writer, 414, _json({"error": "Línea de petición demasiado larga"}), cerrar=True)
+            return False
+        if not linea:
+            return False
+        try:
+            metodo, destino, protocolo = linea.decode("latin-1").split()
+        except ValueError:
+            await self._enviar(writer, 400, _json({"error": "Petición mal formada"}), cerrar=True)
+            return False
+        cabeceras = {}
+        for _ in range(MAX_CABECERAS + 1):
+            linea = await self._linea(reader)
+            if linea is None or len(cabeceras) == MAX_CABECERAS:
+                # sin leer el resto no se sabe dónde empieza la siguiente petición: se cierra
+                await self._enviar(writer, 431, _json({"error": "Cabeceras demasiado largas o numerosas"}),
+                                   cerrar=True)
+                return False
+            if linea in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        # cuerpo: no se usa; si la longitud no es válida no se sabe dónde acaba, así que se cierra
+        try:
+            longitud = int(cabeceras.get("content-length", "0") or 0)
+        except ValueError:
+            longitud = -1
+        if longitud < 0 or "transfer-encoding" in cabeceras:
+            await self._enviar(writer, 400, _json({"error": "Cuerpo de la petición no válido"}), cerrar=True)
+            return False
+        if longitud > MAX_CUERPO:
+            await self._enviar(writer, 413, _json({"error": "Cuerpo demasiado grande"}), cerrar=True)
+            return False
+        if longitud:
+            await reader.readexactly(longitud)   # no se usan cuerpos: se descartan
+
+        http11 = protocolo == "HTTP/1.1"
+        conexion = cabeceras.get("connection", "").lower()
+        seguir = (conexion != "close") if http11 else (conexion == "keep-alive")
+        self.peticiones += 1
+
+        if metodo == "OPTIONS":
+            await self._enviar(writer, 204, b"", cerrar=not seguir, extra={
+                "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+                "Access-Control-Allow-Headers": "If-None-Match", "Access-Control-Max-Age": "86400"})
+            return seguir
+        if metodo not in ("GET", "HEAD"):
+            await self._enviar(writer, 405, _json({"error": "Sólo GET, HEAD y OPTIONS"}),
+                               cerrar=not seguir, extra={"Allow": "GET, HEAD, OPTIONS"})
+            return seguir
+        cabeza = metodo == "HEAD"
+
+        url = urlsplit(destino)
+        ruta = url.path.rstrip("/") or "/"
+        if ruta == "/salud":
+            await self._enviar(writer, 200, _json(self._salud()), cabeza, not seguir,
+                               {"Cache-Control": "no-store"})
+            return seguir
+        if ruta not in RUTAS:
+            await self._enviar(writer, 404, _json({"error": f"Ruta desconocida: {ruta}", "rutas": sorted(RUTAS)}),
+                               cabeza, not seguir)
+            return seguir
+
+        try:
+            params = RUTAS[ruta][0](dict(parse_qsl(url.query)))
+        except ErrorConsulta as e:
+            await self._enviar(writer, e.estado, _json({"error": str(e)}), cabeza, not seguir)
+            return seguir
+        clave = self.respuestas.clave(ruta, params)
+        etag = self.etag(clave)
+        comunes = {"ETag": etag, "Cache-Control": "no-cache", "X-Datos-Version": self.version}
+        if etag in {e.strip() for e in cabeceras.get("if-none-match", "").split(",")}:
+            await self._enviar(writer, 304, b"", cabeza=True, cerrar=not seguir, extra=comunes)
+            return seguir
+
+        gz = "gzip" in cabeceras.get("accept-encoding", "")
+        guardada = self.respuestas.obtener(clave)
+        if guardada is not None:
+            cuerpo, comprimido = guardada
+            if gz and comprimido is not None:
+                cuerpo, comunes = comprimido, {**comunes, "Content-Encoding": "gzip"}
+            await self._enviar(writer, 200, cuerpo, cabeza, not seguir, {**comunes, "Vary": "Accept-Encoding"})
+            return seguir
+
+        try:
+            resultado = await self._calcular(clave, ruta, params)
+        except ErrorConsulta as e:
+            await self._enviar(writer, e.estado, _json({"error": str(e)}), cabeza, not seguir)
+            return seguir
+        except Exception as e:
+            print(f"[serve] {ruta}: {type(e).__name__}: {e}")
+            await self._enviar(writer, 500, _json({"error": "Error interno"}), cabeza, not seguir)
+            return seguir
+        comunes["Vary"] = "Accept-Encoding"
+
+        bucle = asyncio.get_running_loop()
+        if http11 and not cabeza and filas_tabla(resultado) > FILAS_STREAM:
+            cuerpo = await self._enviar_trozos(writer, resultado, comunes)
+            comprimido = None
+            if cuerpo is not None and len(cuerpo) >= MIN_GZIP:
+                comprimido = await bucle.run_in_executor(self._pool, gzip.compress, cuerpo, 6)
+        else:
+            cuerpo = b"".join(trozos_json(resultado))
+            comprimido = None
+            if len(cuerpo) >= MIN_GZIP:
+                comprimido = await bucle.run_in_executor(self._pool, gzip.compress, cuerpo, 6)
+            if gz and comprimido is not None:
+                await self._enviar(writer, 200, comprimido, cabeza, not seguir, {**comunes, "Content-Encoding": "gzip"})
+            else:
+                await self._enviar(writer, 200, cuerpo, cabeza, not seguir, comunes)
+        if cuerpo is not None and self.respuestas.version == clave[-1]:
+            self.respuestas.guardar(clave, (cuerpo, comprimido))
+        return seguir
+
+    def _cabeceras(self, estado, extra):
+        lineas = [f"HTTP/1.1 {estado} {ESTADOS[estado]}", f"Date: {formatdate(usegmt=True)}",
+                  "Server: f1-analisis", f"Access-Control-Allow-Origin: {self.origen}",
+                  "Access-Control-Expose-Headers: ETag, X-Datos-Version"]
+        lineas += [f"{k}: {v}" for k, v in extra.items()]
+        return ("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1")
+
+    async def _enviar(self, writer, estado, cuerpo, cabeza=False, cerrar=False, extra=None):
+        extra = dict(extra or {})
+        if estado not in (204, 304):
+            extra.setdefault("Content-Type", "application/json; charset=utf-8")
+            extra["Content-Length"] = str(len(cuerpo))
+        if cerrar:
+            extra["Connection"] = "close"
+        writer.write(self._cabeceras(estado, extra) + (b"" if cabeza else cuerpo))
+        await writer.drain()
+
+    async def _enviar_trozos(self, writer, resultado, extra):
+        """Respuesta chunked mientras se codifica; devuelve el cuerpo entero si cabe en la caché."""
+        writer.write(self._cabeceras(200, {**extra, "Content-Type": "application/json; charset=utf-8",
+                                           "Transfer-Encoding": "chunked"}))
+        partes, total = [], 0
+        for trozo in trozos_json(resultado):
+            writer.write(b"%x\r\n%s\r\n" % (len(trozo), trozo))
+            await writer.drain()   # respeta al cliente lento y deja pasar a las demás conexiones
+            total += len(trozo)
+            if partes is not None and total <= MAX_RESPUESTA_CACHE:
+                partes.append(trozo)
+            else:
+                partes = None
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return None if partes is None else b"".join(partes)
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+async def servir(host="127.0.0.1", puerto=8000, data_dir=None, hilos=4, origen="*"):
+    servicio = Servicio(data_dir, hilos, origen)
+    t0 = time.perf_counter()
+    await servicio.precalentar()
+    servidor = await asyncio.start_server(servicio.atender, host, puerto, backlog=1024, limit=MAX_LINEA)
+    vigilancia = asyncio.create_task(servicio.vigilar())
+    print(f"[serve] http://{host}:{puerto} (datos {servicio.version}, "
+          f"cargados en {time.perf_counter() - t0:.1f} s)")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        vigilancia.cancel()
+        servicio.cerrar()
+
+# ---- Línea de comandos ----
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Servicio HTTP/JSON de consultas")
+    parser.add_argument("--host", default="127.0.0.1", help="interfaz de escucha (0.0.0.0 para toda la red)")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--hilos", type=int, default=4, help="hilos para los cálculos no cacheados")
+    parser.add_argument("--origen", default="*", help="valor de Access-Control-Allow-Origin (CORS)")
+    parser.add_argument("--datos", help="carpeta Data/ alternativa")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.datos, args.hilos, args.origen))
+    except FileNotFoundError as e:
+        print(f"[serve] Error: no se encontró {e.filename}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())